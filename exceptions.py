@@ -8,6 +8,19 @@ class ImplementationLeftAsExerciseForTheUserError(NotImplementedError):
         )
 
 
+class TransformTimeoutError(TimeoutError):
+    def __init__(self, transform: object, timeout: float):
+        self.transform = str(transform)
+        self.timeout = timeout
+        super().__init__(
+            f"The symbolic computation of {transform} did not finish within {timeout} seconds and was cancelled."
+        )
+
+    def __reduce__(self):
+        # pickled with the arguments of the constructor, e.g. to be sent from worker processes
+        return type(self), (self.transform, self.timeout)
+
+
 def raise_left_as_exercise_for_reader(func):
     @wraps(func)
     def wrapper(*_, **__):
@@ -0,0 +1,90 @@
+import multiprocessing
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+from sympy import exp, DiracDelta, Heaviside
+from sympy.abc import a, s, t
+
+from exceptions import TransformTimeoutError
+from transforms.fourier import FourierTransform
+from transforms.laplace import LaplaceTransform
+from utils.cache import get_symbolic_cache, set_symbolic_cache
+
+
+class TestBaseTransform(TestCase):
+
+    def setUp(self) -> None:
+        # the tests count the symbolic computations, which the cache would skip
+        self.previous_cache = get_symbolic_cache()
+        set_symbolic_cache(None)
+
+    def tearDown(self) -> None:
+        set_symbolic_cache(self.previous_cache)
+
+    def test_construction_is_lazy(self):
+        with patch.object(LaplaceTransform, "_compute_transform_function", return_value=1 / (a + s)) as compute:
+            transform = LaplaceTransform(exp(-a * t) * Heaviside(t))
+            compute.assert_not_called()
+            self.assertFalse(transform.is_computed)
+
+            self.assertEqual(transform.transformed_function, 1 / (a + s))
+            self.assertEqual(transform.transformed_function, 1 / (a + s))
+            compute.assert_called_once()
+            self.assertTrue(transform.is_computed)
+
+    def test_compute(self):
+        transform = LaplaceTransform(1 / (a + s), is_base_form=False).compute()
+        self.assertTrue(transform.is_computed)
+        self.assertEqual(transform.transformed_function, 1 / (a + s))
+
+    def test_compute_timeout(self):
+        def slow_transform(*_):
+            time.sleep(1)
+            return 1 / (a + s)
+
+        with patch.object(LaplaceTransform, "_compute_transform_function", slow_transform):
+            transform = LaplaceTransform(exp(-a * t) * Heaviside(t))
+            with self.assertRaises(TimeoutError):
+                transform.compute(timeout=0.05)
+            self.assertFalse(transform.is_computed)
+
+    def test_construction_timeout(self):
+        def hanging_transform(*_):
+            time.sleep(60)
+
+        with patch.object(LaplaceTransform, "_compute_transform_function", hanging_transform):
+            start = time.perf_counter()
+            with self.assertRaises(TransformTimeoutError):
+                LaplaceTransform(exp(-t) * Heaviside(t), timeout=0.2)
+            self.assertLess(time.perf_counter() - start, 5)
+            # the computation was killed instead of running on in the background
+            self.assertEqual(multiprocessing.active_children(), [])
+
+            transform = LaplaceTransform(exp(-t) * Heaviside(t), timeout=0.2, numeric_fallback=True)
+            _, transformed_function = transform.to_numeric()
+            self.assertTrue(np.allclose(transformed_function(np.array([1., 2.])), [1 / 2, 1 / 3]))
+
+        transform = LaplaceTransform(exp(-a * t) * Heaviside(t), timeout=60)
+        self.assertTrue(transform.is_computed)
+        self.assertEqual(transform.transformed_function[0], 1 / (a + s))
+
+    def test_to_numeric(self):
+        transform = LaplaceTransform(exp(-a * t) * Heaviside(t))
+        base_function, transformed_function = transform.to_numeric()
+        self.assertIs(transformed_function, transform.numeric_transformed_function())
+
+        time_points = np.linspace(-1, 5, 1001)
+        self.assertTrue(np.allclose(base_function(time_points, 2), np.exp(-2 * time_points) * (time_points >= 0)))
+
+        s_values = np.linspace(0, 10, 1001) + 1j
+        self.assertTrue(np.allclose(transformed_function(s_values, a=2), 1 / (s_values + 2)))
+
+    def test_to_numeric_constant_and_dirac_delta(self):
+        transform = FourierTransform(DiracDelta(t))
+        base_function, transformed_function = transform.to_numeric()
+
+        omega_values = np.linspace(-5, 5, 11)
+        self.assertTrue(np.array_equal(transformed_function(omega_values), np.ones(11)))
+        self.assertTrue(np.array_equal(base_function(omega_values), np.where(omega_values == 0, np.inf, 0)))
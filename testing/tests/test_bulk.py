@@ -0,0 +1,76 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from transforms.fourier import FourierTransform
+from transforms.laplace import LaplaceTransform
+from transforms.radon import RadonTransform
+from utils.bulk import transform_tiles
+
+
+class TestBulkTransforms(TestCase):
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.values = np.random.default_rng(0).standard_normal((103, 64))
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.temp_dir.name, name)
+
+    def test_transform_data_file(self):
+        np.save(self.path("values.npy"), self.values)
+        for workers in (None, 4):
+            transformed = FourierTransform.transform_data_file(
+                self.path("values.npy"), self.path("spectra.npy"), tile_size=10, workers=workers,
+                real=True, axes=(-1,)
+            )
+            self.assertIsInstance(transformed, np.memmap)
+            self.assertTrue(np.allclose(np.load(self.path("spectra.npy")), np.fft.rfft(self.values)))
+            del transformed
+
+        inverse = FourierTransform.inverse_transform_data_file(
+            self.path("spectra.npy"), self.path("inverse.npy"), tile_size=7,
+            real=True, axes=(-1,), shape=(64,)
+        )
+        self.assertTrue(np.allclose(inverse, self.values))
+        del inverse
+
+    def test_transform_data_raw_file(self):
+        # a raw capture file with a header of 16 bytes
+        with open(self.path("capture.bin"), "wb") as file:
+            file.write(b"\0" * 16)
+            file.write(self.values.astype(np.float32).tobytes())
+        time_points = np.linspace(0, 1, 64)
+        s_values = np.array([1, 2 + 1j])
+        transformed = LaplaceTransform.transform_data_file(
+            self.path("capture.bin"), self.path("laplace.npy"), time_points, s_values,
+            raw_dtype=np.float32, raw_shape=self.values.shape, raw_offset=16, tile_size=50, workers=2
+        )
+        self.assertEqual(transformed.shape, (103, 2))
+        self.assertTrue(np.allclose(
+            transformed, LaplaceTransform.transform_data(self.values.astype(np.float32), time_points, s_values)
+        ))
+        del transformed
+
+    def test_transform_tiles_axis(self):
+        image = np.zeros((16, 16))
+        image[5:10, 6:12] = 1
+        # the sinograms of the slices are on the last axis
+        sinograms = np.stack([RadonTransform.transform_data(image * index) for index in range(5)], axis=-1)
+
+        def reconstruct(tile: np.ndarray) -> np.ndarray:
+            images = RadonTransform.inverse_transform_data(np.moveaxis(tile, -1, 0), engine="fbp")
+            return np.moveaxis(images, 0, -1)
+
+        reconstructed = transform_tiles(reconstruct, sinograms, self.path("images.npy"), axis=-1, tile_size=2)
+        self.assertEqual(reconstructed.shape, (16, 16, 5))
+        self.assertTrue(np.allclose(reconstructed[..., 3], 3 * reconstructed[..., 1]))
+        del reconstructed
+
+        with self.assertRaises(ValueError):
+            transform_tiles(lambda tile: tile.sum(axis=0), self.values, self.path("sums.npy"))
@@ -0,0 +1,58 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from sympy import exp, Heaviside
+from sympy.abc import a, s, t, x
+
+from transforms.laplace import LaplaceTransform
+from utils.cache import SymbolicCache, get_symbolic_cache, set_symbolic_cache
+
+
+class TestSymbolicCache(TestCase):
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "cache.sqlite")
+        self.previous_cache = get_symbolic_cache()
+
+    def tearDown(self) -> None:
+        set_symbolic_cache(self.previous_cache)
+        self.temp_dir.cleanup()
+
+    def test_transform_uses_memory_tier(self):
+        set_symbolic_cache(SymbolicCache())
+        function = exp(-a * t) * Heaviside(t)
+
+        first = LaplaceTransform(function)
+        with patch.object(LaplaceTransform, "_compute_transform_function") as compute:
+            second = LaplaceTransform(function)
+            compute.assert_not_called()
+        self.assertEqual(first.transformed_function, second.transformed_function)
+
+    def test_transform_uses_disk_tier(self):
+        set_symbolic_cache(SymbolicCache(path=self.path))
+        function = exp(-a * t) * Heaviside(t)
+        first = LaplaceTransform(function)
+
+        # a new cache on the same file simulates a new process
+        set_symbolic_cache(SymbolicCache(path=self.path))
+        with patch.object(LaplaceTransform, "_compute_transform_function") as compute:
+            second = LaplaceTransform(function)
+            compute.assert_not_called()
+        self.assertEqual(first.transformed_function, second.transformed_function)
+
+    def test_key_depends_on_parameters(self):
+        function = exp(-a * t)
+        key = SymbolicCache.make_key(LaplaceTransform, function, {"s": s, "t": t}, "transform")
+        self.assertEqual(key, SymbolicCache.make_key(LaplaceTransform, function, {"t": t, "s": s}, "transform"))
+        self.assertNotEqual(key, SymbolicCache.make_key(LaplaceTransform, function, {"s": x, "t": t}, "transform"))
+        self.assertNotEqual(key, SymbolicCache.make_key(LaplaceTransform, function, {"s": s, "t": t}, "inverse"))
+
+    def test_memory_tier_is_bounded(self):
+        cache = SymbolicCache(maxsize=2)
+        for key in ("first", "second", "third"):
+            cache.set(key, key)
+        self.assertNotIn("first", cache)
+        self.assertEqual(cache.get("third"), "third")
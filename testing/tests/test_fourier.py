@@ -1,4 +1,9 @@
-from sympy import exp, pi, Number, DiracDelta, sqrt, I
+import itertools
+
+import mpmath
+import numpy as np
+import scipy.signal
+from sympy import exp, pi, Number, DiracDelta, sqrt, I, Rational
 from sympy.abc import omega, t
 
 from testing.base_tests.base_transform_test import BaseTestTransform
@@ -81,3 +86,87 @@ class TestFourierTransform(BaseTestTransform):
         ),
     )
 
+    def test_transform_data_real(self):
+        values = np.random.default_rng(0).standard_normal(9)
+        transformed_data = self.transform_class.transform_data(values, real=True)
+
+        self.assertIsInstance(transformed_data, np.ndarray)
+        self.assertTrue(np.allclose(transformed_data, np.fft.fft(values)[:5]))
+        self.assertTrue(np.allclose(
+            self.transform_class.inverse_transform_data(transformed_data, real=True, shape=9),
+            values
+        ))
+
+    def test_transform_data_multidimensional(self):
+        values = np.random.default_rng(0).standard_normal((3, 8, 5))
+        for axes in (None, (1, 2), (0,)):
+            shape = values.shape if axes is None else tuple(values.shape[axis] for axis in axes)
+            for real in (False, True):
+                transformed_data = self.transform_class.transform_data(
+                    values, real=real, axes=axes
+                )
+                if not real:
+                    self.assertTrue(np.allclose(transformed_data, np.fft.fftn(values, axes=axes)))
+                inverse_transformed_data = self.transform_class.inverse_transform_data(
+                    transformed_data, real=real, axes=axes, shape=shape
+                )
+                self.assertTrue(np.allclose(inverse_transformed_data, values))
+
+        # an int shape is the length of the last axis
+        transformed_data = self.transform_class.transform_data(values, real=True, axes=(-1,))
+        self.assertTrue(np.allclose(
+            self.transform_class.inverse_transform_data(transformed_data, real=True, shape=5), values
+        ))
+
+    def test_transform_data_dtype(self):
+        values = np.random.default_rng(0).standard_normal(9)
+        transformed_data = self.transform_class.transform_data(values, dtype=np.complex64)
+        self.assertEqual(transformed_data.dtype, np.complex64)
+        self.assertTrue(np.allclose(transformed_data, np.fft.fft(values), atol=1e-5))
+        inverse_transformed_data = self.transform_class.inverse_transform_data(transformed_data, dtype=np.float32)
+        self.assertEqual(inverse_transformed_data.dtype, np.float32)
+        self.assertTrue(np.allclose(inverse_transformed_data, values, atol=1e-5))
+        with self.assertRaises(ValueError):
+            self.transform_class.inverse_transform_data(transformed_data * 1j, dtype=np.float32)
+
+        # the DFT in arbitrary precision resolves the cancellation of 1 + 1e-20 - 1
+        with mpmath.workdps(30):
+            for real in (False, True):
+                transformed_data = self.transform_class.transform_data(
+                    [Rational(1), Rational(1, 10 ** 20), Rational(-1), Rational(0)], real=real, dtype=object
+                )
+                self.assertTrue(all(isinstance(value, mpmath.mpc) for value in transformed_data))
+                self.assertAlmostEqual(float(transformed_data[0].real * 10 ** 20), 1, places=10)
+                inverse_transformed_data = self.transform_class.inverse_transform_data(
+                    transformed_data, real=real, shape=4, dtype=object
+                )
+                self.assertAlmostEqual(float(inverse_transformed_data[1].real * 10 ** 20), 1, places=10)
+        with self.assertRaises(ValueError):
+            self.transform_class.transform_data(np.ones((2, 4)), dtype=object)
+
+    def test_stream_transform_data(self):
+        values = np.random.default_rng(0).standard_normal((2, 5003))
+        chunks = np.array_split(values, [1, 100, 101, 3000], axis=-1)
+        for window, n_window, hop in (("hann", 256, None), ("hamming", 100, 30), ("boxcar", 64, 64)):
+            spectra = list(self.transform_class.stream_transform_data(iter(chunks), window, n_window, hop))
+            self.assertEqual(spectra[0].shape, (2, n_window // 2 + 1))
+            # a frame is the FFT of the windowed samples
+            hop = hop or n_window // 4
+            # the signal starts after n_window - hop samples of zero padding
+            start = 11 * hop - n_window
+            frame = values[:, start:start + n_window] * scipy.signal.get_window(window, n_window)
+            self.assertTrue(np.allclose(spectra[10], np.fft.rfft(frame)))
+
+            reconstructed = self.transform_class.stream_inverse_transform_data(
+                iter(spectra), window, n_window, hop, length=5003
+            )
+            self.assertTrue(np.allclose(np.concatenate(list(reconstructed), axis=-1), values))
+
+    def test_stream_transform_data_unbounded(self):
+        # the generators are lazy, so they work on endless signals
+        chunks = (np.sin(np.arange(index * 50, (index + 1) * 50) / 10) for index in itertools.count())
+        spectra = self.transform_class.stream_transform_data(chunks, n_window=64, real=True)
+        reconstructed = self.transform_class.stream_inverse_transform_data(spectra, n_window=64, real=True)
+        samples = np.concatenate(list(itertools.islice(reconstructed, 100)))
+        self.assertEqual(samples.shape, (100 * 16,))
+        self.assertTrue(np.allclose(samples, np.sin(np.arange(samples.size) / 10)))
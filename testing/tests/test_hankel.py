@@ -1,3 +1,4 @@
+import numpy as np
 from sympy import exp, sqrt
 from sympy.abc import r, k, a, b
 from testing.base_tests.base_transform_test import BaseTestTransform
@@ -28,7 +29,7 @@ class TestHankelTransform(BaseTestTransform):
                 k_vals_str: [1, 2, 3, 4],  # k-values
                 order_str: 0,  # Bessel function order
             },
-            [0, 0, 0, 0],
+            np.array([0, 0, 0, 0]),
         ),
         # Constant Function (f(r) = 1)
         (
@@ -38,7 +39,57 @@ class TestHankelTransform(BaseTestTransform):
                 k_vals_str: [1, 2, 3, 4],  # k-values
                 order_str: 0,  # Bessel function order
             },
-            [0.432823380134638, -0.118473068833468, -0.229762273948568, 0.0892197368017611],
+            np.array([0.432823380134638, -0.118473068833468, -0.229762273948568, 0.0892197368017611]),
         ),
     )
 
+    def test_transform_data_batch(self):
+        r_vals = np.linspace(0, 5, 50)
+        k_vals = np.linspace(0.1, 3, 20)
+        profiles = np.stack([np.exp(-r_vals ** 2), np.exp(-r_vals), np.ones_like(r_vals)])
+
+        transformed_data = self.transform_class.transform_data(profiles, r_vals, k_vals, order=1)
+
+        self.assertEqual(transformed_data.shape, (3, 20))
+        for profile, transformed_profile in zip(profiles, transformed_data):
+            self.assertTrue(np.allclose(
+                self.transform_class.transform_data(profile, r_vals, k_vals, order=1),
+                transformed_profile
+            ))
+
+    def test_transform_data_qdht(self):
+        # the Hankel transform of order 0 of exp(-r^2) is exp(-k^2 / 4) / 2
+        r_vals, k_vals = self.transform_class.qdht_grid(n_points=128, max_radius=8)
+        values = np.exp(-r_vals ** 2)
+
+        transformed_data = self.transform_class.transform_data(values, r_vals, sampling="qdht")
+        self.assertTrue(np.allclose(transformed_data, np.exp(-k_vals ** 2 / 4) / 2, atol=1e-12))
+
+        inverse_transformed_data = self.transform_class.inverse_transform_data(
+            transformed_data, k_vals, sampling="qdht"
+        )
+        self.assertTrue(np.allclose(inverse_transformed_data, values, atol=1e-12))
+
+        # points off the Bessel-zero grid, or of another order, would give wrong values
+        with self.assertRaises(ValueError):
+            self.transform_class.transform_data(values, np.linspace(0, 8, 128), sampling="qdht")
+        with self.assertRaises(ValueError):
+            self.transform_class.transform_data(values, r_vals, order=1, sampling="qdht")
+        with self.assertRaises(ValueError):
+            self.transform_class.inverse_transform_data(transformed_data, np.linspace(0, 8, 128), sampling="qdht")
+
+    def test_transform_data_fftlog(self):
+        r_vals, k_vals = self.transform_class.fftlog_grid(n_points=1024, r_min=1e-6, r_max=1e3, order=1)
+        values = r_vals * np.exp(-r_vals ** 2)
+
+        transformed_data = self.transform_class.transform_data(values, r_vals, order=1, sampling="fftlog")
+        # away from the ends of the grid, where FFTLog suffers from its periodicity assumption
+        inner = (k_vals > 1e-2) & (k_vals < 10)
+        self.assertTrue(np.allclose(
+            transformed_data[inner], k_vals[inner] / 4 * np.exp(-k_vals[inner] ** 2 / 4), atol=1e-6
+        ))
+
+        inverse_transformed_data = self.transform_class.inverse_transform_data(
+            transformed_data, k_vals, order=1, sampling="fftlog"
+        )
+        self.assertTrue(np.allclose(inverse_transformed_data, values, atol=1e-10))
@@ -1,7 +1,11 @@
+import mpmath
+import numpy as np
+import scipy.signal
+
 from testing.base_tests.base_transform_test import BaseTestTransform
 from transforms.laplace import LaplaceTransform
 
-from sympy import exp, sin, Heaviside, sqrt
+from sympy import exp, sin, cos, Heaviside, DiracDelta, I, Poly, Rational, sqrt, expand, prod, simplify
 from sympy.abc import s, a, t, omega
 
 
@@ -28,6 +32,108 @@ class TestLaplaceTransform(BaseTestTransform):
                 time_points_str: [0, 1, 2, 3],
                 s_values_str: [1 + 1j, 2 + 2j, 3 + 3j, 4 + 4j],
             },
-            [1, 1, 1, 1],  # Flat spectrum
+            np.array([1, 1, 1, 1]),  # Flat spectrum
         ),
     )
+
+    def test_transform_data_weighting(self):
+        # the weighted sums approximate the Laplace integral of exp(-t), which is 1 / (s + 1)
+        time_points = np.linspace(0, 40, 4001)
+        s_values = np.array([0.5, 1, 2 + 3j])
+        solution = 1 / (s_values + 1)
+        for weighting, rtol in (("rectangle", 5e-2), ("trapezoid", 1e-3), ("simpson", 1e-7)):
+            transformed_data = self.transform_class.transform_data(
+                np.exp(-time_points), time_points, s_values, weighting=weighting
+            )
+            self.assertTrue(np.allclose(transformed_data, solution, rtol=rtol, atol=0))
+
+    def test_transform_data_batch(self):
+        time_points = np.array([0, 1, 2, 3])
+        s_values = np.array([1, 2 + 1j])
+        values = np.array([[1, 0, 0, 0], [0, 1, 0, 0]])
+        transformed_data = self.transform_class.transform_data(values, time_points, s_values)
+        self.assertEqual(transformed_data.shape, (2, 2))
+        self.assertTrue(np.allclose(transformed_data, [[1, 1], np.exp(-s_values)]))
+
+    def test_transform_data_dtype(self):
+        time_points = np.array([0, 1, 2, 3])
+        s_values = [1, 2 + 1j]
+        transformed_data = self.transform_class.transform_data([1, 0, 0, 0], time_points, s_values, dtype=np.float32)
+        self.assertEqual(transformed_data.dtype, np.float32)
+        with self.assertRaises(ValueError):
+            self.transform_class.transform_data([0, 1, 0, 0], time_points, s_values, dtype=np.float32)
+        with self.assertRaises(ValueError):
+            self.transform_class.transform_data([0, 1, 0, 0], time_points, s_values, dtype=np.int64)
+
+        with mpmath.workdps(30):
+            transformed_data = self.transform_class.transform_data(
+                [0, 1, 0, 0], time_points, s_values, dtype=object
+            )
+            self.assertAlmostEqual(transformed_data[1], mpmath.exp(-2 - 1j), places=25)
+            inverse = self.transform_class.inverse_transform_data(1 / (s + 2), [1, 2], dtype=object)
+            self.assertAlmostEqual(inverse[1], mpmath.exp(-4), places=20)
+        with self.assertRaises(ValueError):
+            self.transform_class.inverse_transform_data(1 / (s + 2), [1, 2], method="residues", dtype=object)
+
+    def test_inverse_transform_data_numeric(self):
+        time_points = np.linspace(0.1, 10, 50)
+        for method in ("talbot", "dehoog"):
+            inverse = self.transform_class.inverse_transform_data(1 / (s + 2), time_points, method=method)
+            self.assertTrue(np.allclose(inverse, np.exp(-2 * time_points), atol=1e-10))
+
+            inverse = self.transform_class.inverse_transform_data(
+                [1 / s, 1 / (s ** 2 + 1)], time_points, method=method
+            )
+            self.assertTrue(np.allclose(inverse, [np.ones(50), np.sin(time_points)], atol=1e-6))
+
+        # the Stehfest method only evaluates F on the real axis and is suited for smooth functions
+        inverse = self.transform_class.inverse_transform_data(
+            lambda s_values: 1 / np.sqrt(s_values), time_points, method="stehfest"
+        )
+        self.assertTrue(np.allclose(inverse, 1 / np.sqrt(np.pi * time_points), rtol=1e-5))
+
+    def test_inverse_transform_data_batch_callable(self):
+        time_points = np.linspace(0.5, 5, 10)
+        rates = np.linspace(0.5, 3, 1000)[:, np.newaxis, np.newaxis]
+        inverse = self.transform_class.inverse_transform_data(lambda s_values: 1 / (s_values + rates), time_points)
+        self.assertEqual(inverse.shape, (1000, 10))
+        self.assertTrue(np.allclose(inverse, np.exp(-rates[:, :, 0] * time_points), atol=1e-10))
+
+    def test_inverse_transform_rational(self):
+        # poles of multiplicity two, a conjugate pair and a polynomial part
+        for transformed_function, solution in (
+                ((s + 3) / ((s + 1) ** 2 * (s ** 2 + 2 * s + 5)),
+                 (t / 2 + Rational(1, 4) - (sin(2 * t) + cos(2 * t)) / 4) * exp(-t) * Heaviside(t)),
+                (1 / (s ** 2 + 1) ** 2, (sin(t) - t * cos(t)) * Heaviside(t) / 2),
+                ((s ** 2 + 1) / (s + 2), DiracDelta(t, 1) - 2 * DiracDelta(t) + 5 * exp(-2 * t) * Heaviside(t)),
+        ):
+            transform = self.transform_class(transformed_function, is_base_form=False)
+            self.assertFalse(transform.base_function.has(I))
+            self.assertEqual(simplify(transform.base_function - solution), 0)
+
+    def test_inverse_transform_data_residues(self):
+        time_points = np.linspace(-2, 10, 241)
+        denominator = expand(prod([s ** 2 + s / 5 + k for k in range(1, 6)]))
+        coefficients = [float(coefficient) for coefficient in Poly(denominator, s).all_coeffs()]
+        _, impulse = scipy.signal.impulse(([1], coefficients), T=time_points[time_points >= 0])
+        _, step = scipy.signal.step(([1], coefficients), T=time_points[time_points >= 0])
+
+        inverse = self.transform_class.inverse_transform_data(1 / denominator, time_points, method="residues")
+        self.assertTrue(np.allclose(inverse[time_points >= 0], impulse, atol=1e-12))
+        self.assertTrue(np.all(inverse[time_points < 0] == 0))
+
+        inverse = self.transform_class.inverse_transform_data(
+            [1 / denominator, 1 / (s + 1) ** 3], time_points, method="residues", response="step"
+        )
+        self.assertEqual(inverse.shape, (2, 241))
+        self.assertTrue(np.allclose(inverse[0, time_points >= 0], step, atol=1e-12))
+        positive = time_points[time_points > 0]
+        self.assertTrue(np.allclose(
+            inverse[1, time_points > 0],
+            self.transform_class.inverse_transform_data(1 / (s + 1) ** 3, positive, response="step"), atol=1e-8
+        ))
+
+        with self.assertRaises(ValueError):
+            self.transform_class.inverse_transform_data(s / (s + 1), time_points, method="residues")
+        with self.assertRaises(ValueError):
+            self.transform_class.inverse_transform_data(exp(-s) / s, time_points, method="residues")
@@ -0,0 +1,51 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from sympy import exp, sin, cos, Heaviside, Symbol, Integral, oo
+from sympy.abc import a, s, t, x
+
+from transforms.laplace import LaplaceTransform
+from utils.cache import SymbolicCache, get_symbolic_cache, set_symbolic_cache
+
+
+class TestTransformMany(TestCase):
+
+    def setUp(self) -> None:
+        self.previous_cache = get_symbolic_cache()
+        set_symbolic_cache(None)
+
+    def tearDown(self) -> None:
+        set_symbolic_cache(self.previous_cache)
+
+    def test_transform_many(self):
+        functions = [exp(-a * t) * Heaviside(t), "not a function", sin(t) * Heaviside(t), Heaviside(t)]
+        transforms = LaplaceTransform.transform_many(functions, max_workers=2)
+        self.assertEqual(len(transforms), 4)
+        self.assertIsInstance(transforms[1], Exception)
+        for function, transform in zip(functions[::2] + functions[3:], transforms[::2] + transforms[3:]):
+            self.assertTrue(transform.is_computed)
+            self.assertEqual(transform.transformed_function, LaplaceTransform(function).transformed_function)
+
+        # the assumptions of the symbols survive the serialization
+        positive = Symbol("u", positive=True)
+        inverse, = LaplaceTransform.transform_many([1 / (s + 1)], is_base_form=False, t=positive, max_workers=1)
+        self.assertEqual(inverse.base_function, exp(-positive))
+
+    def test_transform_many_timeout(self):
+        slow = Integral(exp(-x ** 4) * cos(x * t), (x, 0, oo)) * exp(-t ** 2)
+        transforms = LaplaceTransform.transform_many([slow, Heaviside(t)], timeout=0.2, max_workers=2)
+        self.assertIsInstance(transforms[0], TimeoutError)
+        self.assertEqual(transforms[1].transformed_function, LaplaceTransform(Heaviside(t)).transformed_function)
+
+    def test_transform_many_cache(self):
+        set_symbolic_cache(SymbolicCache())
+        functions = [exp(-a * t) * Heaviside(t), t * Heaviside(t)]
+        computed = LaplaceTransform.transform_many(functions, max_workers=2)
+        # all results are cached, so no processes are started
+        with patch("utils.parallel.ProcessPoolExecutor") as executor:
+            cached = LaplaceTransform.transform_many(functions)
+            executor.assert_not_called()
+        self.assertEqual(
+            [transform.transformed_function for transform in cached],
+            [transform.transformed_function for transform in computed]
+        )
@@ -0,0 +1,90 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+import sympy as sp
+from scipy.integrate import quad
+from sympy.abc import a, k, omega, r, s, t, x
+
+from transforms.fourier import FourierTransform
+from transforms.hankel import HankelTransform
+from transforms.laplace import LaplaceTransform
+from utils.cache import get_symbolic_cache, set_symbolic_cache
+from utils.quadrature import integrate, integrate_fourier, integrate_hankel
+from utils.sympy_math import lambdify_numeric
+
+
+class TestQuadrature(TestCase):
+
+    def test_integrate(self):
+        lower = np.array([0, 0, -np.inf, -np.inf])
+        upper = np.array([1, np.inf, 0, np.inf])
+        result = integrate(lambda x_, _: np.exp(-x_ ** 2), lower, upper)
+        self.assertTrue(np.allclose(result, [0.7468241328124271, np.sqrt(np.pi) / 2, np.sqrt(np.pi) / 2, np.sqrt(np.pi)]))
+
+    def test_integrate_endpoint_singularity(self):
+        result = integrate(lambda x_, _: 1 / np.sqrt(x_), np.zeros(1), np.ones(1))
+        self.assertTrue(np.allclose(result, 2, rtol=1e-10))
+
+    def test_integrate_fourier(self):
+        frequency = np.array([0.1, 1, 10])
+        cosine = integrate_fourier(lambda x_, _: 1 / (1 + x_ ** 2), frequency, "cos")
+        sine = integrate_fourier(lambda x_, _: 1 / x_, frequency, "sin")
+        self.assertTrue(np.allclose(cosine, np.pi / 2 * np.exp(-frequency), rtol=1e-10))
+        self.assertTrue(np.allclose(sine, np.pi / 2, rtol=1e-10))
+
+    def test_integrate_hankel(self):
+        # the integrand only depends on the outer point through its frequency
+        frequency = np.array([1, 2, 5])
+        result = integrate_hankel(lambda x_, _: np.exp(-x_), frequency, 0)
+        self.assertTrue(np.allclose(result, 1 / np.sqrt(1 + frequency ** 2), rtol=1e-10))
+
+
+class TestNumericIntegral(TestCase):
+
+    def setUp(self) -> None:
+        # the unevaluated results are patched in, they must not end up in the cache
+        self.previous_cache = get_symbolic_cache()
+        set_symbolic_cache(None)
+
+    def tearDown(self) -> None:
+        set_symbolic_cache(self.previous_cache)
+
+    def test_lambdify_integral_of_parameter(self):
+        function = 1 + sp.Integral(sp.exp(-a * x ** 2), (x, -sp.oo, sp.oo))
+        a_values = np.array([[0.5, 1], [2, 4]])
+        result = lambdify_numeric(function, (a,))(a_values)
+        self.assertEqual(result.shape, (2, 2))
+        self.assertTrue(np.allclose(result, 1 + np.sqrt(np.pi / a_values)))
+
+    def test_unevaluated_laplace_transform(self):
+        function = sp.exp(-t ** 2) * sp.log(1 + t)
+        with patch.object(LaplaceTransform, "_compute_transform_function",
+                          return_value=sp.LaplaceTransform(function, t, s)):
+            transform = LaplaceTransform(function)
+            self.assertTrue(transform.transformed_function.has(sp.Integral))
+            s_values = np.array([0.5, 1, 3])
+            expected = [quad(lambda t_: np.exp(-t_ ** 2 - s_ * t_) * np.log(1 + t_), 0, np.inf)[0] for s_ in s_values]
+            self.assertTrue(np.allclose(transform.numeric_transformed_function()(s_values), expected, rtol=1e-8))
+
+    def test_unevaluated_fourier_transform(self):
+        function = 1 / (1 + t ** 2)
+        with patch.object(FourierTransform, "_compute_transform_function",
+                          return_value=sp.FourierTransform(function, t, omega)):
+            transform = FourierTransform(function)
+            omega_values = np.linspace(-1, 1, 9)
+            self.assertTrue(np.allclose(
+                transform.numeric_transformed_function()(omega_values),
+                np.pi * np.exp(-2 * np.pi * np.abs(omega_values))
+            ))
+
+    def test_unevaluated_hankel_transform(self):
+        function = sp.exp(-a * r ** 2)
+        with patch.object(HankelTransform, "_compute_transform_function",
+                          return_value=sp.HankelTransform(function, r, k, 0)):
+            transform = HankelTransform(function)
+            k_values = np.array([0, 1, 2, 4])
+            self.assertTrue(np.allclose(
+                transform.numeric_transformed_function()(k_values, 2),
+                np.exp(-k_values ** 2 / 8) / 4
+            ))
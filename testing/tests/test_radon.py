@@ -1,8 +1,15 @@
+import tempfile
+import time
+from unittest.mock import patch
+
 import numpy as np
 from matplotlib import pyplot as plt
+from sympy import exp, pi, sqrt
+from sympy.abc import t, x, y
 
 from testing.base_tests.base_transform_test import BaseTestTransform
 from transforms.radon import RadonTransform
+from utils.tomography import RadonOperator
 
 
 class TestRadonTransform(BaseTestTransform):
@@ -17,6 +24,137 @@ class TestRadonTransform(BaseTestTransform):
         # can not really be tested well, but on ask can be demonstrated during the presentation
     )
 
+    def test_numeric_fallback(self):
+        def hanging_transform(*_):
+            time.sleep(60)
+
+        # the Dirac delta of the line is integrated out, the quadrature would miss it
+        with patch.object(RadonTransform, "_compute_transform_function", hanging_transform):
+            transform = RadonTransform(exp(-x ** 2 - y ** 2), timeout=0.5, numeric_fallback=True)
+            transformed_function = transform.numeric_transformed_function()
+        self.assertTrue(np.allclose(
+            transformed_function(np.array([0., 1.]), np.array([0., 0.3])), np.sqrt(np.pi) * np.exp(-np.array([0., 1.]))
+        ))
+
+        # the back-projection of sqrt(pi) exp(-t ** 2)
+        with patch.object(RadonTransform, "_compute_inverse_transform_function", hanging_transform):
+            transform = RadonTransform(sqrt(pi) * exp(-t ** 2), is_base_form=False, timeout=0.5, numeric_fallback=True)
+            base_function = transform.numeric_base_function()
+        self.assertTrue(np.allclose(base_function(np.array([0.]), np.array([0.])), np.sqrt(np.pi) / 2))
+
+    def test_inverse_transform_data_fbp_engine(self):
+        data = np.zeros((64, 64))
+        data[20:40, 25:45] = 1
+        angles = np.linspace(0., 180., 90, endpoint=False)
+        for circle in (True, False):
+            sinogram = self._transform_class.transform_data(data, angles=angles, circle=circle)
+            sinograms = np.stack([sinogram, 2 * sinogram])
+            reconstructed = self._transform_class.inverse_transform_data(
+                sinograms, angles=angles, circle=circle, engine="fbp", filter_name="hann"
+            )
+            expected = self._transform_class.inverse_transform_data(
+                sinogram, angles=angles, circle=circle, filter_name="hann"
+            )
+            self.assertEqual(reconstructed.shape, (2,) + expected.shape)
+            self.assertTrue(np.allclose(reconstructed, [expected, 2 * expected]))
+
+    def test_inverse_transform_data_iterative_engines(self):
+        data = np.zeros((48, 48))
+        data[15:30, 18:33] = 1
+        # few angles, where the iterative reconstructions beat the filtered back-projection
+        angles = np.linspace(0., 180., 20, endpoint=False)
+        sinogram = self._transform_class.transform_data(data, angles=angles, engine="matrix")
+        # the projections of the pixels are interpolated differently, but the mass on the detector is the same
+        self.assertTrue(np.allclose(
+            sinogram.sum(axis=0), self._transform_class.transform_data(data, angles=angles).sum(axis=0), rtol=0.02
+        ))
+
+        fbp_error = np.abs(
+            self._transform_class.inverse_transform_data(sinogram, angles=angles, engine="fbp") - data
+        ).mean()
+        for engine, iterations in (("sirt", 200), ("sart", 20), ("cgls", 20)):
+            reconstructed = self._transform_class.inverse_transform_data(
+                sinogram, angles=angles, engine=engine, iterations=iterations
+            )
+            self.assertLess(np.abs(reconstructed - data).mean(), fbp_error)
+
+        errors = []
+        self._transform_class.inverse_transform_data(
+            np.stack([sinogram, sinogram]), angles=angles, engine="cgls", iterations=50,
+            callback=lambda iteration, images: errors.append(np.abs(images - data).mean()) or len(errors) == 5
+        )
+        self.assertEqual(len(errors), 5)
+        self.assertLess(errors[-1], errors[0])
+
+    def test_radon_operator_save_load(self):
+        angles = np.linspace(0., 180., 30, endpoint=False)
+        operator = RadonOperator.from_geometry(32, angles, circle=False)
+        self.assertIs(operator.matrix, RadonOperator.from_geometry(32, angles, circle=False).matrix)
+        images = np.random.default_rng(0).random((2, 32, 32))
+        sinograms = operator.project(images)
+        self.assertEqual(sinograms.shape, (2, 46, 30))
+        # the back-projection is the adjoint of the projection
+        self.assertAlmostEqual(np.vdot(sinograms, sinograms), np.vdot(images, operator.back_project(sinograms)))
+
+        with tempfile.TemporaryDirectory() as path:
+            operator.save(path)
+            loaded = RadonOperator.load(path)
+            # read only views of the memory-mapped files
+            self.assertFalse(loaded.matrix.data.flags.writeable)
+            self.assertTrue(np.array_equal(loaded.project(images), sinograms))
+            # a warm start at the solution stays there
+            reconstructed = self._transform_class.inverse_transform_data(
+                sinograms[0], angles=angles, circle=False, engine="sart", iterations=1, initial=images[0],
+                operator=loaded
+            )
+            self.assertTrue(np.allclose(reconstructed, images[0]))
+            del loaded
+
+    def test_fourier_engine(self):
+        data = np.zeros((64, 64))
+        data[20:40, 25:45] = 1
+        data[30:35, 10:50] += 0.5
+        for circle in (True, False):
+            angles = np.linspace(0., 180., 64, endpoint=False)
+            sinogram = self._transform_class.transform_data(data, angles=angles, circle=circle)
+            fourier_sinogram = self._transform_class.transform_data(data, angles=angles, circle=circle, engine="fourier")
+            self.assertEqual(fourier_sinogram.shape, sinogram.shape)
+            self.assertLess(np.linalg.norm(fourier_sinogram - sinogram) / np.linalg.norm(sinogram), 0.02)
+
+            reconstructed = self._transform_class.inverse_transform_data(sinogram, angles=angles, circle=circle)
+            fourier_reconstructed = self._transform_class.inverse_transform_data(
+                np.stack([sinogram, sinogram]), angles=angles, circle=circle, engine="fourier"
+            )
+            self.assertEqual(fourier_reconstructed.shape, (2,) + reconstructed.shape)
+            # at least as close to the data as the filtered back-projection
+            self.assertLessEqual(np.abs(fourier_reconstructed[1] - data).mean(), np.abs(reconstructed - data).mean())
+
+        # unsorted angles, and angles beyond 180 degrees with mirrored projections
+        reconstructed = self._transform_class.inverse_transform_data(
+            fourier_sinogram, angles=angles, circle=False, engine="fourier"
+        )
+        shifted = angles[np.random.default_rng(0).permutation(64)] + 180
+        mirrored = self._transform_class.transform_data(data, angles=shifted, circle=False, engine="fourier")
+        self.assertTrue(np.allclose(
+            self._transform_class.inverse_transform_data(mirrored, angles=shifted, circle=False, engine="fourier"),
+            reconstructed, atol=1e-2
+        ))
+
+    def demonstrate_fourier_engine(self):
+        # compares the accuracy and the speed of the Fourier slice engine with skimage
+        data = np.zeros((400, 400))
+        data[150:250, 120:280] = 1
+        angles = np.linspace(0., 180., 400, endpoint=False)
+        for engine in ("skimage", "fourier"):
+            start = time.perf_counter()
+            sinogram = self._transform_class.transform_data(data, angles=angles, engine=engine)
+            transform_time = time.perf_counter() - start
+            start = time.perf_counter()
+            reconstructed = self._transform_class.inverse_transform_data(sinogram, angles=angles, engine=engine)
+            inverse_time = time.perf_counter() - start
+            print(f"{engine}: radon {transform_time:.3f} s, inverse {inverse_time:.3f} s, "
+                  f"mean error {np.abs(reconstructed - data).mean():.4f}")
+
     def demonstrate_radon(self):
         # Example usage
         # Create a sample 2D array (e.g., an image)
@@ -0,0 +1,84 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+import sympy as sp
+from sympy.abc import a, omega, t, x
+
+from utils.sympy_math import (
+    deep_almost_equal, functions_are_equal, funcs_are_equal_number_test, funcs_are_equal_probe, random_points
+)
+
+
+class TestSympyMath(TestCase):
+
+    def test_funcs_are_equal_probe(self):
+        y = sp.Symbol("y", positive=True)
+        for f1, f2, verdict in (
+                (sp.sin(x) ** 2 + sp.cos(x) ** 2, sp.Integer(1), True),
+                (sp.exp(x) ** 2, sp.exp(2 * x), True),
+                # equal by the assumptions of y only
+                (sp.sqrt(x ** 2), x, False),
+                (sp.sqrt(y ** 2), y, True),
+                (sp.log(a * x), sp.log(a) + sp.log(x), False),
+                (omega * sp.sin(t * sp.sqrt(omega ** 2)) / sp.sqrt(omega ** 2) * sp.Heaviside(t),
+                 sp.sin(omega * t) * sp.Heaviside(t), True),
+                # the cancellation in double precision is resolved by mpmath
+                (sp.expand((1 + x) ** 30) - x ** 30, sp.expand((1 + x) ** 30 - x ** 30), True),
+                (sp.DiracDelta(t), sp.Integer(0), None),
+        ):
+            self.assertIs(funcs_are_equal_probe(f1, f2), verdict)
+
+    def test_functions_are_equal_tiers(self):
+        f1, f2 = sp.cosh(x) ** 2 - sp.sinh(x) ** 2, sp.Integer(1) + 0 * a
+        with patch("utils.sympy_math.funcs_are_equal_sympy") as funcs_are_equal_sympy:
+            self.assertTrue(functions_are_equal(f1, f2))
+            # settled by the probe and memoized
+            self.assertTrue(functions_are_equal(f1, f2))
+        funcs_are_equal_sympy.assert_not_called()
+
+        with patch("utils.sympy_math.funcs_are_equal_sympy", return_value=True) as funcs_are_equal_sympy:
+            self.assertTrue(functions_are_equal(sp.DiracDelta(x) * x, sp.Integer(0)))
+        funcs_are_equal_sympy.assert_called_once()
+
+    def test_funcs_are_equal_number_test(self):
+        self.assertTrue(funcs_are_equal_number_test(
+            sp.besselj(1, x) * sp.exp(a * x), sp.exp(a * x) * sp.besselj(1, x) * (sp.sin(x) ** 2 + sp.cos(x) ** 2)
+        ))
+        # a distribution on the positive real line, where the branches of sqrt agree
+        def positive(symbol, n_points, rng, real=False):
+            return rng.uniform(0.1, 10, n_points)
+
+        # differs on 2 % of the interval only, which many points catch
+        def interval(symbol, n_points, rng, real=False):
+            return rng.uniform(0.1, 5, n_points)
+
+        y = sp.Symbol("y", real=True)
+        clipped = sp.Piecewise((y, y < 4.9), (4.9, True))
+        self.assertFalse(funcs_are_equal_number_test(clipped, y, num_tests=1000, seed=0, sampler=interval))
+
+        self.assertFalse(funcs_are_equal_number_test(sp.sqrt(x ** 2), x, seed=0))
+        self.assertTrue(funcs_are_equal_number_test(sp.sqrt(x ** 2), x, seed=0, sampler=positive))
+
+        # integrals are not compiled, they are evaluated with mpmath
+        integral = sp.Integral(sp.exp(-x * t), (t, 0, 1))
+        self.assertTrue(funcs_are_equal_number_test(integral, (1 - sp.exp(-x)) / x, seed=0))
+        self.assertFalse(funcs_are_equal_number_test(integral, (1 - sp.exp(-x)) / x + 1e-6, seed=0))
+
+    def test_random_points(self):
+        rng = np.random.default_rng(0)
+        points = random_points(x, 1000, rng)
+        self.assertTrue(np.all((np.abs(points) >= 0.1) & (np.abs(points) <= 5)))
+        # away from the branch cut on the negative real axis
+        self.assertTrue(np.all(np.abs(np.angle(points)) <= np.pi - 0.1))
+        self.assertTrue(np.all(random_points(sp.Symbol("y", positive=True), 100, rng) > 0))
+        self.assertTrue(np.isrealobj(random_points(x, 100, rng, real=True)))
+        self.assertEqual(random_points(sp.Symbol("n", integer=True), 100, rng).dtype.kind, "i")
+
+    def test_deep_almost_equal_arrays(self):
+        values = np.linspace(0, 1, 1000) * (1 + 1j)
+        self.assertTrue(deep_almost_equal(values, values + 1e-16))
+        self.assertFalse(deep_almost_equal(values, values + 1e-3))
+        self.assertTrue(deep_almost_equal(values, values + 1e-6, dps_tol=5))
+        self.assertFalse(deep_almost_equal(values, values[:-1]))
+        self.assertTrue(deep_almost_equal(np.array([sp.Float(1), sp.pi], dtype=object), [1, np.pi]))
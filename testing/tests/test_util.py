@@ -0,0 +1,59 @@
+import sys
+from unittest import TestCase
+
+import numpy as np
+import sympy as sp
+
+from utils.sympy_math import apply_to_number_to_leaves
+from utils.util import apply_to_leaves
+
+
+class TestApplyToLeaves(TestCase):
+
+    def test_apply_to_leaves(self):
+        shared = [1, 2]
+        data = {"a": shared, "b": (shared, {3}), "c": np.arange(3)}
+        result = apply_to_leaves(data, lambda value: value * 10, array_func=lambda values: values * 100, in_place=False)
+        self.assertEqual(result["a"], [10, 20])
+        self.assertEqual(result["b"], ([10, 20], {30}))
+        self.assertTrue(np.array_equal(result["c"], [0, 100, 200]))
+        # shared substructures stay shared, the input is unchanged
+        self.assertIs(result["a"], result["b"][0])
+        self.assertEqual(data["a"], [1, 2])
+
+        result = apply_to_leaves(data, lambda value: value * 10)
+        self.assertIs(result, data)
+        self.assertEqual(data["a"], [10, 20])
+
+        self.assertEqual(apply_to_leaves(["a", 1], int, on_exception=lambda value, _: None), [None, 1])
+
+    def test_apply_to_leaves_deep_and_cyclic(self):
+        nested = [0]
+        innermost = nested
+        for _ in range(sys.getrecursionlimit() * 2):
+            innermost.append([0])
+            innermost = innermost[-1]
+        result = apply_to_leaves(nested, lambda value: value + 1, in_place=False)
+        for _ in range(sys.getrecursionlimit() * 2):
+            self.assertEqual(result[0], 1)
+            result = result[-1]
+
+        cyclic = [1]
+        cyclic.append(cyclic)
+        result = apply_to_leaves(cyclic, lambda value: value + 1, in_place=False)
+        self.assertEqual(result[0], 2)
+        self.assertIs(result[1], result)
+
+        cyclic = []
+        cyclic.append((cyclic,))
+        # the tuple is rebuilt after the list, which refers back to the list
+        result = apply_to_leaves(cyclic, str, in_place=False)
+        self.assertIs(result[0][0], result)
+        with self.assertRaises(ValueError):
+            apply_to_leaves(cyclic[0], str)
+
+    def test_apply_to_number_to_leaves_arrays(self):
+        values = np.linspace(0, 1, 5)
+        result = apply_to_number_to_leaves({"float": values, "object": np.array([sp.Rational(1, 2)], dtype=object)})
+        self.assertIs(result["float"], values)
+        self.assertIsInstance(result["object"][0], sp.Float)
@@ -1,7 +1,9 @@
+import numpy as np
 from sympy import Expr
 
 from testing.base_tests.base_transform_test import BaseTestTransform
 from transforms.wavelet import WaveletTransform
+from utils.wavelets import cwt_bank, fourier_periods, wavelet_filters
 
 
 class TestWaveletTransform(BaseTestTransform):
@@ -15,9 +17,71 @@ class TestWaveletTransform(BaseTestTransform):
     _transform_data_kwargs_to_solution = (
         (
             {
-                "smth1": [1, 2, 3],
-                "smth2": [1, 2, 3],
+                "values": np.array([1., 2., 3., 4.]),
             },
-            1
+            [np.array([5.]), np.array([-2.]), np.array([-1, -1]) / np.sqrt(2)]
         ),
     )
+
+    def test_wavelet_filters(self):
+        self.assertTrue(np.allclose(
+            wavelet_filters("db2").rec_lo,
+            [0.48296291314453416, 0.8365163037378079, 0.2241438680420134, -0.12940952255126037]
+        ))
+        self.assertTrue(np.allclose(wavelet_filters("coif1").rec_lo, [
+            -0.0727326195128539, 0.3378976624578092, 0.8525720202122554,
+            0.38486484686420286, -0.0727326195128539, -0.01565572813546454
+        ]))
+        for wavelet in ("db6", "sym4", "sym8", "coif2"):
+            rec_lo = wavelet_filters(wavelet).rec_lo
+            # orthonormal to its even shifts
+            autocorrelation = np.correlate(rec_lo, rec_lo, "full")[rec_lo.size - 1::2]
+            self.assertTrue(np.allclose(autocorrelation, np.eye(1, rec_lo.size // 2)[0]))
+            self.assertAlmostEqual(rec_lo.sum(), np.sqrt(2))
+
+    def test_transform_data_batch(self):
+        values = np.random.default_rng(0).normal(size=(10, 64))
+        for wavelet in ("haar", "db4", "sym5", "coif2"):
+            coefficients = self.transform_class.transform_data(values, wavelet=wavelet, level=3)
+            self.assertEqual([c.shape for c in coefficients], [(10, 8), (10, 8), (10, 16), (10, 32)])
+            # the transform is orthogonal
+            self.assertAlmostEqual(sum(np.sum(c ** 2) for c in coefficients), np.sum(values ** 2))
+            self.assertTrue(np.allclose(
+                self.transform_class.inverse_transform_data(coefficients, wavelet=wavelet), values
+            ))
+
+    def test_transform_data_lifting(self):
+        values = np.random.default_rng(0).normal(size=(10, 32))
+        for wavelet in ("haar", "db2"):
+            coefficients = self.transform_class.transform_data(values, wavelet=wavelet)
+            lifted = self.transform_class.transform_data(values, wavelet=wavelet, lifting=True)
+            self.assertTrue(all(np.allclose(a, b) for a, b in zip(coefficients, lifted)))
+            self.assertTrue(np.allclose(
+                self.transform_class.inverse_transform_data(lifted, wavelet=wavelet, lifting=True), values
+            ))
+
+        working_array = values.copy()
+        self.transform_class.transform_data(working_array, wavelet="db2", lifting=True, overwrite=True)
+        self.assertFalse(np.allclose(working_array, values))
+
+    def test_continuous_transform_data(self):
+        time_points = np.arange(1024)
+        values = np.sin(2 * np.pi * time_points / 32)
+        scales = np.geomspace(2, 200, 60)
+        for wavelet in ("morlet", "mexican_hat", "paul"):
+            power = self.transform_class.continuous_transform_data(values, scales, wavelet=wavelet, scalogram=True)
+            self.assertEqual(power.shape, (60, 1024))
+            # the power peaks at the scale of the period of the sine
+            period = fourier_periods(scales, wavelet)[np.argmax(power.mean(axis=-1))]
+            self.assertAlmostEqual(period / 32, 1, delta=0.1)
+
+    def test_continuous_transform_data_single_precision(self):
+        values = np.random.default_rng(0).normal(size=(4, 256))
+        scales = np.geomspace(1, 32, 20)
+        coefficients = self.transform_class.continuous_transform_data(values, scales)
+        power = self.transform_class.continuous_transform_data(values, scales, single_precision=True, scalogram=True)
+        self.assertEqual(coefficients.dtype, np.complex128)
+        self.assertEqual(power.dtype, np.float32)
+        self.assertTrue(np.allclose(power, np.abs(coefficients) ** 2, rtol=1e-4, atol=1e-4))
+        # the bank is reused for windows of the same length
+        self.assertIs(cwt_bank("morlet", tuple(scales), 256, 1.0), cwt_bank("morlet", tuple(scales), 256, 1.0))
@@ -1,12 +1,23 @@
+import time
+from unittest.mock import patch
+
+import numpy as np
+from sympy import Heaviside, I, KroneckerDelta, Rational, Sum, cos, factor, lambdify, simplify, sin
+from sympy.abc import a, k, n, z
+
 from testing.base_tests.base_transform_test import BaseTestTransform
-from transforms.z import ZTransform
+from transforms.z import ZTransform, ZContour
+from utils.z_rules import inverse_z_transform_rational, z_transform_rules
 
 
 class TestZTransform(BaseTestTransform):
     _transform_class = ZTransform
 
     _transform_function_to_solution_dict = {
-        # ImplementationLeftAsExerciseForTheUserError
+        n: z / (z - 1) ** 2,
+        a ** n: z / (z - a),
+        n * a ** n: a * z / (z - a) ** 2,
+        n ** 2 + 2 ** (n + 1): z * (z + 1) / (z - 1) ** 3 + 2 * z / (z - 2),
     }
 
     values_str = "values"
@@ -21,6 +32,109 @@ class TestZTransform(BaseTestTransform):
                 n_values_str: [0, 1, 2, 3],
                 z_values_str: [2, 3],
             },
-            [1.875, 1.481481481481]
+            np.array([1.875, 1.481481481481])
         ),
     )
+
+    def test_transform_data_on_contour(self):
+        values = np.random.default_rng(0).standard_normal((2, 64))
+        n_values = np.arange(-3, 61)
+        for contour in (
+                ZContour(start=np.exp(0.3j), ratio=np.exp(0.01j), count=100),  # arc on the unit circle
+                ZContour(start=0.9, ratio=1.002 * np.exp(0.05j), count=50),  # spiral
+        ):
+            transformed_data = self.transform_class.transform_data(values, n_values, contour=contour)
+            solution = values @ np.power(contour.points()[:, np.newaxis], -n_values.astype(float)).T
+            self.assertTrue(np.allclose(transformed_data, solution, rtol=1e-9, atol=0))
+            self.assertTrue(np.allclose(
+                self.transform_class.transform_data(values, n_values, z_values=contour.points()),
+                solution, rtol=1e-12, atol=0
+            ))
+            self.assertEqual(
+                self.transform_class.transform_data(values, n_values, contour=contour, dtype=np.complex64).dtype,
+                np.complex64
+            )
+            # with dtype=object the points of the contour are summed with mpmath instead of the chirp-z transform
+            self.assertTrue(np.allclose(
+                self.transform_class.transform_data(values[0], n_values, contour=contour, dtype=object).astype(complex),
+                solution[0], rtol=1e-12, atol=0
+            ))
+
+    def test_transform_data_sparse(self):
+        # the dense sequence of n-values up to 10 ** 9 would not fit into memory
+        n_values = np.array([0, 3, 10 ** 9])
+        values = np.array([1., 2., 3.])
+        z_values = np.array([1., 2., 1j])
+        self.assertTrue(np.allclose(
+            self.transform_class.transform_data(values, n_values, z_values=z_values),
+            [6, 1 + 2 / 8, 1 + 2j + 3]
+        ))
+        self.assertTrue(np.allclose(
+            self.transform_class.transform_data(values, n_values, contour=ZContour(start=1, ratio=1j, count=3)),
+            [6, 1 + 2j + 3, 1 - 2 + 3]
+        ))
+
+    def test_numeric_fallback(self):
+        def hanging_transform(*_):
+            time.sleep(60)
+
+        with patch.object(ZTransform, "_compute_transform_function", hanging_transform):
+            transform = ZTransform(Rational(1, 2) ** n, timeout=0.5, numeric_fallback=True)
+            transformed_function = transform.numeric_transformed_function()
+        z_values = np.array([2., 3., 1 + 1j])
+        self.assertTrue(np.allclose(transformed_function(z_values), z_values / (z_values - 0.5)))
+        # the series diverges outside of the region of convergence abs(z) > 1 / 2
+        self.assertTrue(np.isnan(transformed_function(np.array([0.25]))).all())
+
+    def test_z_transform_rules(self):
+        for function, solution in (
+                (cos(3 * n) / 2 ** n, 2 * z * (2 * z - cos(3)) / (4 * z ** 2 - 4 * z * cos(3) + 1)),
+                # delay
+                ((n - 2) * Heaviside(n - 2), z ** -2 * z / (z - 1) ** 2),
+                (KroneckerDelta(n, 3), z ** -3),
+                # convolution
+                (Sum(a ** k * 2 ** (n - k), (k, 0, n)), z ** 2 / ((z - a) * (z - 2))),
+        ):
+            self.assertEqual(simplify(z_transform_rules(function, n, z) - solution), 0)
+
+        z_values = np.array([7., 2 + 3j])
+        for function in (
+                # sums in the arguments and powers of sines are rewritten into exponentials
+                sin(3 * n + 1), sin(n) ** 2, n * sin(2 * n + 1),
+                # the step is Heaviside(0) = 1/2 at n = k like in the series, unless it is given
+                2 ** n * Heaviside(n - 3), n * Heaviside(n - 1), n * Heaviside(n - 1, 1), Heaviside(n),
+        ):
+            transform = lambdify(z, z_transform_rules(function, n, z))
+            terms = lambdify(n, function)
+            series = sum(terms(index) * z_values ** -index for index in range(200))
+            self.assertTrue(np.allclose(transform(z_values), series, rtol=1e-12, atol=0))
+
+        # table hits are cached
+        z_transform_rules(sin(n) * n, n, z)
+        hits = z_transform_rules.cache_info().hits
+        transform = self.transform_class.z_transform(sin(n) * n, n, z)
+        self.assertEqual(z_transform_rules.cache_info().hits, hits + 1)
+        self.assertEqual(factor(transform), factor(z * (z ** 2 - 1) * sin(1) / (z ** 2 - 2 * z * cos(1) + 1) ** 2))
+
+    def test_inverse_z_transform_rational(self):
+        # complex conjugate poles give a real damped sine
+        inverse = inverse_z_transform_rational(z / (z ** 2 - z + Rational(1, 2)), z, n)
+        self.assertFalse(inverse.has(I))
+        values = [complex(inverse.subs(n, index)) for index in range(10)]
+        sequence = [0, 1]
+        for _ in range(8):
+            sequence.append(sequence[-1] - sequence[-2] / 2)
+        self.assertTrue(np.allclose(values, sequence))
+
+        # a pole at zero is a delayed impulse
+        self.assertEqual(
+            inverse_z_transform_rational((z + 1) / z ** 2, z, n), KroneckerDelta(n, 1) + KroneckerDelta(n, 2)
+        )
+        self.assertIsNone(inverse_z_transform_rational(z ** 2 / (z - 1), z, n))
+
+        # the poles of irreducible factors of a degree above 2 are numeric, instead of minutes of simplification
+        for transformed in (z / (z ** 3 - z ** 2 + 1), (z ** 2 + 1) / (z ** 5 + z + 1)):
+            inverse = ZTransform.inverse_z_transform(transformed, n, z)
+            values = np.array([complex(inverse.subs(n, index)) for index in range(100)])
+            self.assertTrue(np.allclose(values.imag, 0))
+            self.assertAlmostEqual(np.sum(values * 3.0 ** -np.arange(100)), complex(transformed.subs(z, 3)))
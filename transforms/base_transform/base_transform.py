@@ -1,12 +1,21 @@
 """
 The Base class for BaseTransform objects
 """
-from typing import Tuple, Union, List
+import os
+from functools import cached_property
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
 import sympy as sp
 from sympy.integrals.transforms import IntegralTransform
 
+from utils.bulk import transform_tiles
+from utils.cache import get_symbolic_cache
+from utils.parallel import transform_many
+from exceptions import TransformTimeoutError
+from utils.util import call_in_subprocess
+from utils.consts import ZERO
 from utils.sympy_math import (
-    replace_unevaled_integrals_with_forms, to_number
+    lambdify_numeric, replace_unevaled_integrals_with_forms, to_number
 )
 
 
@@ -17,6 +26,8 @@ class BaseTransform:
     After initialization you got the following attributes:
         self.base_function: which is the base e.g. f(t) in Laplace Transforms
         self.transformed_function: which is the transform of the base function e.g. F(s) in Laplace Transforms
+    The one that was not given is computed lazily on first access, or eagerly with compute().
+    With a timeout it is computed eagerly at construction in a subprocess, which is killed when the time is up.
 
     In addition, you have the methods:
 
@@ -27,8 +38,20 @@ class BaseTransform:
     def __init__(
             self,
             function: sp.Expr,
-            is_base_form: bool = True
+            is_base_form: bool = True,
+            timeout: Optional[float] = None,
+            numeric_fallback: bool = False
     ):
+        """
+        Parameters:
+        - function: The base function or the transformed function.
+        - is_base_form: Whether function is the base function.
+        - timeout: The maximum number of seconds for the symbolic computation of the other side,
+                   which then happens at construction. A TransformTimeoutError is raised if it takes longer.
+        - numeric_fallback: Whether to use the unevaluated integral of the transform instead of raising
+                            a TransformTimeoutError, which to_numeric() evaluates by quadrature,
+                            or the unevaluated series of the Z-transform, which it sums numerically.
+        """
 
         if type(self) is BaseTransform:
             raise TypeError(
@@ -38,16 +61,81 @@ class BaseTransform:
 
         # validate the given function
         function = self._validate_input(function)
+        # private, so they are not part of the symbolic parameters of the cache keys
+        self._timeout = timeout
+        self._numeric_fallback = numeric_fallback
 
-        # calculate the transform and inverse transform
-        # the self. that is assigned to function must be referred
-        # first to be able to be used in the transform or inverse transform
+        # only the given side is assigned, the other one is computed lazily
+        # by the cached properties below on first access or by compute()
         if is_base_form:
             self.base_function = function
-            self.transformed_function = self._transform_function()
         else:
             self.transformed_function = function
-            self.base_function = self._inverse_transform_function()
+
+        if timeout is not None:
+            self.compute(timeout=timeout)
+
+    @cached_property
+    def base_function(self) -> Union[Tuple, sp.Expr]:
+        return self._inverse_transform_function()
+
+    @cached_property
+    def transformed_function(self) -> Union[Tuple, sp.Expr]:
+        return self._transform_function()
+
+    @property
+    def is_computed(self) -> bool:
+        """
+        Whether both the base function and the transformed function are available without computation.
+        """
+        return "base_function" in vars(self) and "transformed_function" in vars(self)
+
+    @classmethod
+    def transform_many(
+            cls,
+            functions: Sequence[Union[sp.Expr, Tuple]],
+            is_base_form: bool = True,
+            timeout: Optional[float] = None,
+            max_workers: Optional[int] = None,
+            **kwargs
+    ) -> List[Union["BaseTransform", Exception]]:
+        """
+        Construct and compute the transforms of many functions in parallel processes, see utils.parallel.
+        Results in the symbolic cache are used without computation and new results are stored in it.
+
+        Parameters:
+        - functions: The functions to transform.
+        - is_base_form: Whether the functions are base functions or transformed functions.
+        - timeout: The maximum number of seconds for each transform.
+        - max_workers: The number of processes, by default the number of CPUs.
+        - kwargs: The other arguments of the constructor, e.g. the symbols.
+
+        Returns:
+        - The computed transforms in the order of the functions,
+          or the exception of every function whose transform failed, e.g. a TimeoutError.
+        """
+        return transform_many(
+            cls, functions, is_base_form=is_base_form, timeout=timeout, max_workers=max_workers, **kwargs
+        )
+
+    def compute(self, timeout: Optional[float] = None) -> "BaseTransform":
+        """
+        Eagerly compute the missing side of the transform, instead of on first access.
+
+        Parameters:
+        - timeout: The maximum number of seconds for the symbolic computation, which then runs in a subprocess
+                   that is killed when the time is up. A TransformTimeoutError is raised if it takes longer,
+                   unless the transform was constructed with numeric_fallback.
+                   Defaults to the timeout given at construction.
+
+        Returns:
+        - The transform itself, with base_function and transformed_function computed.
+        """
+        if "transformed_function" not in vars(self):
+            self.transformed_function = self._transform_function(timeout=timeout)
+        elif "base_function" not in vars(self):
+            self.base_function = self._inverse_transform_function(timeout=timeout)
+        return self
 
     @staticmethod
     def _validate_input(function: sp.Expr | Tuple):
@@ -125,39 +213,162 @@ class BaseTransform:
     def transformed_func_as_func(self):
         return self._extract_function(self.transformed_function)
 
+    @property
+    def _symbolic_parameters(self) -> Dict[str, Any]:
+        """
+        The public attributes of the transform except the functions, e.g. its symbols and the order.
+        Together with the class and the function they determine the result of a symbolic transform.
+        """
+        return {
+            name: value for name, value in vars(self).items()
+            if not name.startswith("_") and name not in ("base_function", "transformed_function")
+        }
+
+    def _cached_transform_result(
+            self,
+            direction: str,
+            function: Union[Tuple, sp.Expr],
+            compute: Callable[[], Union[Tuple, sp.Expr]],
+            unevaluated: Callable[[], Union[Tuple, sp.Expr]],
+            timeout: Optional[float] = None
+    ) -> Union[Tuple, sp.Expr]:
+        """
+        Returns the result of the symbolic (inverse) transform from the symbolic cache if it is there,
+        otherwise computes it, within timeout seconds if given, and stores it in the cache.
+        The unevaluated fallback after a timeout is not cached.
+        """
+        cache = get_symbolic_cache()
+        key = None
+        if cache is not None:
+            key = cache.make_key(type(self), function, self._symbolic_parameters, direction)
+            result = cache.get(key)
+            if result is not None:
+                return result
+
+        timeout = self._timeout if timeout is None else timeout
+        try:
+            result = call_in_subprocess(lambda: self._get_transform_result(compute()), timeout=timeout)
+        except TimeoutError:
+            if not self._numeric_fallback:
+                raise TransformTimeoutError(self, timeout) from None
+            try:
+                return self._get_transform_result(unevaluated())
+            except NotImplementedError:
+                raise TransformTimeoutError(self, timeout) from None
+
+        if cache is not None:
+            cache.set(key, result)
+        return result
+
+    """
+    Numeric evaluation of the symbolic functions
+    """
+    @property
+    def _base_symbols(self) -> Tuple[sp.Symbol, ...]:
+        """
+        The variables of the base function, e.g. (t,) in Laplace Transforms.
+        """
+        return ()
+
+    @property
+    def _transformed_symbols(self) -> Tuple[sp.Symbol, ...]:
+        """
+        The variables of the transformed function, e.g. (s,) in Laplace Transforms.
+        """
+        return ()
+
+    def to_numeric(self, modules: Union[str, Sequence] = "numpy") -> Tuple[Callable, Callable]:
+        """
+        Compile base_func_as_func and transformed_func_as_func into vectorized numeric functions.
+        The compiled functions are cached on the instance.
+
+        The positional arguments of the functions are the variables of the respective function,
+        e.g. t for f(t) and s for F(s) in Laplace Transforms, followed by the remaining free symbols
+        sorted by name. All arguments can also be passed as keyword arguments by the names of the symbols.
+        Unevaluated integrals, e.g. of transforms SymPy could not solve, are evaluated by numeric quadrature,
+        see utils.quadrature, and unevaluated series by utils.sympy_math.NumericSum.
+
+        Parameters:
+        - modules: The lambdify modules, e.g. "numpy" or "numexpr" if installed.
+
+        Returns:
+        - A tuple of the numeric base function and the numeric transformed function.
+        """
+        return self.numeric_base_function(modules), self.numeric_transformed_function(modules)
+
+    def numeric_base_function(self, modules: Union[str, Sequence] = "numpy") -> Callable:
+        return self._numeric_function("base", self.base_func_as_func, self._base_symbols, modules)
+
+    def numeric_transformed_function(self, modules: Union[str, Sequence] = "numpy") -> Callable:
+        return self._numeric_function("transformed", self.transformed_func_as_func, self._transformed_symbols, modules)
+
+    def _numeric_function(
+            self,
+            side: str,
+            function: sp.Expr,
+            variables: Tuple[sp.Symbol, ...],
+            modules: Union[str, Sequence]
+    ) -> Callable:
+        numeric_functions = vars(self).setdefault("_numeric_functions", {})
+        key = (side, repr(modules))
+        if key not in numeric_functions:
+            parameters = sorted(function.free_symbols - set(variables) - {ZERO}, key=str)
+            numeric_functions[key] = lambdify_numeric(function, (*variables, *parameters), modules=modules)
+        return numeric_functions[key]
+
     """
     Transformations applied to a symbolic mathematical function
     """
-    def _transform_function(self) -> Tuple:
-        if not hasattr(self, "base_function"):
-            raise AttributeError("base_function must be an attribute of the class before applying transform")
-        transform = self._compute_transform_function()
-        return self._get_transform_result(transform)
+    def _transform_function(self, timeout: Optional[float] = None) -> Tuple:
+        return self._cached_transform_result(
+            direction="transform",
+            function=self.base_function,
+            compute=self._compute_transform_function,
+            unevaluated=self._unevaluated_transform_function,
+            timeout=timeout
+        )
 
     def _compute_transform_function(self) -> Union[Tuple, sp.Expr]:
         raise NotImplementedError
 
+    def _unevaluated_transform_function(self) -> sp.Expr:
+        """
+        The unevaluated transform, e.g. an IntegralTransform or an Integral, used by the numeric fallback.
+        """
+        raise NotImplementedError
+
     """
     Inverse Transformations applied to a symbolic mathematical function
     """
-    def _inverse_transform_function(self) -> Tuple:
-        if not hasattr(self, "transformed_function"):
-            raise AttributeError("transformed_function must be an attribute of the class before applying inverse transform")
-        inverse_transform = self._compute_inverse_transform_function()
-        return self._get_transform_result(inverse_transform)
+    def _inverse_transform_function(self, timeout: Optional[float] = None) -> Tuple:
+        return self._cached_transform_result(
+            direction="inverse",
+            function=self.transformed_function,
+            compute=self._compute_inverse_transform_function,
+            unevaluated=self._unevaluated_inverse_transform_function,
+            timeout=timeout
+        )
 
     def _compute_inverse_transform_function(self) -> Union[Tuple, sp.Expr]:
         raise NotImplementedError
 
+    def _unevaluated_inverse_transform_function(self) -> sp.Expr:
+        """
+        The unevaluated inverse transform, used by the numeric fallback.
+        """
+        raise NotImplementedError
+
     """
     Data Transformations, applied to given data onto the Datapoints
     """
     @classmethod
-    def transform_data(cls, *args, **kwargs) -> List[sp.Number]:
+    def transform_data(cls, *args, **kwargs) -> np.ndarray:
         """
         Is meant to be able to take discrete data points and transform them.
         This transformation depends on the transform and its applications
         and varies between Transforms.
+        The data points are array-likes, the result is an ndarray of the dtype given as keyword argument dtype,
+        see utils.dtypes for the NumPy dtypes and object for arbitrary precision with mpmath.
         """
         raise NotImplementedError
 
@@ -165,9 +376,72 @@ class BaseTransform:
     Inverse Data Transformations, applied to given data onto the Datapoints
     """
     @classmethod
-    def inverse_transform_data(cls, *args, **kwargs) -> List[sp.Number]:
+    def inverse_transform_data(cls, *args, **kwargs) -> np.ndarray:
         """
         Is meant to inverse transform_data() and return the arguments given to it,
         while only provided with the output of it.
+        Takes the keyword argument dtype like transform_data().
         """
         raise NotImplementedError
+
+    """
+    Bulk Data Transformations of memory-mapped files larger than the memory
+    """
+    @classmethod
+    def transform_data_file(
+            cls,
+            source: Union[str, os.PathLike, np.ndarray],
+            output_path: Union[str, os.PathLike],
+            *args,
+            axis: int = 0,
+            tile_size: Optional[int] = None,
+            workers: Optional[int] = None,
+            raw_dtype: Optional[np.dtype] = None,
+            raw_shape: Optional[Sequence[int]] = None,
+            raw_offset: int = 0,
+            **kwargs
+    ) -> np.memmap:
+        """
+        Apply transform_data() to a .npy or raw binary file in tiles along axis,
+        writing the results into the memory-mapped .npy file output_path, see utils.bulk.
+        Every tile is passed as first argument, followed by args and kwargs,
+        so the transform must treat axis as a batch axis, e.g. the rows of the batches of the Laplace transform.
+
+        Parameters:
+        - source: The path of the input file, or an array.
+        - output_path: The path of the .npy output file.
+        - axis: The axis to tile.
+        - tile_size: The number of entries along axis per tile, by default tiles of about 64 MiB.
+        - workers: The number of threads transforming tiles concurrently.
+        - raw_dtype, raw_shape, raw_offset: The dtype, shape and header size of a raw binary input file.
+                                            dtype and shape in kwargs are passed on to transform_data().
+
+        Returns:
+        - The transformed data as read-write memory map of output_path.
+        """
+        return transform_tiles(
+            lambda tile: cls.transform_data(tile, *args, **kwargs), source, output_path, axis=axis,
+            tile_size=tile_size, workers=workers, dtype=raw_dtype, shape=raw_shape, offset=raw_offset
+        )
+
+    @classmethod
+    def inverse_transform_data_file(
+            cls,
+            source: Union[str, os.PathLike, np.ndarray],
+            output_path: Union[str, os.PathLike],
+            *args,
+            axis: int = 0,
+            tile_size: Optional[int] = None,
+            workers: Optional[int] = None,
+            raw_dtype: Optional[np.dtype] = None,
+            raw_shape: Optional[Sequence[int]] = None,
+            raw_offset: int = 0,
+            **kwargs
+    ) -> np.memmap:
+        """
+        Apply inverse_transform_data() to a file in tiles, like transform_data_file().
+        """
+        return transform_tiles(
+            lambda tile: cls.inverse_transform_data(tile, *args, **kwargs), source, output_path, axis=axis,
+            tile_size=tile_size, workers=workers, dtype=raw_dtype, shape=raw_shape, offset=raw_offset
+        )
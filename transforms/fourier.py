@@ -1,10 +1,13 @@
-from typing import Union, Tuple, List
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
+import mpmath
 import numpy as np
 import sympy as sp
 from sympy import abc
 
 from transforms.base_transform.base_transform import BaseTransform
+from utils.dtypes import as_dtype, check_dtype, is_arbitrary_precision, mpmath_ufunc, working_array
+from utils.stft import istft_overlap_add, stft_frames
 
 
 class FourierTransform(BaseTransform):
@@ -15,14 +18,26 @@ class FourierTransform(BaseTransform):
             is_base_form: bool = True,
             t: sp.Symbol = abc.t,
             omega: sp.Symbol = abc.omega,
+            timeout: Optional[float] = None,
+            numeric_fallback: bool = False,
     ):
         self.t = t
         self.omega = omega
         super().__init__(
             function=function,
-            is_base_form=is_base_form
+            is_base_form=is_base_form,
+            timeout=timeout,
+            numeric_fallback=numeric_fallback
         )
 
+    @property
+    def _base_symbols(self) -> Tuple[sp.Symbol, ...]:
+        return (self.t,)
+
+    @property
+    def _transformed_symbols(self) -> Tuple[sp.Symbol, ...]:
+        return (self.omega,)
+
     def _compute_transform_function(self) -> Union[Tuple, sp.Basic]:
         """
         Compute the symbolic Fourier transform of the base function.
@@ -41,12 +56,177 @@ class FourierTransform(BaseTransform):
         inverse_transform = sp.inverse_fourier_transform(self.transformed_func_as_func, k=self.omega, x=self.t)
         return inverse_transform
 
+    def _unevaluated_transform_function(self) -> sp.Expr:
+        return sp.FourierTransform(self.base_func_as_func, self.t, self.omega)
+
+    def _unevaluated_inverse_transform_function(self) -> sp.Expr:
+        return sp.InverseFourierTransform(self.transformed_func_as_func, self.omega, self.t)
+
+    @classmethod
+    def transform_data(
+            cls,
+            values: Union[List[sp.Number], np.ndarray],
+            real: bool = False,
+            axes: Optional[Sequence[int]] = None,
+            dtype: Optional[np.dtype] = None
+    ) -> np.ndarray:
+        """
+        Compute the discrete Fourier transform of the values with the FFT.
+
+        Parameters:
+        - values: The signal, multidimensional arrays are transformed over all axes or the given axes.
+        - real: Whether the values are real, the redundant negative frequencies are then skipped (rfft/rfftn),
+                which halves compute and memory.
+        - axes: The axes to transform over, uses fftn/rfftn for multidimensional transforms.
+        - dtype: The dtype of the result, see utils.dtypes. With complex64 the FFT is computed in single precision.
+                 With object the DFT of one dimensional values is computed with mpmath.
+
+        Returns:
+        - The Fourier coefficients, for real values only the non-negative frequencies of the last transformed axis.
+        """
+        dtype = check_dtype(dtype)
+        values = working_array(values, dtype)
+        if is_arbitrary_precision(dtype):
+            cls._require_one_dimensional(values, axes)
+            transformed_data = _dft_mpmath(values, inverse=False)
+            return transformed_data[:values.size // 2 + 1] if real else transformed_data
+        if axes is None and values.ndim <= 1:
+            transformed_data = np.fft.rfft(values) if real else np.fft.fft(values)
+        else:
+            transformed_data = np.fft.rfftn(values, axes=axes) if real else np.fft.fftn(values, axes=axes)
+        return as_dtype(transformed_data, dtype)
+
+    @classmethod
+    def inverse_transform_data(
+            cls,
+            transformed_data: Union[List[sp.Number], np.ndarray],
+            real: bool = False,
+            axes: Optional[Sequence[int]] = None,
+            shape: Optional[Union[int, Sequence[int]]] = None,
+            dtype: Optional[np.dtype] = None
+    ) -> np.ndarray:
+        """
+        Invert transform_data() with the inverse FFT.
+
+        Parameters:
+        - transformed_data: The Fourier coefficients as returned by transform_data().
+        - real: Whether the coefficients are the output of a real transform (irfft/irfftn),
+                the result is then real.
+        - axes: The axes to transform over, uses ifftn/irfftn for multidimensional transforms.
+        - shape: The length (or shape over the axes) of the signal. Needed for real transforms of signals
+                 with an odd length along the last axis, as it can not be recovered from the coefficients.
+        - dtype: The dtype of the result, see utils.dtypes. With object the inverse DFT of one dimensional
+                 coefficients is computed with mpmath.
+
+        Returns:
+        - The reconstructed signal.
+        """
+        dtype = check_dtype(dtype)
+        transformed_data = working_array(transformed_data, dtype)
+        if is_arbitrary_precision(dtype):
+            cls._require_one_dimensional(transformed_data, axes)
+            return _inverse_dft_mpmath(transformed_data, real, shape)
+        if axes is None and transformed_data.ndim <= 1:
+            if real:
+                inverse_transformed_data = np.fft.irfft(transformed_data, n=shape)
+            else:
+                inverse_transformed_data = np.fft.ifft(transformed_data, n=shape)
+        else:
+            if shape is not None and axes is None:
+                # NumPy 2 deprecated s without axes, the shape is over the last axes
+                shape = tuple(np.atleast_1d(shape))
+                axes = tuple(range(-len(shape), 0))
+            if real:
+                inverse_transformed_data = np.fft.irfftn(transformed_data, s=shape, axes=axes)
+            else:
+                inverse_transformed_data = np.fft.ifftn(transformed_data, s=shape, axes=axes)
+        return as_dtype(inverse_transformed_data, dtype)
+
+    @staticmethod
+    def _require_one_dimensional(values: np.ndarray, axes: Optional[Sequence[int]]):
+        if axes is not None or values.ndim != 1:
+            raise ValueError("dtype=object is only supported for one dimensional transforms.")
+
     @classmethod
-    def transform_data(cls, values: List[sp.Number]) -> List:
-        transformed_data = list(np.fft.fft(values))
-        return transformed_data
+    def stream_transform_data(
+            cls,
+            chunks: Iterable[np.ndarray],
+            window: Union[str, np.ndarray] = "hann",
+            n_window: int = 256,
+            hop: Optional[int] = None,
+            real: bool = True
+    ) -> Iterator[np.ndarray]:
+        """
+        Compute the short-time Fourier transform of a signal that arrives in chunks, e.g. from a socket or a file
+        larger than the memory. Only the overlap of the frames is kept between chunks, see utils.stft.
+
+        Parameters:
+        - chunks: An iterable over the chunks of the signal, the samples are on the last axis.
+        - window: The window, a name for scipy.signal.get_window or an array of n_window samples.
+        - n_window: The number of samples of a frame.
+        - hop: The number of samples between two frames, by default n_window // 4.
+        - real: Whether the signal is real, only the non-negative frequencies are then computed.
+
+        Returns:
+        - A generator of the spectra of the frames, frame by frame.
+        """
+        return stft_frames(chunks, window=window, n_window=n_window, hop=hop, real=real)
 
     @classmethod
-    def inverse_transform_data(cls, transformed_data: List[sp.Number]) -> List[sp.Number]:
-        inverse_transformed_data = list(np.fft.ifft(transformed_data))
-        return inverse_transformed_data
+    def stream_inverse_transform_data(
+            cls,
+            spectra: Iterable[np.ndarray],
+            window: Union[str, np.ndarray] = "hann",
+            n_window: int = 256,
+            hop: Optional[int] = None,
+            real: bool = True,
+            length: Optional[int] = None
+    ) -> Iterator[np.ndarray]:
+        """
+        Invert stream_transform_data() incrementally by weighted overlap-add, normalized by the sum of the squared
+        windows, which only keeps one window of samples in memory.
+
+        Parameters:
+        - spectra: An iterable over the spectra of the frames.
+        - window, n_window, hop, real: The parameters of stream_transform_data().
+        - length: The length of the signal, which drops the zero padding after its end.
+
+        Returns:
+        - A generator of the chunks of the reconstructed signal, hop samples per frame.
+        """
+        return istft_overlap_add(spectra, window=window, n_window=n_window, hop=hop, real=real, length=length)
+
+
+def _dft_mpmath(values: np.ndarray, inverse: bool) -> np.ndarray:
+    """
+    The (unnormalized inverse) DFT of one dimensional mpmath values as a product with the DFT matrix, in O(N^2).
+    """
+    n_values = values.size
+    sign = 1 if inverse else -1
+    # the exponents modulo n_values keep the arguments of the roots of unity small and exact
+    exponents = np.outer(np.arange(n_values), np.arange(n_values)) % max(n_values, 1)
+    kernel = mpmath_ufunc(lambda exponent: mpmath.expjpi(sign * mpmath.mpf(2 * exponent) / n_values))(exponents)
+    return kernel @ values
+
+
+def _inverse_dft_mpmath(transformed_data: np.ndarray, real: bool, n_values: Optional[int]) -> np.ndarray:
+    """
+    The inverse DFT like np.fft.ifft and np.fft.irfft with n=n_values, which pad or truncate the coefficients.
+    """
+    if real:
+        n_values = 2 * (transformed_data.size - 1) if n_values is None else int(n_values)
+        half = np.zeros(n_values // 2 + 1, dtype=object)
+        half[:] = mpmath.mpf(0)
+        count = min(half.size, transformed_data.size)
+        half[:count] = transformed_data[:count]
+        # the Hermitian symmetry of the coefficients of real signals
+        negative = mpmath_ufunc(mpmath.conj)(half[1:(n_values + 1) // 2][::-1])
+        spectrum = np.concatenate((half, negative))[:n_values]
+        return mpmath_ufunc(mpmath.re)(_dft_mpmath(spectrum, inverse=True) / n_values)
+
+    n_values = transformed_data.size if n_values is None else int(n_values)
+    spectrum = np.zeros(n_values, dtype=object)
+    spectrum[:] = mpmath.mpf(0)
+    count = min(n_values, transformed_data.size)
+    spectrum[:count] = transformed_data[:count]
+    return _dft_mpmath(spectrum, inverse=True) / n_values
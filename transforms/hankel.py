@@ -1,8 +1,17 @@
-from typing import Union, Tuple, List
+from functools import lru_cache
+from typing import Union, Tuple, List, Optional
+
+import mpmath
+import numpy as np
 import sympy as sp
+from scipy.fft import fht, ifht, fhtoffset
+from scipy.special import jv, jn_zeros
 from sympy import abc
 from sympy.integrals.transforms import hankel_transform, inverse_hankel_transform
 from transforms.base_transform.base_transform import BaseTransform
+from utils.dtypes import (
+    as_dtype, check_dtype, is_arbitrary_precision, mpmath_ufunc, require_numpy_dtype, working_array
+)
 
 
 class HankelTransform(BaseTransform):
@@ -13,6 +22,8 @@ class HankelTransform(BaseTransform):
         is_base_form: bool = True,
         r: sp.Symbol = abc.r,
         k: sp.Symbol = abc.k,
+        timeout: Optional[float] = None,
+        numeric_fallback: bool = False,
     ):
         """
         Initialize the Hankel BaseTransform.
@@ -21,6 +32,8 @@ class HankelTransform(BaseTransform):
         :param is_base_form: Whether the provided function is in base form or transformed form.
         :param r: The radial variable.
         :param k: The frequency variable.
+        :param timeout: The time budget of the symbolic computation, see BaseTransform.
+        :param numeric_fallback: Whether to fall back to the unevaluated integral after a timeout.
         """
         self.r = r
         self.k = k
@@ -28,8 +41,18 @@ class HankelTransform(BaseTransform):
         super().__init__(
             function=function,
             is_base_form=is_base_form,
+            timeout=timeout,
+            numeric_fallback=numeric_fallback,
         )
 
+    @property
+    def _base_symbols(self) -> Tuple[sp.Symbol, ...]:
+        return (self.r,)
+
+    @property
+    def _transformed_symbols(self) -> Tuple[sp.Symbol, ...]:
+        return (self.k,)
+
     def _compute_transform_function(self) -> Union[Tuple, sp.Basic]:
         """
         Compute the symbolic Hankel transform using SymPy's built-in function.
@@ -42,51 +65,284 @@ class HankelTransform(BaseTransform):
         """
         return inverse_hankel_transform(self.transformed_func_as_func, k=self.k, r=self.r, nu=self.order)
 
+    def _unevaluated_transform_function(self) -> sp.Expr:
+        return sp.HankelTransform(self.base_func_as_func, self.r, self.k, self.order)
+
+    def _unevaluated_inverse_transform_function(self) -> sp.Expr:
+        return sp.InverseHankelTransform(self.transformed_func_as_func, self.k, self.r, self.order)
+
     @classmethod
     def transform_data(
             cls,
-            values: List[sp.Number],
-            r_vals: List[sp.Number],
-            k_vals: List[sp.Number],
-            order: int
-    ) -> List[sp.Number]:
+            values: Union[List[sp.Number], np.ndarray],
+            r_vals: Union[List[sp.Number], np.ndarray],
+            k_vals: Union[List[sp.Number], np.ndarray] = None,
+            order: Union[int, float] = 0,
+            sampling: str = "direct",
+            dtype: Optional[np.dtype] = None
+    ) -> np.ndarray:
         """
         Compute the Discrete Hankel BaseTransform for a discrete list of points.
 
+        Sampling modes:
+        - "direct": sums v * J_ν(k * r) * r over the given points for arbitrary k_vals.
+                    The kernel is cached per (order, r_vals, k_vals), so transforming
+                    many profiles on the same grid reduces to a matrix product.
+        - "qdht": quasi-discrete Hankel transform on the Bessel-zero grid of qdht_grid().
+                  The result is sampled at the k-values of that grid and can be inverted.
+        - "fftlog": FFTLog fast Hankel transform on the logarithmic grid of fftlog_grid().
+                    The result is sampled at the k-values of that grid and can be inverted.
+
         Parameters:
         - values: List of function values (e.g., [1, 2, 3, 4]).
+                  A 2D array of shape (n_profiles, n_r) transforms all profiles at once.
         - r_vals: List of radial distance values corresponding to the function values.
         - k_vals: List of k-values for which the Hankel BaseTransform is computed.
+                  Only used by the "direct" sampling, the other modes determine them from r_vals.
         - order: Order of the Bessel function (ν).
+        - sampling: One of "direct", "qdht" or "fftlog".
+        - dtype: The dtype of the result, see utils.dtypes.
+                 With object the kernel of the "direct" sampling is computed with mpmath.
 
         Returns:
-        - A list of Hankel BaseTransform results for the given k-values (numerical).
+        - An array of Hankel BaseTransform results for the k-values (numerical).
         """
-        if len(values) != len(r_vals):
+        dtype = check_dtype(dtype)
+        values = working_array(values, dtype)
+        if values.shape[-1:] != np.shape(r_vals):
             raise ValueError("The lengths of 'values' and 'r_vals' must be equal.")
 
-        # Compute the Hankel BaseTransform for each k-value
-        results = []
-        for k in k_vals:
-            hankel_result = sum(
-                v * sp.besselj(order, k * r).evalf() * r
-                for v, r in zip(values, r_vals)
-            )
-            results.append(hankel_result)
+        if is_arbitrary_precision(dtype):
+            if sampling != "direct":
+                require_numpy_dtype(dtype, f"The '{sampling}' sampling")
+            if k_vals is None:
+                raise ValueError("The 'direct' sampling needs the 'k_vals' to compute the transform at.")
+            r_vals, k_vals = working_array(r_vals, dtype), working_array(k_vals, dtype)
+            kernel = mpmath_ufunc(lambda x: mpmath.besselj(order, x))(np.outer(k_vals, r_vals)) * r_vals
+            return values @ kernel.T
+
+        r_vals = np.asarray(r_vals, dtype=np.float64)
 
-        return results
+        if sampling == "qdht":
+            transform, _, scaling_r, scaling_k = _qdht_scalings(order, r_vals.size, cls._qdht_max_radius(r_vals, order))
+            return as_dtype(scaling_k * ((values / scaling_r) @ transform), dtype)
+
+        if sampling == "fftlog":
+            dln, offset = cls._fftlog_parameters(r_vals, order)
+            k_vals = np.exp(offset) / r_vals[::-1]
+            return as_dtype(fht(values * r_vals, dln, mu=order, offset=offset) / k_vals, dtype)
+
+        if sampling != "direct":
+            raise ValueError(f"Unknown sampling '{sampling}', use 'direct', 'qdht' or 'fftlog'.")
+        if k_vals is None:
+            raise ValueError("The 'direct' sampling needs the 'k_vals' to compute the transform at.")
+
+        k_vals = np.asarray(k_vals)
+        k_vals = k_vals.astype(np.result_type(k_vals, np.float64))
+
+        kernel = _bessel_kernel(float(order), _grid_key(r_vals), _grid_key(k_vals))
+        return as_dtype(values @ kernel.T, dtype)
 
     @classmethod
-    def inverse_transform_data(cls, *_, **__):
+    def inverse_transform_data(
+            cls,
+            transformed_data: Union[List[sp.Number], np.ndarray],
+            k_vals: Union[List[sp.Number], np.ndarray] = None,
+            order: Union[int, float] = 0,
+            sampling: str = "direct",
+            dtype: Optional[np.dtype] = None
+    ) -> np.ndarray:
         """
-        The inverse of the computation above can only be approximated because of the loss of information
+        Invert transform_data() for the sampling modes that allow it.
+
+        The "direct" summation can only be approximated because of the loss of information
         during the forward Hankel BaseTransform. The Hankel BaseTransform is inherently designed for continuous
         radially symmetric functions, and transforming discrete points is an approximation of the continuous process.
+        Reverting the discrete Hankel BaseTransform on arbitrary points is either computationally expensive or
+        infeasible in general cases, as the numerical process does not perfectly map back to the original signal
+        due to potential sampling and kernel inaccuracies.
+
+        The "qdht" and "fftlog" samplings place the points on grids on which the discrete transform
+        is (quasi) orthogonal, which makes the inversion a matrix product or an FFT respectively.
+
+        Parameters:
+        - transformed_data: The transformed values at k_vals, 2D arrays invert all rows at once.
+        - k_vals: The k-values of the grid returned by qdht_grid() or fftlog_grid().
+        - order: Order of the Bessel function (ν).
+        - sampling: One of "qdht" or "fftlog".
+        - dtype: The dtype of the result, see utils.dtypes, object is not supported.
+
+        Returns:
+        - An array of the function values at the r-values of the grid.
+        """
+        dtype = check_dtype(dtype)
+        if sampling == "direct":
+            raise RuntimeError(
+                "Exact inversion for the Discrete Hankel BaseTransform is computationally infeasible or undefined "
+                "in general cases. Use the 'qdht' or 'fftlog' sampling to be able to invert the transform."
+            )
+        if k_vals is None:
+            raise ValueError(f"The '{sampling}' sampling needs the 'k_vals' of its grid to invert the transform.")
+
+        require_numpy_dtype(dtype, f"The '{sampling}' sampling")
+
+        transformed_data = working_array(transformed_data, dtype)
+        k_vals = np.asarray(k_vals, dtype=np.float64)
+        if transformed_data.shape[-1:] != k_vals.shape:
+            raise ValueError("The lengths of 'transformed_data' and 'k_vals' must be equal.")
 
-        Reverting the discrete Hankel BaseTransform is either computationally expensive or infeasible in general cases,
-        as the numerical process does not perfectly map back to the original signal due to potential sampling and kernel
-        inaccuracies.
+        if sampling == "qdht":
+            max_radius = cls._qdht_max_radius(k_vals, order, from_k_vals=True)
+            transform, _, scaling_r, scaling_k = _qdht_scalings(order, k_vals.size, max_radius)
+            return as_dtype(scaling_r * ((transformed_data / scaling_k) @ transform), dtype)
+
+        if sampling == "fftlog":
+            dln, offset = cls._fftlog_parameters(k_vals, order)
+            r_vals = np.exp(offset) / k_vals[::-1]
+            return as_dtype(ifht(transformed_data * k_vals, dln, mu=order, offset=offset) / r_vals, dtype)
+
+        raise ValueError(f"Unknown sampling '{sampling}', use 'direct', 'qdht' or 'fftlog'.")
+
+    @classmethod
+    def qdht_grid(
+            cls,
+            n_points: int,
+            max_radius: float,
+            order: int = 0
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """
-        raise RuntimeError(
-            "Exact inversion for the Discrete Hankel BaseTransform is computationally infeasible or undefined in general cases."
-        )
\ No newline at end of file
+        Generate the sample points of the quasi-discrete Hankel transform (Guizar-Sicairos, Gutiérrez-Vega).
+        The points are placed at the zeros j_n of J_ν, scaled such that the function is assumed to vanish
+        beyond max_radius and the transform beyond the band limit j_(N+1) / max_radius.
+
+        Parameters:
+        - n_points: Number of sample points N.
+        - max_radius: Radius R beyond which the function is assumed to vanish.
+        - order: Integer order of the Bessel function (ν).
+
+        Returns:
+        - A tuple (r_vals, k_vals) with r_n = j_n * R / j_(N+1) and k_m = j_m / R.
+        """
+        zeros, max_zero = _bessel_zeros(order, n_points)
+        return zeros * max_radius / max_zero, zeros / max_radius
+
+    @classmethod
+    def fftlog_grid(
+            cls,
+            n_points: int,
+            r_min: float,
+            r_max: float,
+            order: Union[int, float] = 0
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Generate the logarithmically spaced sample points of the FFTLog fast Hankel transform.
+        The k-values use the low-ringing offset of scipy.fft.fhtoffset().
+
+        Parameters:
+        - n_points: Number of sample points.
+        - r_min, r_max: The smallest and largest radial values.
+        - order: Order of the Bessel function (ν).
+
+        Returns:
+        - A tuple (r_vals, k_vals) with r_vals * k_vals[::-1] constant.
+        """
+        r_vals = np.geomspace(r_min, r_max, n_points)
+        _, offset = cls._fftlog_parameters(r_vals, order)
+        return r_vals, np.exp(offset) / r_vals[::-1]
+
+    @classmethod
+    def _qdht_max_radius(cls, grid: np.ndarray, order: Union[int, float], from_k_vals: bool = False) -> float:
+        """
+        Returns the radius R of the grid of qdht_grid() that the r-values (or the k-values) belong to.
+        The transform is only correct on that grid, so other points raise a ValueError.
+        """
+        if not grid.size:
+            raise ValueError("The 'qdht' sampling needs at least one point.")
+        zeros, max_zero = _bessel_zeros(order, grid.size)
+        max_radius = zeros[-1] / grid[-1] if from_k_vals else grid[-1] * max_zero / zeros[-1]
+        expected = cls.qdht_grid(grid.size, max_radius, order)[1 if from_k_vals else 0]
+        if not np.allclose(grid, expected):
+            name = "k_vals" if from_k_vals else "r_vals"
+            raise ValueError(f"The 'qdht' sampling needs the {name} of qdht_grid() for the order {order}.")
+        return max_radius
+
+    @staticmethod
+    def _fftlog_parameters(grid: np.ndarray, order: Union[int, float]) -> Tuple[float, float]:
+        """
+        Returns the logarithmic spacing and the low-ringing offset of a logarithmic grid.
+        """
+        if grid.size < 2 or np.any(grid <= 0):
+            raise ValueError("The 'fftlog' sampling needs at least two positive, logarithmically spaced points.")
+        log_deltas = np.diff(np.log(grid))
+        dln = log_deltas.mean()
+        if not np.allclose(log_deltas, dln):
+            raise ValueError("The 'fftlog' sampling needs logarithmically spaced points, see fftlog_grid().")
+        return dln, fhtoffset(dln, mu=order)
+
+
+def _grid_key(grid: np.ndarray) -> Tuple[str, Tuple[int, ...], bytes]:
+    """
+    Hashable representation of a sample grid, used as a key for the kernel caches.
+    """
+    grid = np.ascontiguousarray(grid)
+    return grid.dtype.str, grid.shape, grid.tobytes()
+
+
+def _grid_from_key(key: Tuple[str, Tuple[int, ...], bytes]) -> np.ndarray:
+    dtype, shape, buffer = key
+    return np.frombuffer(buffer, dtype=dtype).reshape(shape)
+
+
+@lru_cache(maxsize=32)
+def _bessel_kernel(order: float, r_key: Tuple, k_key: Tuple) -> np.ndarray:
+    """
+    The kernel matrix J_ν(k * r) * r of shape (n_k, n_r) for the direct Hankel summation.
+    The returned array is read-only as it is shared between all calls with the same grids.
+    """
+    r_vals, k_vals = _grid_from_key(r_key), _grid_from_key(k_key)
+    kernel = jv(order, np.outer(k_vals, r_vals)) * r_vals
+    kernel.setflags(write=False)
+    return kernel
+
+
+@lru_cache(maxsize=32)
+def _bessel_zeros(order: int, n_points: int) -> Tuple[np.ndarray, float]:
+    """
+    The first n_points zeros of J_ν and the zero j_(N+1) that bounds the quasi-discrete transform.
+    """
+    if order != int(order) or order < 0:
+        raise ValueError("The 'qdht' sampling is only available for non negative integer orders.")
+    zeros = jn_zeros(int(order), n_points + 1)
+    zeros.setflags(write=False)
+    return zeros[:-1], zeros[-1]
+
+
+@lru_cache(maxsize=32)
+def _qdht_matrix(order: int, n_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The symmetric, (quasi) orthogonal transform matrix
+    T_mn = 2 J_ν(j_m j_n / S) / (|J_(ν+1)(j_m)| |J_(ν+1)(j_n)| S) with S = j_(N+1)
+    and the normalisation |J_(ν+1)(j_n)| of the sample points.
+    """
+    zeros, max_zero = _bessel_zeros(order, n_points)
+    normalisation = np.abs(jv(order + 1, zeros))
+    transform = 2 * jv(order, np.outer(zeros, zeros) / max_zero) / (np.outer(normalisation, normalisation) * max_zero)
+    transform.setflags(write=False)
+    normalisation.setflags(write=False)
+    return transform, normalisation
+
+
+def _qdht_scalings(
+        order: int,
+        n_points: int,
+        max_radius: float
+) -> Tuple[np.ndarray, float, np.ndarray, np.ndarray]:
+    """
+    The transform matrix together with the band limit K = S / R and the scalings
+    |J_(ν+1)(j_n)| / R and |J_(ν+1)(j_m)| / K of the function and its transform,
+    such that F = scaling_k * T (f / scaling_r) and f = scaling_r * T (F / scaling_k).
+    """
+    transform, normalisation = _qdht_matrix(order, n_points)
+    _, max_zero = _bessel_zeros(order, n_points)
+    band_limit = max_zero / max_radius
+    return transform, band_limit, normalisation / max_radius, normalisation / band_limit
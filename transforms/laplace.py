@@ -1,9 +1,17 @@
-from typing import List, Tuple, Union
+from typing import Callable, List, Optional, Sequence, Tuple, Union
 
+import mpmath
+import numpy as np
 import sympy as sp
 from sympy import abc
 
 from transforms.base_transform.base_transform import BaseTransform
+from utils.dtypes import (
+    as_dtype, check_dtype, is_arbitrary_precision, mpmath_ufunc, require_numpy_dtype, working_array
+)
+from utils.laplace_inversion import LAPLACE_INVERSION_METHODS, invert_laplace
+from utils.partial_fractions import inverse_laplace_rational, rational_responses
+from utils.sympy_math import generate_quadrature_weights, lambdify_numeric, subs_zero
 
 
 class LaplaceTransform(BaseTransform):
@@ -14,59 +22,218 @@ class LaplaceTransform(BaseTransform):
             is_base_form: bool = True,
             s: sp.Symbol = abc.s,
             t: sp.Symbol = abc.t,
+            timeout: Optional[float] = None,
+            numeric_fallback: bool = False,
     ):
         self.s = s
         self.t = t
         super().__init__(
             function=function,
             is_base_form=is_base_form,
+            timeout=timeout,
+            numeric_fallback=numeric_fallback,
         )
 
+    @property
+    def _base_symbols(self) -> Tuple[sp.Symbol, ...]:
+        return (self.t,)
+
+    @property
+    def _transformed_symbols(self) -> Tuple[sp.Symbol, ...]:
+        return (self.s,)
+
     def _compute_transform_function(self) -> Union[Tuple, sp.Basic]:
         transform = sp.laplace_transform(self.base_func_as_func, s=self.s, t=self.t)
         return transform
 
     def _compute_inverse_transform_function(self) -> Union[Tuple, sp.Basic]:
+        # rational F(s), e.g. transfer functions, are inverted by partial fractions
+        inverse_transform = inverse_laplace_rational(self.transformed_func_as_func, s=self.s, t=self.t)
+        if inverse_transform is not None:
+            return inverse_transform
         inverse_transform = sp.inverse_laplace_transform(self.transformed_func_as_func, s=self.s, t=self.t)
         return inverse_transform
 
+    def _unevaluated_transform_function(self) -> sp.Expr:
+        return sp.LaplaceTransform(self.base_func_as_func, self.t, self.s)
+
+    def _unevaluated_inverse_transform_function(self) -> sp.Expr:
+        return sp.InverseLaplaceTransform(self.transformed_func_as_func, self.s, self.t, None)
+
     @classmethod
     def transform_data(
             cls,
-            values: List[sp.Number],
-            time_points: List[sp.Number],
-            s_values: List[sp.Number]
-    ) -> List[sp.Number]:
+            values: Union[List[sp.Number], np.ndarray],
+            time_points: Union[List[sp.Number], np.ndarray],
+            s_values: Union[List[sp.Number], np.ndarray],
+            weighting: Optional[str] = None,
+            dtype: Optional[np.dtype] = None
+    ) -> np.ndarray:
         """
         Compute the Laplace BaseTransform for a discrete list of points.
+        The kernel exp(-s * t) is built once as a NumPy array for all (s, t) pairs
+        and reduced with a single matrix product.
 
         Parameters:
         - values: list of function values (e.g., [1, 2, 3, 4]).
+                  A 2D array of shape (n_signals, n_time_points) transforms all rows at once.
         - time_points: list of time points corresponding to the values (e.g., [0, 1, 2, 3]).
-        - s_values: list of s-values for which the Laplace BaseTransform is computed.
+        - s_values: list of s-values for which the Laplace BaseTransform is computed, may be complex.
+        - weighting: None to sum the samples directly, or a quadrature rule
+                     ("rectangle", "trapezoid", "simpson") to approximate the Laplace integral.
+        - dtype: The dtype of the result, see utils.dtypes. With object the kernel is computed with mpmath,
+                 which does not support a weighting.
 
         Returns:
-        - A list of Laplace BaseTransform results for the given s-values (numerical).
+        - An array of Laplace BaseTransform results for the given s-values (numerical).
         """
-        if len(values) != len(time_points):
+        dtype = check_dtype(dtype)
+        values = working_array(values, dtype)
+        time_points = working_array(time_points, dtype)
+        if values.shape[-1:] != time_points.shape:
             raise ValueError("The lengths of 'values' and 'time_points' must be equal.")
+        s_values = working_array(s_values, dtype)
+
+        if is_arbitrary_precision(dtype):
+            if weighting is not None:
+                require_numpy_dtype(dtype, "The weighting")
+            return values @ mpmath_ufunc(mpmath.exp)(-np.outer(s_values, time_points)).T
 
-        results = []
-        for s in s_values:
-            laplace_result = sum(v * sp.exp(-s * t).evalf() for v, t in zip(values, time_points))
-            results.append(laplace_result)
+        if weighting is not None:
+            values = values * generate_quadrature_weights(time_points, rule=weighting).astype(time_points.dtype)
 
-        return results
+        kernel = np.exp(-np.outer(s_values, time_points))
+        return as_dtype(values @ kernel.T, dtype)
 
     @classmethod
-    def inverse_transform_data(cls, *_, **__):
+    def inverse_transform_data(
+            cls,
+            transformed_data: Union[sp.Expr, Callable, Sequence[Union[sp.Expr, Callable]]],
+            time_points: Optional[Union[List[sp.Number], np.ndarray]] = None,
+            method: str = "talbot",
+            n_terms: Optional[int] = None,
+            s: sp.Symbol = abc.s,
+            response: str = "impulse",
+            dtype: Optional[np.dtype] = None
+    ) -> np.ndarray:
         """
-        The inverse of the computation above can only be approximated because of the loss of information
+        The inverse of transform_data() can only be approximated because of the loss of information
         as the laplace transform is made for continuous functions on the complex plane and nor for discrete
         points like it is possible for Fourier.
         The above implementation is just one that makes sense if you would attempt to transform discrete points
         and treats the continuous Integral as a summation.
         Reverting the above process is only possible in specific cases or computationally to expensive.
+
+        What can be inverted numerically are transforms F(s) given as functions, see utils.laplace_inversion.
+        F(s) is evaluated at a few nodes per time point and the inversion is vectorized over all time points.
+        Rational F(s), e.g. transfer functions, are inverted exactly with method="residues" from their poles and
+        residues, see utils.partial_fractions.rational_responses(), which also handles negative time points.
+
+        Parameters:
+        - transformed_data: F(s) as a SymPy expression in s, which is compiled to NumPy, or as a vectorized callable.
+                            A callable may return a batch of transforms, see utils.laplace_inversion.invert_laplace().
+                            A sequence of them is inverted as a batch.
+        - time_points: The positive time points at which f(t) is computed.
+        - method: "talbot", "stehfest", "dehoog" or "residues" for rational SymPy expressions.
+        - n_terms: The number of terms of the method, by default one that suits double precision.
+        - s: The symbol of the transformed functions.
+        - response: "impulse" to invert F(s), "step" to invert F(s) / s, the step response of the transfer function.
+        - dtype: The dtype of the result, see utils.dtypes. With object f(t) is computed with mpmath.invertlaplace
+                 time point by time point, F(s) is then compiled to mpmath or must be a callable of mpmath numbers.
+                 The "residues" method does not support object.
+
+        Returns:
+        - f(t) at the time points, of shape (n_time_points,) or (n_functions, n_time_points) for a sequence.
         """
-        raise RuntimeError("Exact inversion for discrete Laplace BaseTransform is computationally infeasible or undefined.")
+        if time_points is None:
+            raise RuntimeError(
+                "Exact inversion for discrete Laplace BaseTransform is computationally infeasible or undefined."
+            )
+
+        if response not in ("impulse", "step"):
+            raise ValueError(f"Unknown response '{response}', use 'impulse' or 'step'.")
+        dtype = check_dtype(dtype)
+        if method == "residues":
+            require_numpy_dtype(dtype, "The 'residues' method")
+            functions = transformed_data if isinstance(transformed_data, (list, tuple)) else [transformed_data]
+            numerators, denominators = zip(*(cls._rational_coefficients(function, s) for function in functions))
+            inverse = rational_responses(numerators, denominators, time_points, response=response)
+            return as_dtype(inverse if isinstance(transformed_data, (list, tuple)) else inverse[0], dtype)
+        if method not in LAPLACE_INVERSION_METHODS:
+            raise ValueError(f"Unknown method '{method}', use one of {LAPLACE_INVERSION_METHODS + ('residues',)}.")
+        if response == "step":
+            transformed_data = (
+                [cls._step_function(function, s) for function in transformed_data]
+                if isinstance(transformed_data, (list, tuple)) else cls._step_function(transformed_data, s)
+            )
+
+        if is_arbitrary_precision(dtype):
+            time_points = working_array(time_points, dtype)
+            options = {} if n_terms is None else {"degree": n_terms}
+            if isinstance(transformed_data, (list, tuple)):
+                return np.stack([
+                    cls._invert_laplace_mpmath(function, time_points, method, s, options)
+                    for function in transformed_data
+                ])
+            return cls._invert_laplace_mpmath(transformed_data, time_points, method, s, options)
+
+        if isinstance(transformed_data, (list, tuple)):
+            functions = [cls._numeric_laplace_function(function, s) for function in transformed_data]
+            return as_dtype(invert_laplace(
+                lambda s_values: np.stack([function(s_values) for function in functions]),
+                time_points, method=method, n_terms=n_terms
+            ), dtype)
+        return as_dtype(invert_laplace(
+            cls._numeric_laplace_function(transformed_data, s), time_points, method=method, n_terms=n_terms
+        ), dtype)
+
+    @classmethod
+    def _invert_laplace_mpmath(
+            cls,
+            function: Union[sp.Expr, Callable],
+            time_points: np.ndarray,
+            method: str,
+            s: sp.Symbol,
+            options: dict
+    ) -> np.ndarray:
+        if isinstance(function, sp.Basic):
+            # checks the free symbols
+            cls._numeric_laplace_function(function, s)
+            function = sp.lambdify(s, subs_zero(function), modules="mpmath")
+        return mpmath_ufunc(lambda time_point: mpmath.invertlaplace(function, time_point, method=method, **options))(
+            time_points
+        )
+
+    @staticmethod
+    def _numeric_laplace_function(function: Union[sp.Expr, Callable], s: sp.Symbol) -> Callable:
+        if isinstance(function, sp.Basic):
+            function = subs_zero(function)
+            if function.free_symbols - {s}:
+                raise ValueError(
+                    f"F(s) = {function} can only be inverted numerically if s is its only free symbol."
+                )
+            return lambdify_numeric(function, (s,))
+        if not callable(function):
+            raise ValueError("F(s) must be a SymPy expression or a callable.")
+        return function
+
+    @staticmethod
+    def _step_function(function: Union[sp.Expr, Callable], s: sp.Symbol) -> Union[sp.Expr, Callable]:
+        # the step response is the inverse of F(s) / s
+        if isinstance(function, sp.Basic):
+            return function / s
+        return lambda s_values: function(s_values) / s_values
 
+    @staticmethod
+    def _rational_coefficients(function: sp.Expr, s: sp.Symbol) -> Tuple[np.ndarray, np.ndarray]:
+        # the coefficients of the numerator and the denominator of a rational F(s) by decreasing powers of s
+        function = sp.sympify(function)
+        if function.free_symbols - {s} or not function.is_rational_function(s):
+            raise ValueError(f"F(s) = {function} must be rational in s with numeric coefficients for residues.")
+        numerator, denominator = sp.fraction(sp.cancel(sp.together(function)))
+        coefficients = [
+            np.array([complex(coefficient) for coefficient in sp.Poly(part, s).all_coeffs()])
+            for part in (numerator, denominator)
+        ]
+        # real coefficients give real responses
+        return tuple(part.real if not part.imag.any() else part for part in coefficients)
@@ -1,4 +1,4 @@
-from typing import Union, Tuple
+from typing import Callable, Optional, Union, Tuple
 
 import numpy as np
 import sympy as sp
@@ -6,6 +6,13 @@ from skimage.transform import radon, iradon
 from sympy import abc
 
 from transforms.base_transform.base_transform import BaseTransform
+from utils.dtypes import as_dtype, check_dtype, require_numpy_dtype
+from utils.tomography import (
+    RadonOperator, cgls, default_output_size, filtered_back_projection, fourier_slice_projection,
+    fourier_slice_reconstruction, sart, sirt
+)
+
+ITERATIVE_ENGINES = {"sirt": sirt, "sart": sart, "cgls": cgls}
 
 
 class RadonTransform(BaseTransform):
@@ -17,7 +24,9 @@ class RadonTransform(BaseTransform):
             t: sp.Symbol = abc.t,
             theta: sp.Symbol = abc.theta,
             x: sp.Symbol = abc.x,
-            y: sp.Symbol = abc.y
+            y: sp.Symbol = abc.y,
+            timeout: Optional[float] = None,
+            numeric_fallback: bool = False
     ):
         self.t = t
         self.theta = theta
@@ -25,9 +34,19 @@ class RadonTransform(BaseTransform):
         self.y = y
         super().__init__(
             function=function,
-            is_base_form=is_base_form
+            is_base_form=is_base_form,
+            timeout=timeout,
+            numeric_fallback=numeric_fallback
         )
 
+    @property
+    def _base_symbols(self) -> Tuple[sp.Symbol, ...]:
+        return (self.x, self.y)
+
+    @property
+    def _transformed_symbols(self) -> Tuple[sp.Symbol, ...]:
+        return (self.t, self.theta)
+
     def _compute_transform_function(self) -> Union[Tuple, sp.Expr]:
         transform = self.radon_transform(
             f=self.base_func_as_func,
@@ -44,6 +63,27 @@ class RadonTransform(BaseTransform):
         )
         return inverse_transform
 
+    def _unevaluated_transform_function(self) -> sp.Expr:
+        """
+        The integral along the line t = x cos(theta) + y sin(theta), parametrized by its arc length s.
+        The Dirac delta of the double integral is integrated out, which the quadrature can not do.
+        """
+        s = sp.Dummy("s", real=True)
+        line = {
+            self.x: self.t * sp.cos(self.theta) - s * sp.sin(self.theta),
+            self.y: self.t * sp.sin(self.theta) + s * sp.cos(self.theta),
+        }
+        return sp.Integral(self.base_func_as_func.subs(line, simultaneous=True), (s, -sp.oo, sp.oo))
+
+    def _unevaluated_inverse_transform_function(self) -> sp.Expr:
+        """
+        The back-projection of inverse_radon_transform() with the Dirac delta integrated out over t.
+        """
+        back_projected = self.transformed_func_as_func.subs(
+            self.t, self.x * sp.cos(self.theta) + self.y * sp.sin(self.theta)
+        )
+        return sp.Integral(back_projected, (self.theta, 0, sp.pi)) / (2 * sp.pi)
+
     @classmethod
     def radon_transform(cls, f, t, theta):
         """
@@ -100,7 +140,9 @@ class RadonTransform(BaseTransform):
             cls,
             data: np.ndarray,
             angles: np.ndarray = None,
-            circle: bool = True
+            circle: bool = True,
+            engine: str = "skimage",
+            dtype: Optional[np.dtype] = None
     ) -> np.ndarray:
         """
         Apply Radon Transform to the given 2D data.
@@ -111,44 +153,119 @@ class RadonTransform(BaseTransform):
                                            Defaults to 0 to 180 degrees evenly spaced.
             circle (bool, optional): If True, assume the input data is circular.
                                      If False, the input is treated as rectangular.
+            engine (str, optional): "skimage" for skimage.transform.radon, which rotates the image per angle,
+                                    "matrix" for the sparse system matrix of utils.tomography.RadonOperator,
+                                    which is built once per geometry,
+                                    or "fourier" for the Fourier slice theorem in O(N^2 log N).
+                                    The "matrix" and "fourier" engines need square data.
+            dtype (np.dtype, optional): The dtype of the sinogram, see utils.dtypes.
+                                        The engines compute with floats, so object is not supported.
 
         Returns:
             np.ndarray: The Radon transform (sinogram) of the input data.
         """
-        if not isinstance(data, np.ndarray) or data.ndim != 2:
-            raise ValueError("Input data must be a 2D NumPy array.")
+        dtype = check_dtype(dtype)
+        require_numpy_dtype(dtype, "The Radon transform")
+        data = np.asarray(data)
+        if data.ndim != 2:
+            raise ValueError("Input data must be a 2D array.")
 
         if angles is None:
             # Default to evenly spaced angles from 0 to 180 degrees
             angles = np.linspace(0., 180., max(data.shape), endpoint=False)
 
-        return radon(data, theta=angles, circle=circle)
+        if engine in ("matrix", "fourier") and data.shape[0] != data.shape[1]:
+            raise ValueError(f"The '{engine}' engine needs square data.")
+        if engine == "matrix":
+            return as_dtype(RadonOperator.from_geometry(data.shape[0], angles, circle=circle).project(data), dtype)
+        if engine == "fourier":
+            return as_dtype(fourier_slice_projection(data[np.newaxis], angles, circle=circle)[0], dtype)
+        if engine != "skimage":
+            raise ValueError(f"Unknown engine '{engine}', use 'skimage', 'matrix' or 'fourier'.")
+        return as_dtype(radon(data, theta=angles, circle=circle), dtype)
 
     @classmethod
     def inverse_transform_data(
             cls,
             sino_gram: np.ndarray,
             angles: np.ndarray = None,
-            circle: bool = True
+            circle: bool = True,
+            engine: str = "skimage",
+            filter_name: Optional[str] = "ramp",
+            workers: Optional[int] = None,
+            iterations: Optional[int] = None,
+            initial: Optional[np.ndarray] = None,
+            callback: Optional[Callable[[int, np.ndarray], Optional[bool]]] = None,
+            operator: Optional[RadonOperator] = None,
+            dtype: Optional[np.dtype] = None
     ) -> np.ndarray:
         """
         Perform the Inverse Radon Transform to reconstruct 2D data from a sinogram.
 
         Parameters:
-            sino_gram (np.ndarray): The Radon Transform (sinogram) as a 2D array.
+            sino_gram (np.ndarray): The Radon Transform (sinogram) as a 2D array of shape (n_detector_bins, n_angles),
+                                    or a stack of them as a 3D array of shape (n_slices, n_detector_bins, n_angles).
             angles (np.ndarray, optional): Array of angles (in degrees) corresponding to the sinogram.
                                            Defaults to 0 to 180 degrees evenly spaced.
             circle (bool, optional): If True, assumes the input data is circular. Defaults to True.
+            engine (str, optional): "skimage" for skimage.transform.iradon, slice by slice,
+                                    or "fbp" for the filtered back-projection of utils.tomography,
+                                    which caches the filter and the geometry and reconstructs stacks multi-threaded,
+                                    "fourier" for the direct Fourier reconstruction by the Fourier slice theorem,
+                                    or "sirt", "sart" or "cgls" for iterative reconstruction with the sparse
+                                    system matrix, e.g. for few or noisy projections.
+            filter_name (str, optional): The filter of the filtered back-projection, e.g. "ramp" or "hann".
+                                         The "fourier" engine only applies its window.
+            workers (int, optional): The number of threads of the "fbp" engine. Defaults to the number of CPUs.
+            iterations (int, optional): The number of iterations of the iterative engines.
+                                        Defaults to the default of the solver in utils.tomography.
+            initial (np.ndarray, optional): The initial image(s) of the iterative engines for a warm start,
+                                            e.g. a reconstruction of the "fbp" engine.
+            callback (callable, optional): Called as callback(iteration, images) after every iteration
+                                           of the iterative engines, which stop early if it returns True.
+            operator (RadonOperator, optional): The system matrix of the iterative engines,
+                                                e.g. loaded memory-mapped with RadonOperator.load().
+                                                Defaults to the cached operator of the geometry.
+            dtype (np.dtype, optional): The dtype of the reconstruction, see utils.dtypes.
+                                        The engines compute with floats, so object is not supported.
 
         Returns:
-            np.ndarray: The reconstructed 2D array (e.g., an image).
+            np.ndarray: The reconstructed 2D array (e.g., an image), or the 3D stack of them.
         """
-        if not isinstance(sino_gram, np.ndarray) or sino_gram.ndim != 2:
-            raise ValueError("Input sinogram must be a 2D NumPy array.")
+        dtype = check_dtype(dtype)
+        require_numpy_dtype(dtype, "The inverse Radon transform")
+        sino_gram = np.asarray(sino_gram)
+        if sino_gram.ndim not in (2, 3):
+            raise ValueError("Input sinogram must be a 2D or 3D array.")
 
         if angles is None:
             # Default to evenly spaced angles from 0 to 180 degrees
-            angles = np.linspace(0., 180., sino_gram.shape[1], endpoint=False)
+            angles = np.linspace(0., 180., sino_gram.shape[-1], endpoint=False)
+
+        sino_grams = sino_gram if sino_gram.ndim == 3 else sino_gram[np.newaxis]
+        if engine == "fbp":
+            reconstructed = filtered_back_projection(
+                sino_grams, angles, filter_name=filter_name, circle=circle, workers=workers
+            )
+        elif engine == "skimage":
+            # Perform the inverse Radon Transform
+            reconstructed = np.stack([
+                iradon(sino_gram_slice, theta=angles, circle=circle, filter_name=filter_name)
+                for sino_gram_slice in sino_grams
+            ])
+        elif engine == "fourier":
+            reconstructed = fourier_slice_reconstruction(sino_grams, angles, filter_name=filter_name, circle=circle)
+        elif engine in ITERATIVE_ENGINES:
+            if operator is None:
+                n_detector_bins = sino_gram.shape[-2]
+                operator = RadonOperator.from_geometry(
+                    default_output_size(n_detector_bins, circle), angles, n_detector_bins, circle
+                )
+            options = {} if iterations is None else {"iterations": iterations}
+            reconstructed = ITERATIVE_ENGINES[engine](
+                operator, sino_grams, initial=initial, callback=callback, **options
+            )
+        else:
+            raise ValueError(f"Unknown engine '{engine}', use 'skimage', 'fbp', 'fourier', 'sirt', 'sart' or 'cgls'.")
 
-        # Perform the inverse Radon Transform
-        return iradon(sino_gram, theta=angles, circle=circle)
+        return as_dtype(reconstructed if sino_gram.ndim == 3 else reconstructed[0], dtype)
@@ -1,10 +1,14 @@
-from typing import Union, Tuple, List
+from typing import Union, Tuple, List, Optional, Sequence
 
+import numpy as np
 import sympy as sp
-from mpmath import mpc
 
 from exceptions import raise_left_as_exercise_for_reader
 from transforms.base_transform.base_transform import BaseTransform
+from utils.dtypes import as_dtype, check_dtype, require_numpy_dtype, working_array
+from utils.wavelets import (
+    cwt, interleave_coefficients, lifting_coefficients, lifting_waverec, lifting_wavedec, max_level, wavedec, waverec
+)
 
 
 class WaveletTransform(BaseTransform):
@@ -18,11 +22,106 @@ class WaveletTransform(BaseTransform):
         pass
 
     @classmethod
-    @raise_left_as_exercise_for_reader
-    def transform_data(cls, *args, **kwargs) -> Union[sp.Expr]:
-        pass
+    def transform_data(
+            cls,
+            values: Union[List[sp.Number], np.ndarray],
+            wavelet: str = "haar",
+            level: Optional[int] = None,
+            lifting: bool = False,
+            overwrite: bool = False,
+            dtype: Optional[np.dtype] = None
+    ) -> List[np.ndarray]:
+        """
+        Compute the multilevel discrete wavelet transform with the Mallat filter bank,
+        with periodic extension of the signal (the "periodization" mode of PyWavelets), in O(N).
+
+        Parameters:
+        - values: The signal. A 2D array of shape (n_signals, n_samples), or any array with the samples
+                  on the last axis, transforms all signals at once.
+        - wavelet: The orthogonal wavelet, "haar", "dbN", "symN" or "coifN", see utils.wavelets.
+        - level: The number of levels, by default the maximum for the signal length and the wavelet.
+        - lifting: Whether to use the lifting scheme, which works in place on one array
+                   and is available for "haar" and "db2".
+        - overwrite: With lifting, whether a float array given as values may be overwritten
+                     instead of working on a copy.
+        - dtype: The dtype of the coefficients, see utils.dtypes. The filter banks compute with floats,
+                 so object is not supported. A single precision dtype computes in single precision.
+
+        Returns:
+        - The coefficients [cA_level, cD_level, ..., cD_1], for lifting views into the transformed array.
+        """
+        dtype = check_dtype(dtype)
+        require_numpy_dtype(dtype, "The discrete wavelet transform")
+        values = np.asarray(values)
+        level = max_level(values.shape[-1], wavelet) if level is None else level
+        if values.shape[-1] % 2 ** level:
+            raise ValueError(f"The length of the signal must be divisible by 2 ** level = {2 ** level}.")
+
+        if lifting:
+            if not (overwrite and np.issubdtype(values.dtype, np.inexact) and dtype in (None, values.dtype)):
+                values = working_array(values, dtype)
+            coefficients = lifting_coefficients(lifting_wavedec(values, wavelet, level), level)
+        else:
+            coefficients = wavedec(values if dtype is None else working_array(values, dtype), wavelet, level)
+        return [as_dtype(coefficient, dtype) for coefficient in coefficients]
 
     @classmethod
-    @raise_left_as_exercise_for_reader
-    def inverse_transform_data(cls, *args, **kwargs) -> Union[List[mpc]]:
-        pass
+    def inverse_transform_data(
+            cls,
+            transformed_data: Sequence[np.ndarray],
+            wavelet: str = "haar",
+            lifting: bool = False,
+            dtype: Optional[np.dtype] = None
+    ) -> np.ndarray:
+        """
+        Reconstruct the signal from the coefficients of transform_data(), which is exact for orthogonal wavelets.
+
+        Parameters:
+        - transformed_data: The coefficients [cA_level, cD_level, ..., cD_1].
+        - wavelet: The wavelet of the transform.
+        - lifting: Whether to use the lifting scheme, available for "haar" and "db2".
+        - dtype: The dtype of the signal, see utils.dtypes, object is not supported.
+
+        Returns:
+        - The signal.
+        """
+        dtype = check_dtype(dtype)
+        require_numpy_dtype(dtype, "The inverse discrete wavelet transform")
+        if lifting:
+            return as_dtype(
+                lifting_waverec(interleave_coefficients(transformed_data), wavelet, len(transformed_data) - 1), dtype
+            )
+        return as_dtype(waverec([np.asarray(coefficients) for coefficients in transformed_data], wavelet), dtype)
+
+    @classmethod
+    def continuous_transform_data(
+            cls,
+            values: Union[List[sp.Number], np.ndarray],
+            scales: Union[List[float], np.ndarray],
+            wavelet: str = "morlet",
+            dt: float = 1.0,
+            single_precision: bool = False,
+            scalogram: bool = False
+    ) -> np.ndarray:
+        """
+        Compute the continuous wavelet transform for time-frequency analysis.
+        All scales are computed with one FFT of the signal and a frequency-domain wavelet bank,
+        which is cached per (wavelet, scales, N, dt) for repeated windows of the same length, see utils.wavelets.
+
+        Parameters:
+        - values: The signal, the samples are on the last axis and leading axes are a batch of signals.
+        - scales: The scales of the wavelet in units of time,
+                  utils.wavelets.fourier_periods() converts them to Fourier periods.
+        - wavelet: "morlet", "mexican_hat" or "paul".
+        - dt: The sampling interval of the signal.
+        - single_precision: Whether to compute in complex64, which halves the memory.
+        - scalogram: Whether to return the wavelet power |W|^2 instead of the complex coefficients.
+
+        Returns:
+        - The coefficients or the scalogram of shape (..., n_scales, n_samples),
+          in float32 or complex64 with single precision.
+        """
+        coefficients = cwt(values, scales, wavelet=wavelet, dt=dt, single_precision=single_precision)
+        if scalogram:
+            return coefficients.real ** 2 + coefficients.imag ** 2
+        return coefficients
@@ -1,7 +1,31 @@
-from typing import List, Tuple, Union
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
 import sympy as sp
+from scipy.signal import CZT
 from sympy import abc
+
 from transforms.base_transform.base_transform import BaseTransform
+from utils.dtypes import as_dtype, check_dtype, is_arbitrary_precision, to_mpmath, working_array
+from utils.z_rules import inverse_z_transform_rational, z_transform_rules
+
+# integer n-values are scattered onto the dense sequence n_min, ..., n_max for Horner's scheme or the
+# chirp-z transform only if it is at most this many times longer than the n-values, sparse ones use the kernel
+DENSE_SPAN_FACTOR = 4
+
+
+class ZContour(NamedTuple):
+    """
+    A spiral or arc in the z-plane made of the points z_k = start * ratio ** k for k = 0, ..., count - 1.
+    With abs(start) == abs(ratio) == 1 the contour is an arc on the unit circle.
+    """
+    start: complex
+    ratio: complex
+    count: int
+
+    def points(self) -> np.ndarray:
+        return self.start * self.ratio ** np.arange(self.count, dtype=np.float64)
 
 
 class ZTransform(BaseTransform):
@@ -12,14 +36,26 @@ class ZTransform(BaseTransform):
             is_base_form: bool = True,
             z: sp.Symbol = abc.z,
             n: sp.Symbol = abc.n,
+            timeout: Optional[float] = None,
+            numeric_fallback: bool = False,
     ):
         self.z = z
         self.n = n
         super().__init__(
             function=function,
             is_base_form=is_base_form,
+            timeout=timeout,
+            numeric_fallback=numeric_fallback,
         )
 
+    @property
+    def _base_symbols(self) -> Tuple[sp.Symbol, ...]:
+        return (self.n,)
+
+    @property
+    def _transformed_symbols(self) -> Tuple[sp.Symbol, ...]:
+        return (self.z,)
+
     def _compute_transform_function(self) -> Union[Tuple, sp.Basic]:
         """
         Compute the symbolic Z-transform of the base function.
@@ -34,10 +70,14 @@ class ZTransform(BaseTransform):
         inverse_transform = self.inverse_z_transform(self.transformed_func_as_func, self.n, self.z)
         return inverse_transform
 
+    def _unevaluated_transform_function(self) -> sp.Expr:
+        return sp.Sum(self.base_func_as_func * self.z ** (-self.n), (self.n, 0, sp.oo))
+
     @classmethod
     def z_transform(cls, f_n, n, z):
         """
         Compute the symbolic Z-transform of a function.
+        The table and the rules of utils.z_rules are tried first, the summation is the last resort.
 
         Parameters:
         - f: The function f(n) to transform.
@@ -47,12 +87,17 @@ class ZTransform(BaseTransform):
         Returns:
         - The symbolic Z-transform.
         """
+        transform = z_transform_rules(f_n, n, z)
+        if transform is not None:
+            return transform
         return sp.summation(f_n * z**(-n), (n, 0, sp.oo))
 
     @classmethod
     def inverse_z_transform(cls, f_z, n, z):
         """
         Compute the symbolic inverse Z-transform of a function.
+        Rational functions are inverted by partial fractions, see utils.z_rules,
+        the summation is the last resort.
 
         Parameters:
         - F: The function F(z) in the Z domain.
@@ -62,35 +107,117 @@ class ZTransform(BaseTransform):
         Returns:
         - The symbolic inverse Z-transform.
         """
+        inverse_transform = inverse_z_transform_rational(f_z, z, n)
+        if inverse_transform is not None:
+            return inverse_transform
         return sp.summation(f_z * z**n / (2 * sp.pi * sp.I), (z, sp.oo, -sp.oo))
 
     @classmethod
     def transform_data(
             cls,
-            values: List[sp.Number],
-            n_values: List[int],
-            z_values: List[sp.Number]
-    ) -> List[sp.Number]:
+            values: Union[List[sp.Number], np.ndarray],
+            n_values: Union[List[int], np.ndarray],
+            z_values: Union[List[sp.Number], np.ndarray] = None,
+            contour: ZContour = None,
+            dtype: Optional[np.dtype] = None
+    ) -> np.ndarray:
         """
         Compute the numerical Z-transform for a discrete list of points over multiple z-values.
 
+        The z-values are either given explicitly, which evaluates sum(v * z ** (-n)) with Horner's scheme
+        for dense integer n-values and otherwise as a single matrix product of the values with the np.power kernel,
+        or as a ZContour, i.e. a spiral or arc z_k = start * ratio ** k in the z-plane, which is evaluated
+        with the chirp-z transform in O((N + M) log(N + M)) for dense n-values.
+
         Parameters:
         - values: List of function values (e.g., [1, 2, 3, 4]).
-        - n_values: List of corresponding n-values (e.g., [0, 1, 2, 3]).
+                  A 2D array of shape (n_sequences, n_values) transforms all rows at once.
+        - n_values: List of corresponding n-values (e.g., [0, 1, 2, 3]), must be integers for a contour.
         - z_values: List of z-values at which to evaluate the Z-transform.
+        - contour: A ZContour to evaluate the Z-transform on instead of z_values.
+        - dtype: The dtype of the result, see utils.dtypes. With object the values are summed with mpmath,
+                 also on the points of a contour instead of the chirp-z transform.
 
         Returns:
-        - A list of numerical Z-transform results for each z-value.
+        - An array of numerical Z-transform results for each z-value.
         """
-        if len(values) != len(n_values):
+        dtype = check_dtype(dtype)
+        values = working_array(values, dtype)
+        n_values = np.asarray(n_values)
+        if values.shape[-1:] != n_values.shape:
             raise ValueError("The lengths of 'values' and 'n_values' must be equal.")
+        if (z_values is None) == (contour is None):
+            raise ValueError("Exactly one of 'z_values' and 'contour' must be given.")
+
+        if contour is not None:
+            if not is_arbitrary_precision(dtype):
+                return as_dtype(cls._transform_data_on_contour(values, n_values, contour), dtype)
+            start, ratio = to_mpmath([contour.start, contour.ratio])
+            z_values = np.array([start * ratio ** index for index in range(contour.count)], dtype=object)
+
+        z_values = working_array(z_values, dtype)
+        if not cls._are_integers(n_values) or not cls._is_dense(n_values):
+            kernel = np.power(z_values[:, np.newaxis], -working_array(n_values, dtype))
+            return as_dtype(values @ kernel.T, dtype)
+
+        # Horner's scheme in 1 / z over the dense sequence, vectorized over the z-values
+        sequence, n_min = cls._dense_sequence(values, n_values)
+        inverse_z_values = 1 / z_values
+        transformed = np.zeros(values.shape[:-1] + z_values.shape, dtype=np.result_type(values, z_values))
+        for index in reversed(range(sequence.shape[-1])):
+            transformed = transformed * inverse_z_values + sequence[..., index, np.newaxis]
+        if n_min:
+            transformed = transformed * z_values ** (-n_min if is_arbitrary_precision(dtype) else -float(n_min))
+        return as_dtype(transformed, dtype)
 
-        results = []
-        for z_value in z_values:
-            z_transform = sum(v * z_value ** (-n) for v, n in zip(values, n_values))
-            results.append(z_transform)
+    @classmethod
+    def _transform_data_on_contour(
+            cls,
+            values: np.ndarray,
+            n_values: np.ndarray,
+            contour: ZContour
+    ) -> np.ndarray:
+        """
+        Evaluates the Z-transform on the contour with the chirp-z transform.
+        The offset n_min of the dense sequence is applied as the factor z ** (-n_min) afterward.
+        Sparse n-values are evaluated with the np.power kernel on the points of the contour instead.
+        """
+        if not cls._are_integers(n_values):
+            raise ValueError("The chirp-z transform on a contour needs integer 'n_values'.")
+        if not cls._is_dense(n_values):
+            return values @ np.power(contour.points()[:, np.newaxis], -n_values.astype(np.float64)).T
+
+        sequence, n_min = cls._dense_sequence(values, n_values)
+        transformed = _chirp_z_transform(sequence.shape[-1], contour)(sequence)
+        if n_min:
+            transformed = transformed * contour.points() ** (-float(n_min))
+        return transformed
+
+    @staticmethod
+    def _are_integers(n_values: np.ndarray) -> bool:
+        return bool(np.all(np.equal(np.mod(n_values, 1), 0)))
+
+    @staticmethod
+    def _is_dense(n_values: np.ndarray) -> bool:
+        if not n_values.size:
+            return True
+        span = int(n_values.max()) - int(n_values.min()) + 1
+        return span <= DENSE_SPAN_FACTOR * n_values.size
+
+    @staticmethod
+    def _dense_sequence(values: np.ndarray, n_values: np.ndarray) -> Tuple[np.ndarray, int]:
+        """
+        Scatters the values onto the dense sequence n_min, ..., n_max (zeros in between).
 
-        return results
+        Returns:
+        - The dense sequence along the last axis and n_min.
+        """
+        n_values = n_values.astype(np.int64)
+        n_min = int(n_values.min()) if n_values.size else 0
+        length = int(n_values.max()) - n_min + 1 if n_values.size else 1
+        sequence = np.zeros(values.shape[:-1] + (length,), dtype=values.dtype)
+        np.add.at(sequence, (..., n_values - n_min), values)
+        return sequence, n_min
 
     @classmethod
     def inverse_transform_data(cls, *_, **__):
@@ -105,3 +232,11 @@ class ZTransform(BaseTransform):
         raise RuntimeError(
             "Exact inversion of the Z-transform for discrete points is computationally infeasible or undefined."
         )
+
+
+@lru_cache(maxsize=32)
+def _chirp_z_transform(n_points: int, contour: ZContour) -> CZT:
+    """
+    The chirp-z transform with precomputed chirps for sequences of length n_points on the contour.
+    """
+    return CZT(n=n_points, m=contour.count, w=1 / complex(contour.ratio), a=complex(contour.start))
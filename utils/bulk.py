@@ -0,0 +1,113 @@
+"""
+Bulk transforms of arrays larger than the memory.
+
+The input is opened as a read only memory map, a .npy file with np.load or a raw binary file with np.memmap,
+and processed in tiles along one axis. Every tile is transformed and written into its slice of a memory-mapped
+.npy output file right away, so only the tiles in flight are held in memory: one per thread.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Sequence, Union
+
+import numpy as np
+
+
+# the default size of a tile of the input in bytes
+DEFAULT_TILE_BYTES = 64 * 2 ** 20
+
+
+def open_array(
+        source: Union[str, os.PathLike, np.ndarray],
+        dtype: Optional[np.dtype] = None,
+        shape: Optional[Sequence[int]] = None,
+        offset: int = 0
+) -> np.ndarray:
+    """
+    Open a .npy or a raw binary file as a read only memory map, arrays are returned as they are.
+
+    Parameters:
+    - source: The path of the file or an array.
+    - dtype: The dtype of a raw binary file.
+    - shape: The shape of a raw binary file, by default one dimensional over the whole file.
+    - offset: The number of header bytes of a raw binary file before the data.
+
+    Returns:
+    - The memory-mapped array.
+    """
+    if not isinstance(source, (str, os.PathLike)):
+        return np.asarray(source)
+    if os.fspath(source).endswith(".npy"):
+        return np.load(source, mmap_mode="r")
+    if dtype is None:
+        raise ValueError("Raw binary files need a dtype.")
+    return np.memmap(source, dtype=dtype, mode="r", offset=offset, shape=None if shape is None else tuple(shape))
+
+
+def transform_tiles(
+        function: Callable[[np.ndarray], np.ndarray],
+        source: Union[str, os.PathLike, np.ndarray],
+        output_path: Union[str, os.PathLike],
+        axis: int = 0,
+        tile_size: Optional[int] = None,
+        workers: Optional[int] = None,
+        dtype: Optional[np.dtype] = None,
+        shape: Optional[Sequence[int]] = None,
+        offset: int = 0
+) -> np.memmap:
+    """
+    Apply function to the tiles of the input along axis and write the results into a .npy file.
+    The function must transform the entries along axis independently and keep the axis, e.g. a batch axis,
+    its output for a tile is written to the same entries along axis of the output.
+
+    Parameters:
+    - function: The transform of a tile, e.g. a transform_data classmethod with fixed arguments.
+    - source: The input, see open_array().
+    - output_path: The path of the .npy output file.
+    - axis: The axis to tile.
+    - tile_size: The number of entries along axis per tile, by default tiles of about DEFAULT_TILE_BYTES.
+    - workers: The number of threads transforming tiles concurrently, by default one.
+    - dtype, shape, offset: The layout of a raw binary input file, see open_array().
+
+    Returns:
+    - The output as memory map.
+    """
+    values = open_array(source, dtype=dtype, shape=shape, offset=offset)
+    axis = axis % values.ndim
+    n_entries = values.shape[axis]
+    if n_entries == 0:
+        raise ValueError("The input is empty along the axis.")
+    if tile_size is None:
+        tile_size = max(1, DEFAULT_TILE_BYTES // max(1, values.nbytes // n_entries))
+    tiles = [slice(start, min(start + tile_size, n_entries)) for start in range(0, n_entries, tile_size)]
+
+    def index(tile: slice) -> tuple:
+        return (slice(None),) * axis + (tile,)
+
+    def transform(tile: slice) -> np.ndarray:
+        transformed = np.asarray(function(values[index(tile)]))
+        if transformed.ndim <= axis or transformed.shape[axis] != tile.stop - tile.start:
+            raise ValueError(f"The transform must keep the axis {axis} of the tiles.")
+        return transformed
+
+    # the first tile determines the shape and the dtype of the output
+    first = transform(tiles[0])
+    output = np.lib.format.open_memmap(
+        output_path, mode="w+", dtype=first.dtype,
+        shape=first.shape[:axis] + (n_entries,) + first.shape[axis + 1:]
+    )
+    output[index(tiles[0])] = first
+    del first
+
+    def write(tile: slice):
+        # the tiles are disjoint, so the threads write without locks
+        output[index(tile)] = transform(tile)
+
+    if workers is not None and workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # list() propagates the exceptions of the threads
+            list(executor.map(write, tiles[1:]))
+    else:
+        for tile in tiles[1:]:
+            write(tile)
+    output.flush()
+    return output
@@ -0,0 +1,157 @@
+"""
+Content addressed cache for the results of symbolic transforms.
+
+The results are kept in an in-memory LRU tier and optionally in an on-disk sqlite tier,
+such that the same transforms do not have to be recomputed at every process start.
+"""
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Mapping, Optional
+
+import sympy as sp
+
+from utils.consts import SYMBOLIC_CACHE_VERSION, SYMBOLIC_CACHE_PATH_ENV
+
+
+_MISSING = object()
+
+
+class SymbolicCache:
+
+    """
+    Two tier cache for symbolic transform results.
+    The in-memory tier is an LRU of at most maxsize entries, the on-disk tier is a sqlite database
+    at path, which is only used if a path is given. Entries are pickled on disk, so only point
+    the cache to files you trust.
+    """
+
+    def __init__(self, path: Optional[str] = None, maxsize: int = 256):
+        self.path = path
+        self.maxsize = maxsize
+        self._memory = OrderedDict()
+        self._lock = threading.RLock()
+        self._connection = None
+        self._connection_pid = None
+
+    @staticmethod
+    def make_key(
+            transform_cls: type,
+            function: sp.Basic,
+            parameters: Mapping[str, Any],
+            direction: str
+    ) -> str:
+        """
+        Build the content addressed key of a symbolic transform.
+
+        Parameters:
+        - transform_cls: The class of the transform.
+        - function: The function that is transformed.
+        - parameters: The symbols and other parameters of the transform, e.g. {"s": s, "t": t}.
+        - direction: Whether the function is transformed ("transform") or inverse transformed ("inverse").
+
+        Returns:
+        - The sha256 hex digest over all the above together with the cache and SymPy versions.
+        """
+        def represent(value):
+            return sp.srepr(value) if isinstance(value, sp.Basic) else repr(value)
+
+        parts = [
+            f"{transform_cls.__module__}.{transform_cls.__qualname__}",
+            direction,
+            represent(function),
+            *(f"{name}={represent(value)}" for name, value in sorted(parameters.items())),
+            f"cache_version={SYMBOLIC_CACHE_VERSION}",
+            f"sympy={sp.__version__}",
+        ]
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+
+            value = self._get_from_disk(key)
+            if value is _MISSING:
+                return default
+            self._set_in_memory(key, value)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._set_in_memory(key, value)
+            self._set_on_disk(key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            connection = self._get_connection()
+            if connection is not None:
+                with connection:
+                    connection.execute("DELETE FROM results")
+
+    def _set_in_memory(self, key: str, value: Any) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def _get_from_disk(self, key: str) -> Any:
+        connection = self._get_connection()
+        if connection is None:
+            return _MISSING
+        row = connection.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return _MISSING
+        return pickle.loads(row[0])
+
+    def _set_on_disk(self, key: str, value: Any) -> None:
+        connection = self._get_connection()
+        if connection is None:
+            return
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)",
+                (key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+            )
+
+    def _get_connection(self) -> Optional[sqlite3.Connection]:
+        """
+        Opens the sqlite database lazily, again after a fork as connections must not be shared between processes.
+        """
+        if self.path is None:
+            return None
+        if self._connection is None or self._connection_pid != os.getpid():
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._connection_pid = os.getpid()
+            with self._connection:
+                self._connection.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB)")
+        return self._connection
+
+
+_symbolic_cache: Optional[SymbolicCache] = SymbolicCache(path=os.environ.get(SYMBOLIC_CACHE_PATH_ENV))
+
+
+def get_symbolic_cache() -> Optional[SymbolicCache]:
+    """
+    The cache consulted by all transforms, None if caching is disabled.
+    """
+    return _symbolic_cache
+
+
+def set_symbolic_cache(cache: Optional[SymbolicCache]) -> None:
+    """
+    Replace the cache consulted by all transforms, e.g. SymbolicCache(path="transforms.sqlite")
+    to persist the results on disk, or None to disable caching.
+    """
+    global _symbolic_cache
+    _symbolic_cache = cache
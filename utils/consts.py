@@ -1,3 +1,8 @@
 from sympy import Symbol
 
 ZERO = Symbol("ZERO")
+
+# bump whenever the results of the symbolic transforms change, to invalidate persisted cache entries
+SYMBOLIC_CACHE_VERSION = 1
+# environment variable with the path of the on-disk tier of the symbolic cache
+SYMBOLIC_CACHE_PATH_ENV = "MATHEMATICAL_TRANSFORMS_CACHE"
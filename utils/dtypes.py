@@ -0,0 +1,117 @@
+"""
+The numeric contract of the data transforms.
+
+transform_data() and inverse_transform_data() of all transforms accept array-likes and return ndarrays
+of the dtype chosen by the caller with their dtype argument:
+- None: The natural dtype of the computation, float64 or complex128 for most transforms.
+- np.float32, np.float64, np.complex64, np.complex128: The inputs are cast to the precision of the dtype, so single
+  precision is computed in single precision where NumPy supports it, and the result is converted to the dtype.
+  Real dtypes require a real result, up to rounding errors.
+- object: Arbitrary precision, the transform is computed with mpmath at mpmath.mp.dps digits and returns an array of
+  mpf or mpc numbers. Inputs may be SymPy numbers, which are evaluated at that precision.
+  Transforms that are built on float algorithms, e.g. FFTs of several axes, raise a ValueError.
+"""
+from typing import Any, Callable, Optional
+
+import mpmath
+import numpy as np
+import sympy as sp
+
+
+NUMERIC_DTYPES = tuple(np.dtype(dtype) for dtype in (np.float32, np.float64, np.complex64, np.complex128))
+
+
+def check_dtype(dtype: Any) -> Optional[np.dtype]:
+    """
+    Validate the dtype argument of a data transform.
+
+    Returns:
+    - The np.dtype, or None for the natural dtype.
+    """
+    if dtype is None:
+        return None
+    dtype = np.dtype(dtype)
+    if dtype not in NUMERIC_DTYPES and dtype != object:
+        raise ValueError(
+            f"Unsupported dtype {dtype}, use one of {[str(numeric) for numeric in NUMERIC_DTYPES]} "
+            f"or object for arbitrary precision."
+        )
+    return dtype
+
+
+def is_arbitrary_precision(dtype: Any) -> bool:
+    return dtype is not None and np.dtype(dtype) == object
+
+
+def require_numpy_dtype(dtype: Any, method: str) -> None:
+    """
+    Raise a ValueError for dtype=object in a method that can not compute in arbitrary precision.
+    """
+    if is_arbitrary_precision(dtype):
+        raise ValueError(f"{method} is computed with floats and does not support dtype=object, use a NumPy dtype.")
+
+
+def working_array(values: Any, dtype: Optional[np.dtype]) -> np.ndarray:
+    """
+    The input values as array in the precision of dtype, float64 or complex128 without dtype.
+    Integers and reals become real, complex values stay complex.
+    """
+    values = np.asarray(values)
+    if is_arbitrary_precision(dtype):
+        return to_mpmath(values)
+    precision = np.float64 if dtype is None else np.finfo(dtype).dtype
+    if np.iscomplexobj(values):
+        return values.astype(np.result_type(precision, np.complex64))
+    return values.astype(precision)
+
+
+def as_dtype(values: Any, dtype: Optional[np.dtype]) -> np.ndarray:
+    """
+    Convert the result of a data transform to dtype, which keeps the result as it is if it is None.
+
+    Raises:
+    - ValueError: If dtype is real but the result has imaginary parts beyond the rounding errors.
+    """
+    values = np.asarray(values)
+    if dtype is None or values.dtype == dtype:
+        return values
+    if is_arbitrary_precision(dtype):
+        return to_mpmath(values)
+    if values.dtype == object:
+        values = values.astype(np.complex128 if any(isinstance(v, mpmath.mpc) for v in values.flat) else np.float64)
+    if np.iscomplexobj(values) and not np.issubdtype(dtype, np.complexfloating):
+        # imaginary parts of the size of the rounding errors, e.g. of an inverse FFT, are dropped
+        tolerance = 100 * np.finfo(values.dtype).eps * np.max(np.abs(values), initial=0)
+        if np.any(np.abs(values.imag) > tolerance):
+            raise ValueError(f"The result is complex and can not be converted to {np.dtype(dtype)}.")
+        values = values.real
+    return values.astype(dtype)
+
+
+def to_mpmath(values: Any) -> np.ndarray:
+    """
+    An object array of the values as mpmath numbers, mpf for real and mpc for complex values.
+    """
+    return np.asarray(np.frompyfunc(_to_mpmath, 1, 1)(np.asarray(values, dtype=object)), dtype=object)
+
+
+def _to_mpmath(value: Any) -> Any:
+    if isinstance(value, (mpmath.mpf, mpmath.mpc)):
+        return value
+    if isinstance(value, sp.Basic):
+        value = sp.N(value, mpmath.mp.dps)
+        real, imaginary = value.as_real_imag()
+        return mpmath.mpf(real._to_mpmath(mpmath.mp.prec)) if imaginary == 0 else mpmath.mpc(
+            real._to_mpmath(mpmath.mp.prec), imaginary._to_mpmath(mpmath.mp.prec)
+        )
+    if isinstance(value, np.generic):
+        value = value.item()
+    return mpmath.mpmathify(value)
+
+
+def mpmath_ufunc(function: Callable, n_arguments: int = 1) -> Callable:
+    """
+    Vectorize an mpmath function over object arrays.
+    """
+    ufunc = np.frompyfunc(function, n_arguments, 1)
+    return lambda *args: np.asarray(ufunc(*args), dtype=object)
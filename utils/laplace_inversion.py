@@ -0,0 +1,173 @@
+"""
+Numerical inversion of the Laplace transform.
+
+All methods approximate f(t) from the values of F(s) at nodes s_k / t, where the normalized nodes s_k
+and the weights only depend on the method and the number of terms and are cached per (method, n_terms).
+So F is evaluated once on a (n_times, n_terms) grid and the inversion is vectorized over all time points:
+- "talbot": The fixed Talbot method of Abate and Valkó, which deforms the Bromwich contour around the
+            negative real axis. Accurate for most transfer functions, F must be analytic left of the contour.
+- "stehfest": The Gaver-Stehfest method, which only evaluates F on the positive real axis.
+              Suited for smooth, non oscillating f(t), its accuracy is limited by cancellation in double precision.
+- "dehoog": The method of de Hoog, Knight and Stokes, which accelerates the Fourier series of the Bromwich
+            integral with a continued fraction. It handles oscillating f(t) best.
+"""
+from functools import lru_cache
+from math import factorial
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+
+LAPLACE_INVERSION_METHODS = ("talbot", "stehfest", "dehoog")
+
+# the default number of terms, chosen for double precision
+DEFAULT_N_TERMS = {
+    "talbot": 24,
+    "stehfest": 14,
+    "dehoog": 16,
+}
+
+# the relative tolerance of the de Hoog method, it determines the shift of its contour
+DE_HOOG_TOL = 1e-12
+
+
+def invert_laplace(
+        function: Callable[[np.ndarray], np.ndarray],
+        time_points: np.ndarray,
+        method: str = "talbot",
+        n_terms: Optional[int] = None
+) -> np.ndarray:
+    """
+    Numerically invert the Laplace transform F(s) at the given time points.
+
+    Parameters:
+    - function: F(s), vectorized over a complex array of shape (n_times, n_terms).
+                It may return an array of shape (..., n_times, n_terms) to invert a batch of transforms at once,
+                e.g. by broadcasting parameter arrays of shape (n_functions, 1, 1) against s.
+    - time_points: The positive time points.
+    - method: "talbot", "stehfest" or "dehoog", see the module docstring.
+    - n_terms: The number of terms (nodes) of the method, by default DEFAULT_N_TERMS[method].
+
+    Returns:
+    - f(t) at the time points, of shape (..., n_times).
+    """
+    if method not in LAPLACE_INVERSION_METHODS:
+        raise ValueError(f"Unknown method '{method}', use one of {LAPLACE_INVERSION_METHODS}.")
+    n_terms = DEFAULT_N_TERMS[method] if n_terms is None else int(n_terms)
+
+    time_points = np.asarray(time_points, dtype=np.float64)
+    if time_points.ndim != 1:
+        raise ValueError("'time_points' must be one dimensional.")
+    if np.any(time_points <= 0):
+        raise ValueError("The Laplace transform can only be inverted numerically at positive time points.")
+
+    if method == "talbot":
+        nodes, weights = _talbot_rule(n_terms)
+    elif method == "stehfest":
+        nodes, weights = _stehfest_rule(n_terms)
+    else:
+        nodes = _de_hoog_nodes(n_terms)
+
+    s = nodes / time_points[:, np.newaxis]
+    values = np.asarray(function(s))
+    values = np.broadcast_to(values, np.broadcast_shapes(values.shape, s.shape))
+
+    if method == "dehoog":
+        return _de_hoog_sum(values, n_terms) / time_points
+    return np.real(values @ weights) / time_points
+
+
+@lru_cache(maxsize=None)
+def _talbot_rule(n_terms: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Normalized nodes and weights of the fixed Talbot method:
+    f(t) = 1 / t * Re(sum_k w_k F(s_k / t)) on the contour s(θ) = r θ (cot θ + i) with r = 2 M / 5.
+    """
+    r = 2 * n_terms / 5
+    theta = np.pi * np.arange(1, n_terms) / n_terms
+    cot = 1 / np.tan(theta)
+    sigma = theta + (theta * cot - 1) * cot
+
+    nodes = np.concatenate(([r], r * theta * (cot + 1j)))
+    weights = np.concatenate(([np.exp(r) / 2], np.exp(nodes[1:]) * (1 + 1j * sigma))) * r / n_terms
+    return _read_only(nodes), _read_only(weights)
+
+
+@lru_cache(maxsize=None)
+def _stehfest_rule(n_terms: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Normalized nodes and weights of the Gaver-Stehfest method:
+    f(t) = 1 / t * sum_k ln(2) V_k F(k ln(2) / t). The coefficients V_k are computed exactly with integers.
+    """
+    if n_terms % 2:
+        raise ValueError("The Stehfest method needs an even number of terms.")
+    half = n_terms // 2
+
+    coefficients = []
+    for k in range(1, n_terms + 1):
+        total = 0
+        for j in range((k + 1) // 2, min(k, half) + 1):
+            total += j ** half * factorial(2 * j) / (
+                factorial(half - j) * factorial(j) * factorial(j - 1) * factorial(k - j) * factorial(2 * j - k)
+            )
+        coefficients.append((-1) ** (k + half) * total)
+
+    nodes = np.log(2) * np.arange(1, n_terms + 1, dtype=np.complex128)
+    weights = np.log(2) * np.array(coefficients, dtype=np.float64)
+    return _read_only(nodes), _read_only(weights)
+
+
+@lru_cache(maxsize=None)
+def _de_hoog_nodes(n_terms: int) -> np.ndarray:
+    """
+    Normalized nodes of the de Hoog method with the period T = 2 t:
+    s_k t = -ln(tol) / 4 + i π k / 2 for k = 0, ..., 2 M.
+    """
+    return _read_only(-np.log(DE_HOOG_TOL) / 4 + 1j * np.pi * np.arange(2 * n_terms + 1) / 2)
+
+
+def _de_hoog_sum(values: np.ndarray, n_terms: int) -> np.ndarray:
+    """
+    Sums the Fourier series of the de Hoog method with the quotient-difference algorithm.
+    All time points and transforms are processed at once, only the recursions over the terms are loops.
+
+    Returns:
+    - t * f(t)
+    """
+    m = n_terms
+    values = values.astype(np.complex128)
+    values = np.moveaxis(values, -1, 0).copy()
+    values[0] /= 2
+
+    # the quotient-difference table, e has one column more than q
+    q = values[1:2 * m + 1] / values[:2 * m]
+    e = np.zeros_like(q)
+    coefficients = [values[0], -q[0]]
+    for r in range(1, m + 1):
+        n_rows = 2 * (m - r) + 1
+        e = q[1:n_rows + 1] - q[:n_rows] + e[1:n_rows + 1]
+        coefficients.append(-e[0])
+        if r < m:
+            q = q[1:n_rows] * e[1:] / e[:-1]
+            coefficients.append(-q[0])
+
+    # with T = 2 t the base of the power series is z = exp(i π t / T) = i
+    z = 1j
+    a_previous, a = np.zeros_like(values[0]), coefficients[0]
+    b_previous, b = np.ones_like(values[0]), np.ones_like(values[0])
+    for d in coefficients[1:2 * m]:
+        a_previous, a = a, a + d * a_previous * z
+        b_previous, b = b, b + d * b_previous * z
+
+    # the improved remainder of the continued fraction
+    remainder = (1 + (coefficients[2 * m - 1] - coefficients[2 * m]) * z) / 2
+    remainder = remainder * (np.sqrt(1 + coefficients[2 * m] * z / remainder) - 1)
+    a = a + remainder * a_previous
+    b = b + remainder * b_previous
+
+    return np.exp(-np.log(DE_HOOG_TOL) / 4) / 2 * np.real(a / b)
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
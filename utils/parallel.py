@@ -0,0 +1,130 @@
+"""
+Parallel symbolic transforms of many functions with a pool of processes.
+
+The symbolic transforms of SymPy are pure Python and hold the GIL, so only processes run them in parallel.
+The functions and the symbolic parameters are sent to the workers as srepr strings, which preserve the
+assumptions of the symbols and are independent of the pickling support of the SymPy classes,
+and the results come back the same way. Cached results are looked up before any work is sent to the workers,
+and the computed results are stored in the symbolic cache of the calling process.
+"""
+import importlib
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import sympy as sp
+
+from utils.cache import get_symbolic_cache, set_symbolic_cache
+
+
+def transform_many(
+        transform_cls: type,
+        functions: Iterable[Union[sp.Expr, Tuple]],
+        is_base_form: bool = True,
+        timeout: Optional[float] = None,
+        max_workers: Optional[int] = None,
+        **parameters
+) -> List[Union[Any, Exception]]:
+    """
+    Compute the symbolic transforms of many functions in parallel processes.
+
+    Parameters:
+    - transform_cls: The transform, a subclass of BaseTransform.
+    - functions: The functions to transform.
+    - is_base_form: Whether the functions are base functions, otherwise they are inverse transformed.
+    - timeout: The maximum number of seconds for the transform of each function.
+    - max_workers: The number of processes, by default the number of CPUs.
+    - parameters: The keyword arguments of the transform, e.g. the symbols.
+
+    Returns:
+    - For every function in order, the computed transform or the exception of its computation,
+      a TransformTimeoutError if it took longer than timeout.
+    """
+    direction = "transform" if is_base_form else "inverse"
+    cache = get_symbolic_cache()
+    results = []
+    tasks = {}
+    for index, function in enumerate(functions):
+        try:
+            transform = transform_cls(function, is_base_form=is_base_form, **parameters)
+        except Exception as e:
+            results.append(e)
+            continue
+        results.append(transform)
+        if cache is not None:
+            cached = cache.get(_cache_key(cache, transform, direction))
+            if cached is not None:
+                _set_result(transform, direction, cached)
+                continue
+        given = transform.base_function if is_base_form else transform.transformed_function
+        tasks[index] = (
+            (transform_cls.__module__, transform_cls.__qualname__),
+            sp.srepr(given), is_base_form, _serialize_parameters(parameters), timeout
+        )
+
+    if not tasks:
+        return results
+
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(), initializer=_initialize_worker) as executor:
+        futures = {index: executor.submit(_transform_in_worker, task) for index, task in tasks.items()}
+        for index, future in futures.items():
+            try:
+                failed, outcome = future.result()
+            except Exception as e:
+                # e.g. a crashed worker process
+                results[index] = e
+                continue
+            if failed:
+                results[index] = outcome
+                continue
+            result = sp.sympify(outcome)
+            _set_result(results[index], direction, result)
+            if cache is not None:
+                cache.set(_cache_key(cache, results[index], direction), result)
+    return results
+
+
+def _cache_key(cache, transform, direction: str) -> str:
+    given = transform.base_function if direction == "transform" else transform.transformed_function
+    return cache.make_key(type(transform), given, transform._symbolic_parameters, direction)
+
+
+def _set_result(transform, direction: str, result):
+    if direction == "transform":
+        transform.transformed_function = result
+    else:
+        transform.base_function = result
+
+
+def _serialize_parameters(parameters: Dict[str, Any]) -> Dict[str, Tuple[bool, Any]]:
+    return {
+        name: (True, sp.srepr(value)) if isinstance(value, sp.Basic) else (False, value)
+        for name, value in parameters.items()
+    }
+
+
+def _initialize_worker():
+    # the calling process owns the cache, the workers do not write into it concurrently
+    set_symbolic_cache(None)
+
+
+def _transform_in_worker(task: tuple) -> Tuple[bool, Any]:
+    (module, name), function, is_base_form, parameters, timeout = task
+    try:
+        transform_cls = getattr(importlib.import_module(module), name)
+        parameters = {
+            parameter: sp.sympify(value) if is_sympy else value
+            for parameter, (is_sympy, value) in parameters.items()
+        }
+        transform = transform_cls(sp.sympify(function), is_base_form=is_base_form, **parameters)
+        # the computation runs in a subprocess of the worker, which is killed after the timeout
+        transform.compute(timeout=timeout)
+        result = transform.transformed_function if is_base_form else transform.base_function
+        return False, sp.srepr(result)
+    except Exception as e:
+        try:
+            pickle.dumps(e)
+            return True, e
+        except Exception:
+            return True, RuntimeError(repr(e))
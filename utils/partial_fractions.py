@@ -0,0 +1,204 @@
+"""
+Partial fractions of rational functions, for the closed-form inverses of rational transforms.
+
+A proper rational function N(s) / D(s) with the poles p_i of multiplicities m_i is
+sum(c_ij / (s - p_i) ** j, j = 1, ..., m_i), where the coefficients c_ij of the principal parts follow from
+the derivatives of N(s) (s - p_i) ** m_i / D(s) at p_i. The inverses of the single fractions are known in closed
+form, e.g. c / (s - p) ** j <-> c t ** (j - 1) exp(p t) / (j - 1)! for the Laplace transform, so the inverse of
+the whole function only needs the roots of D, instead of a contour integral.
+
+inverse_laplace_rational() does this symbolically, rational_responses() numerically with the residues of
+scipy.signal.residue, which evaluates the impulse and step responses of transfer functions of any order
+on arrays of time points.
+
+The roots of irreducible factors of D of a degree above 2 are radicals with nested roots, or no radicals at all,
+and simplifying the principal parts at them takes minutes. find_poles() evaluates them numerically instead.
+"""
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import scipy.signal
+import sympy as sp
+
+
+# the precision of the numeric poles of irreducible factors of a degree above 2
+NUMERIC_POLE_DPS = 30
+
+
+def find_poles(denominator: sp.Poly) -> Optional[Dict[sp.Expr, int]]:
+    """
+    The roots of a polynomial with their multiplicities, exact for the factors of a degree up to 2
+    and numeric with NUMERIC_POLE_DPS digits for the irreducible factors of a higher degree.
+
+    Parameters:
+    - denominator: The polynomial.
+
+    Returns:
+    - The roots with their multiplicities as sp.roots returns them,
+      or None if not all roots can be found, e.g. for symbolic coefficients.
+    """
+    if not (denominator.domain.is_ZZ or denominator.domain.is_QQ):
+        poles = sp.roots(denominator)
+        return poles if sum(poles.values()) == denominator.degree() else None
+
+    poles = {}
+    for factor, multiplicity in denominator.factor_list()[1]:
+        if factor.degree() > 2:
+            # irreducible over the rationals, so its roots are simple
+            roots = {root: 1 for root in factor.nroots(n=NUMERIC_POLE_DPS)}
+        else:
+            roots = sp.roots(factor)
+        for root, root_multiplicity in roots.items():
+            poles[root] = poles.get(root, 0) + root_multiplicity * multiplicity
+    return poles
+
+
+def principal_part(
+        numerator: sp.Poly,
+        denominator: sp.Poly,
+        variable: sp.Symbol,
+        pole: sp.Expr,
+        multiplicity: int
+) -> Dict[int, sp.Expr]:
+    """
+    The coefficients of the principal part of numerator / denominator at one of its poles.
+
+    Parameters:
+    - numerator, denominator: The polynomials of the proper rational function.
+    - variable: The variable of the polynomials.
+    - pole: A root of denominator.
+    - multiplicity: The multiplicity of the root.
+
+    Returns:
+    - The coefficients c_j of c_j / (variable - pole) ** j by j = 1, ..., multiplicity.
+    """
+    # the division by (variable - pole) ** multiplicity is exact, also where the remainder does not simplify to zero
+    quotient, _ = sp.div(denominator, sp.Poly((variable - pole) ** multiplicity, variable))
+    coefficients = {multiplicity: sp.simplify(numerator.eval(pole) / quotient.eval(pole))}
+    derivative = numerator.as_expr() / quotient.as_expr()
+    for index in range(1, multiplicity):
+        derivative = sp.diff(derivative, variable)
+        coefficients[multiplicity - index] = sp.simplify(derivative.subs(variable, pole) / sp.factorial(index))
+    return coefficients
+
+
+def conjugate_pole(pole: sp.Expr, multiplicity: int, poles: Dict[sp.Expr, int]) -> Optional[sp.Expr]:
+    """
+    The complex conjugate of a numeric, non-real pole among the poles, which may be written differently.
+
+    Parameters:
+    - pole: The pole.
+    - multiplicity: Its multiplicity, which the conjugate must share.
+    - poles: All poles with their multiplicities, as returned by sp.roots.
+
+    Returns:
+    - The conjugate pole, or None if the pole is real, symbolic or has no conjugate among the poles.
+    """
+    if not pole.is_number or pole.is_real is not False:
+        return None
+    conjugate = complex(sp.N(sp.conjugate(pole)))
+    for other, other_multiplicity in poles.items():
+        if other.is_number and other_multiplicity == multiplicity and abs(complex(sp.N(other)) - conjugate) < 1e-12:
+            return other
+    return None
+
+
+def has_real_coefficients(*polynomials: sp.Poly) -> bool:
+    """
+    Whether all coefficients of the polynomials are real, so that their non-real roots come in conjugate pairs.
+    """
+    return all(coefficient.is_real for polynomial in polynomials for coefficient in polynomial.all_coeffs())
+
+
+def inverse_laplace_rational(transformed: sp.Expr, s: sp.Symbol, t: sp.Symbol) -> Optional[sp.Expr]:
+    """
+    The inverse Laplace transform of a rational function of s by partial fractions.
+    Like sp.inverse_laplace_transform, the result is multiplied by Heaviside(t), and the polynomial part of
+    an improper function gives derivatives of DiracDelta(t).
+
+    Parameters:
+    - transformed: F(s), rational in s.
+    - s: The complex variable.
+    - t: The time variable.
+
+    Returns:
+    - f(t), a sum of terms t ** k exp(p t), with damped cosines and sines for pairs of conjugate poles,
+      or None if F(s) is not rational or the roots of its denominator can not be found.
+    """
+    transformed = sp.sympify(transformed)
+    if not transformed.has(s) or not transformed.is_rational_function(s):
+        return None
+    numerator, denominator = (sp.Poly(part, s) for part in sp.fraction(sp.cancel(sp.together(transformed))))
+    polynomial, numerator = sp.div(numerator, denominator)
+    poles = find_poles(denominator)
+    if poles is None:
+        return None
+    real_coefficients = has_real_coefficients(numerator, denominator)
+
+    terms = [
+        coefficient * sp.DiracDelta(t, power) if power else coefficient * sp.DiracDelta(t)
+        for (power,), coefficient in polynomial.terms() if coefficient != 0
+    ]
+    handled = set()
+    for pole, multiplicity in poles.items():
+        if pole in handled:
+            continue
+        coefficients = principal_part(numerator, denominator, s, pole, multiplicity)
+        conjugate = conjugate_pole(pole, multiplicity, poles) if real_coefficients else None
+        for order, coefficient in coefficients.items():
+            power = t ** (order - 1) / sp.factorial(order - 1)
+            if conjugate is not None:
+                # the terms of p and its conjugate sum up to 2 Re(c t ** k exp(p t) / k!)
+                decay, frequency = sp.re(pole), sp.im(pole)
+                real, imaginary = sp.re(coefficient), sp.im(coefficient)
+                terms.append(
+                    2 * power * sp.exp(decay * t)
+                    * (real * sp.cos(frequency * t) - imaginary * sp.sin(frequency * t)) * sp.Heaviside(t)
+                )
+            else:
+                terms.append(coefficient * power * sp.exp(pole * t) * sp.Heaviside(t))
+        handled.add(pole)
+        if conjugate is not None:
+            handled.add(conjugate)
+    return sp.Add(*terms)
+
+
+def rational_responses(
+        numerators: Sequence[Sequence[complex]],
+        denominators: Sequence[Sequence[complex]],
+        time_points: np.ndarray,
+        response: str = "impulse"
+) -> np.ndarray:
+    """
+    The impulse or step responses of rational transfer functions from their poles and residues.
+
+    Parameters:
+    - numerators, denominators: The coefficients of the polynomials of every transfer function,
+                                by decreasing powers of s as for scipy.signal.
+    - time_points: The time points, the responses are zero before 0.
+    - response: "impulse" for the inverse Laplace transform of F(s), "step" for that of F(s) / s.
+
+    Returns:
+    - The responses of shape (n_functions, n_time_points), real if all coefficients are real.
+    """
+    if response not in ("impulse", "step"):
+        raise ValueError(f"Unknown response '{response}', use 'impulse' or 'step'.")
+    time_points = np.asarray(time_points, dtype=np.float64)
+    responses = []
+    for numerator, denominator in zip(numerators, denominators):
+        numerator, denominator = np.trim_zeros(np.atleast_1d(numerator), "f"), np.atleast_1d(denominator)
+        if response == "step":
+            denominator = np.append(denominator, 0)
+        residues, poles, direct = scipy.signal.residue(numerator, denominator)
+        if np.any(direct):
+            raise ValueError("The transfer function is improper, its response contains Dirac deltas.")
+        values = np.zeros(time_points.shape, dtype=np.complex128)
+        # scipy.signal.residue lists a pole of multiplicity m m times, with the residues of increasing powers
+        order = 0
+        for index, (residue, pole) in enumerate(zip(residues, poles)):
+            order = order + 1 if index and pole == poles[index - 1] else 1
+            values += residue * time_points ** (order - 1) / np.prod(range(1, order)) * np.exp(pole * time_points)
+        values[time_points < 0] = 0
+        real = np.isrealobj(numerator) and np.isrealobj(denominator)
+        responses.append(values.real if real else values)
+    return np.array(responses)
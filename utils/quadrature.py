@@ -0,0 +1,265 @@
+"""
+Vectorized numeric quadrature for the integrals of transforms that could not be solved symbolically.
+
+All rules are double exponential (DE) rules with the step size h = 2 ** -level, whose nodes and weights
+are cached per level. The integrands are evaluated for many outer points at once, e.g. for all s-values
+of a Laplace transform, and the levels are refined until the result of every point converged:
+- integrate(): tanh-sinh, exp-sinh and sinh-sinh rules for finite, semi-infinite and infinite intervals.
+- integrate_fourier(): Ooura and Mori's DE rule for the oscillatory integrals over f(x) cos(ωx) or f(x) sin(ωx).
+- integrate_hankel(): Ogata's DE rule on the zeros of J_ν for the oscillatory integrals over f(x) J_ν(ωx).
+"""
+from functools import lru_cache
+from typing import Callable, Tuple
+
+import numpy as np
+from scipy.special import jv, yv, jn_zeros
+
+
+# f(x, index) evaluates the integrand at the nodes x of shape (len(index), n_nodes)
+# for the outer points with the given indices
+Integrand = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+MIN_LEVEL = 3
+MAX_LEVEL = 8
+
+
+def integrate(
+        func: Integrand,
+        lower: np.ndarray,
+        upper: np.ndarray,
+        tol: float = 1e-10,
+        max_level: int = MAX_LEVEL
+) -> np.ndarray:
+    """
+    Integrate func from lower to upper for every outer point.
+
+    Parameters:
+    - func: The integrand, see Integrand.
+    - lower, upper: The limits of every outer point, may be -inf and inf respectively.
+    - tol: The relative tolerance between two levels at which a point is converged.
+    - max_level: The finest level, at which the result is returned regardless of convergence.
+
+    Returns:
+    - The integral for every outer point.
+    """
+    lower, upper = np.broadcast_arrays(np.asarray(lower, dtype=np.float64), np.asarray(upper, dtype=np.float64))
+    lower_infinite, upper_infinite = np.isneginf(lower), np.isposinf(upper)
+
+    def evaluate(level: int, index: np.ndarray) -> np.ndarray:
+        a, b = lower[index, np.newaxis], upper[index, np.newaxis]
+        a_infinite, b_infinite = lower_infinite[index], upper_infinite[index]
+        result = np.zeros(index.shape, dtype=np.complex128)
+
+        finite = ~a_infinite & ~b_infinite
+        if finite.any():
+            # tanh-sinh on [a, b], the nodes are measured from the closer limit to keep them accurate
+            t, left, weights = _tanh_sinh_rule(level)
+            x = np.where(t < 0, a[finite] + (b[finite] - a[finite]) * left, b[finite] - (b[finite] - a[finite]) * left)
+            result[finite] = _weighted_sum(func(x, index[finite]), (b[finite] - a[finite]) * weights)
+
+        semi_infinite = ~a_infinite & b_infinite
+        if semi_infinite.any():
+            x, weights = _exp_sinh_rule(level)
+            result[semi_infinite] = _weighted_sum(func(a[semi_infinite] + x, index[semi_infinite]), weights)
+
+        mirrored = a_infinite & ~b_infinite
+        if mirrored.any():
+            # the integral from -inf to b is the one from -b to inf over the mirrored integrand
+            x, weights = _exp_sinh_rule(level)
+            result[mirrored] = _weighted_sum(func(b[mirrored] - x, index[mirrored]), weights)
+
+        infinite = a_infinite & b_infinite
+        if infinite.any():
+            x, weights = _sinh_sinh_rule(level)
+            result[infinite] = _weighted_sum(func(np.broadcast_to(x, (infinite.sum(), x.size)), index[infinite]), weights)
+
+        return result
+
+    return _refine_levels(evaluate, lower.size, tol, max_level)
+
+
+def integrate_fourier(
+        func: Integrand,
+        frequency: np.ndarray,
+        kernel: str,
+        tol: float = 1e-10,
+        max_level: int = MAX_LEVEL
+) -> np.ndarray:
+    """
+    Integrate func(x) * cos(ωx) or func(x) * sin(ωx) from 0 to inf for every outer point.
+
+    Parameters:
+    - func: The integrand without the kernel, see Integrand.
+    - frequency: The positive frequency ω of every outer point.
+    - kernel: Either "cos" or "sin".
+    - tol: The relative tolerance between two levels at which a point is converged.
+    - max_level: The finest level, at which the result is returned regardless of convergence.
+
+    Returns:
+    - The integral for every outer point.
+    """
+    frequency = np.asarray(frequency, dtype=np.float64)
+
+    def evaluate(level: int, index: np.ndarray) -> np.ndarray:
+        x, weights = _ooura_rule(level, kernel)
+        omega = frequency[index, np.newaxis]
+        return _weighted_sum(func(x / omega, index), weights) / omega[:, 0]
+
+    return _refine_levels(evaluate, frequency.size, tol, max_level)
+
+
+def integrate_hankel(
+        func: Integrand,
+        frequency: np.ndarray,
+        order: int,
+        tol: float = 1e-10,
+        max_level: int = MAX_LEVEL
+) -> np.ndarray:
+    """
+    Integrate func(x) * J_ν(ωx) from 0 to inf for every outer point.
+
+    Parameters:
+    - func: The integrand without the Bessel function, see Integrand.
+    - frequency: The positive frequency ω of every outer point.
+    - order: The non negative integer order ν of the Bessel function.
+    - tol: The relative tolerance between two levels at which a point is converged.
+    - max_level: The finest level, at which the result is returned regardless of convergence.
+
+    Returns:
+    - The integral for every outer point.
+    """
+    frequency = np.asarray(frequency, dtype=np.float64)
+
+    def evaluate(level: int, index: np.ndarray) -> np.ndarray:
+        x, weights = _ogata_rule(level, order)
+        omega = frequency[index, np.newaxis]
+        return _weighted_sum(func(x / omega, index), weights) / omega[:, 0]
+
+    return _refine_levels(evaluate, frequency.size, tol, max_level)
+
+
+def _refine_levels(
+        evaluate: Callable[[int, np.ndarray], np.ndarray],
+        n_points: int,
+        tol: float,
+        max_level: int
+) -> np.ndarray:
+    """
+    Evaluates the rule on finer levels for the points that did not converge yet.
+    """
+    index = np.arange(n_points)
+    result = evaluate(MIN_LEVEL, index)
+    for level in range(MIN_LEVEL + 1, max_level + 1):
+        if not index.size:
+            break
+        refined = evaluate(level, index)
+        converged = np.abs(refined - result[index]) <= tol * np.maximum(1, np.abs(refined))
+        result[index] = refined
+        index = index[~converged]
+    return result
+
+
+def _weighted_sum(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    # the nodes closest to the limits may hit integrable singularities, their weights are negligible
+    values = np.where(np.isfinite(values), values, 0)
+    return np.sum(values * weights, axis=-1)
+
+
+@lru_cache(maxsize=None)
+def _tanh_sinh_rule(level: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Nodes of the tanh-sinh rule on [0, 1] as distances to the closer limit, together with their weights.
+    """
+    h = 2.0 ** -level
+    t = np.arange(-3.5, 3.5 + h / 2, h)
+    u = np.pi / 2 * np.sinh(t)
+    # logistic(-2|u|) is the distance of the node to the closer limit
+    distance = 1 / (1 + np.exp(2 * np.abs(u)))
+    weights = h * np.pi * np.cosh(t) * distance * (1 - distance)
+    return _read_only(t), _read_only(distance), _read_only(weights)
+
+
+@lru_cache(maxsize=None)
+def _exp_sinh_rule(level: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Nodes and weights of the exp-sinh rule on [0, inf).
+    """
+    h = 2.0 ** -level
+    t = np.arange(-4.5, 4 + h / 2, h)
+    x = np.exp(np.pi / 2 * np.sinh(t))
+    weights = h * np.pi / 2 * np.cosh(t) * x
+    return _read_only(x), _read_only(weights)
+
+
+@lru_cache(maxsize=None)
+def _sinh_sinh_rule(level: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Nodes and weights of the sinh-sinh rule on (-inf, inf).
+    """
+    h = 2.0 ** -level
+    t = np.arange(-4, 4 + h / 2, h)
+    u = np.pi / 2 * np.sinh(t)
+    weights = h * np.pi / 2 * np.cosh(t) * np.cosh(u)
+    return _read_only(np.sinh(u)), _read_only(weights)
+
+
+@lru_cache(maxsize=None)
+def _ooura_rule(level: int, kernel: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Nodes and weights of Ooura and Mori's DE rule for the Fourier integrals over [0, inf) with ω = 1,
+    the nodes M φ(t_k) approach the zeros of the kernel double exponentially with M = π / h.
+    For other frequencies the nodes and the result are divided by ω.
+    """
+    if kernel not in ("cos", "sin"):
+        raise ValueError(f"Unknown Fourier kernel '{kernel}', use 'cos' or 'sin'.")
+
+    h = 2.0 ** -level
+    m = np.pi / h
+    beta = 0.25
+    alpha = beta / np.sqrt(1 + m * np.log(1 + m) / (4 * np.pi))
+
+    t_min = -np.log(40 / alpha)
+    t_max = np.log((40 + np.log(10 * m)) / beta)
+    # the nodes of the cosine kernel are shifted by h / 2 to approach the zeros of the cosine
+    shift = h / 2 if kernel == "cos" else 0
+    t = np.arange(np.floor(t_min / h), np.ceil(t_max / h) + 1) * h - shift
+
+    c = 2 + alpha + beta
+    with np.errstate(over="ignore", divide="ignore", invalid="ignore"):
+        g = -2 * t + alpha * np.expm1(-t) - beta * np.expm1(t)
+        dg = -2 - alpha * np.exp(-t) - beta * np.exp(t)
+        d = -np.expm1(g)
+        phi = np.where(t == 0, 1 / c, t / d)
+        dphi = np.where(t == 0, (alpha - beta + c ** 2) / (2 * c ** 2), 1 / d + t * dg / (4 * np.sinh(g / 2) ** 2))
+    phi, dphi = np.nan_to_num(phi), np.nan_to_num(dphi)
+
+    x = m * phi
+    weights = np.pi * (np.cos(x) if kernel == "cos" else np.sin(x)) * dphi
+    keep = x > 0
+    return _read_only(x[keep]), _read_only(weights[keep])
+
+
+@lru_cache(maxsize=None)
+def _ogata_rule(level: int, order: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Nodes and weights of Ogata's DE rule for the Hankel integrals over [0, inf) with ω = 1,
+    based on the zeros of J_ν. For other frequencies the nodes and the result are divided by ω.
+    """
+    if order != int(order) or order < 0:
+        raise ValueError("Ogata's rule is only available for non negative integer orders.")
+    order = int(order)
+
+    h = 2.0 ** -level
+    zeros = jn_zeros(order, int(np.ceil(4 / h)) + 1)
+    t = h * zeros / np.pi
+
+    psi = t * np.tanh(np.pi / 2 * np.sinh(t))
+    dpsi = (np.pi * t * np.cosh(t) + np.sinh(np.pi * np.sinh(t))) / (1 + np.cosh(np.pi * np.sinh(t)))
+    x = np.pi * psi / h
+    weights = np.pi * yv(order, zeros) / jv(order + 1, zeros) * jv(order, x) * dpsi
+    return _read_only(x), _read_only(weights)
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
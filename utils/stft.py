@@ -0,0 +1,139 @@
+"""
+Streaming short-time Fourier transform of signals that arrive in chunks, e.g. from sockets or large files.
+
+stft_frames() keeps only the last n_window - hop samples between chunks and yields the spectra of the frames
+as soon as they are complete. istft_overlap_add() reconstructs the signal incrementally by weighted overlap-add:
+every frame is transformed back, multiplied by the window again and added into a buffer of n_window samples,
+and the first hop samples are final and yielded, normalized by the sum of the squared windows that overlap them.
+So the memory of both is bounded by the window, not by the length of the signal.
+
+The signal is padded with n_window - hop zeros before and at least as many after it, so every sample is covered
+by the same number of frames and is reconstructed exactly for any window without zeros within the hop.
+"""
+from typing import Iterable, Iterator, Optional, Union
+
+import numpy as np
+import scipy.signal
+
+
+def stft_window(window: Union[str, np.ndarray], n_window: int) -> np.ndarray:
+    """
+    The periodic window of the given name, see scipy.signal.get_window, or the window itself if it is an array.
+    """
+    if isinstance(window, str):
+        return scipy.signal.get_window(window, n_window, fftbins=True)
+    window = np.asarray(window, dtype=np.float64)
+    if window.shape != (n_window,):
+        raise ValueError(f"The window must have n_window = {n_window} samples.")
+    return window
+
+
+def stft_frames(
+        chunks: Iterable[np.ndarray],
+        window: Union[str, np.ndarray] = "hann",
+        n_window: int = 256,
+        hop: Optional[int] = None,
+        real: bool = True
+) -> Iterator[np.ndarray]:
+    """
+    The short-time Fourier transform of a signal given in chunks of any length.
+
+    Parameters:
+    - chunks: The chunks of the signal, with the samples on the last axis and leading axes for channels.
+    - window: The analysis window, a name for scipy.signal.get_window or an array of n_window samples.
+    - n_window: The number of samples of a frame.
+    - hop: The number of samples between the starts of two frames, by default n_window // 4.
+    - real: Whether the signal is real, the frames are then transformed with rfft.
+
+    Returns:
+    - An iterator over the spectra of the frames, of shape (..., n_window // 2 + 1) with real else (..., n_window).
+    """
+    window = stft_window(window, n_window)
+    hop = hop or n_window // 4
+    if not 0 < hop <= n_window:
+        raise ValueError("The hop must be between 1 and n_window.")
+    transform = np.fft.rfft if real else np.fft.fft
+
+    buffer = None
+    for chunk in chunks:
+        chunk = np.asarray(chunk)
+        if buffer is None:
+            buffer = np.zeros(chunk.shape[:-1] + (n_window - hop,), dtype=np.result_type(chunk, np.float64))
+        buffer = np.concatenate((buffer, chunk), axis=-1)
+        n_frames = (buffer.shape[-1] - n_window) // hop + 1
+        if n_frames > 0:
+            # the complete frames of the chunk are transformed at once
+            frames = np.lib.stride_tricks.sliding_window_view(buffer, n_window, axis=-1)[..., :n_frames * hop:hop, :]
+            yield from np.moveaxis(transform(frames * window), -2, 0)
+            buffer = buffer[..., n_frames * hop:]
+
+    if buffer is not None and buffer.shape[-1]:
+        # zeros until the last sample is covered by as many frames as all others
+        n_signal = buffer.shape[-1] - (n_window - hop)
+        n_frames = -(-(n_signal + n_window - hop) // hop)
+        buffer = np.concatenate(
+            (buffer, np.zeros(buffer.shape[:-1] + ((n_frames - 1) * hop + n_window - buffer.shape[-1],))), axis=-1
+        )
+        frames = np.lib.stride_tricks.sliding_window_view(buffer, n_window, axis=-1)[..., ::hop, :]
+        yield from np.moveaxis(transform(frames * window), -2, 0)
+
+
+def istft_overlap_add(
+        spectra: Iterable[np.ndarray],
+        window: Union[str, np.ndarray] = "hann",
+        n_window: int = 256,
+        hop: Optional[int] = None,
+        real: bool = True,
+        length: Optional[int] = None
+) -> Iterator[np.ndarray]:
+    """
+    Reconstruct the signal from the spectra of stft_frames() incrementally by weighted overlap-add.
+
+    Parameters:
+    - spectra: The spectra of the frames, e.g. the iterator of stft_frames().
+    - window, n_window, hop, real: The parameters of stft_frames().
+    - length: The length of the signal, to drop the zero padding after its end.
+              Without it, up to n_window - 1 zeros are reconstructed after the end.
+
+    Returns:
+    - An iterator over chunks of the signal, hop samples per frame.
+    """
+    window = stft_window(window, n_window)
+    hop = hop or n_window // 4
+    if not 0 < hop <= n_window:
+        raise ValueError("The hop must be between 1 and n_window.")
+    inverse = (lambda spectrum: np.fft.irfft(spectrum, n=n_window)) if real else np.fft.ifft
+    squared_window = window ** 2
+
+    buffer = None
+    # the sum of the squared windows over the buffer, which becomes periodic after the first frames
+    normalization = np.zeros(n_window)
+    # the zero padding before the signal and the samples that are still to be yielded
+    n_skip = n_window - hop
+    n_remaining = np.inf if length is None else length
+
+    def pop(n_samples: int) -> np.ndarray:
+        nonlocal buffer, normalization, n_skip, n_remaining
+        samples = buffer[..., :n_samples] / np.where(normalization[:n_samples] > 0, normalization[:n_samples], 1)
+        buffer = np.concatenate((buffer[..., n_samples:], np.zeros_like(buffer[..., :n_samples])), axis=-1)
+        normalization = np.concatenate((normalization[n_samples:], np.zeros(n_samples)))
+        skipped = min(n_skip, n_samples)
+        n_skip -= skipped
+        samples = samples[..., skipped:skipped + int(min(n_samples - skipped, n_remaining))]
+        n_remaining -= samples.shape[-1]
+        return samples
+
+    for spectrum in spectra:
+        frame = inverse(np.asarray(spectrum)) * window
+        if buffer is None:
+            buffer = np.zeros(frame.shape, dtype=frame.dtype)
+        buffer += frame
+        normalization += squared_window
+        chunk = pop(hop)
+        if chunk.shape[-1]:
+            yield chunk
+
+    if buffer is not None:
+        chunk = pop(n_window)
+        if chunk.shape[-1]:
+            yield chunk
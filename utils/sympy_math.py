@@ -1,4 +1,5 @@
-from typing import Any, Iterable, Sequence, Mapping, Callable
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Sequence, Mapping, Callable, Union
 
 import numpy as np
 from mpmath import almosteq
@@ -7,6 +8,7 @@ import sympy as sp
 from z3 import Solver, unsat
 
 from utils.consts import ZERO
+from utils.quadrature import integrate, integrate_fourier, integrate_hankel
 from utils.util import apply_to_leaves
 
 
@@ -16,11 +18,21 @@ def to_number(number: Any) -> sp.Number:
     return sp.N(number)
 
 
+def array_to_number(values: np.ndarray) -> np.ndarray:
+    """
+    to_number() for arrays, numeric arrays are numbers already and object arrays are converted element by element.
+    """
+    if values.dtype != object:
+        return values
+    return np.frompyfunc(to_number, 1, 1)(values)
+
+
 def apply_to_number_to_leaves(
         values: Iterable,
-        on_exception: Callable[[Iterable, Exception], Any] = None
+        on_exception: Callable[[Iterable, Exception], Any] = None,
+        in_place: bool = True
 ) -> Any:
-    return apply_to_leaves(values, to_number, on_exception)
+    return apply_to_leaves(values, to_number, on_exception, array_func=array_to_number, in_place=in_place)
 
 
 def apply_to_number_to_leaves_safely(values: Iterable):
@@ -46,6 +58,48 @@ def generate_deltas_for_summation(values: Sequence):
     return deltas
 
 
+def generate_quadrature_weights(values: Sequence, rule: str = "rectangle") -> np.ndarray:
+    """
+    Generate the weights to approximate an integral over the given points by a weighted sum.
+
+    Parameters:
+    - values: The (ascending) points the integrand is sampled at, e.g. time points.
+    - rule: "rectangle" uses the deltas of generate_deltas_for_summation() directly,
+            "trapezoid" and "simpson" use the composite rules on the (possibly non-uniform) grid.
+            For simpson with an odd number of intervals, the last interval is handled by the trapezoid rule.
+
+    Returns:
+    - A float64 array of weights with the same length as values.
+    """
+    if len(values) < 2:
+        raise ValueError("At least two points are needed to generate quadrature weights.")
+
+    deltas = np.asarray(generate_deltas_for_summation(values), dtype=np.float64)
+    if rule == "rectangle":
+        return deltas
+
+    # drop the appended average delta, the composite rules only use the real intervals
+    h = deltas[:-1]
+    weights = np.zeros(len(values), dtype=np.float64)
+    if rule == "trapezoid":
+        weights[:-1] += h / 2
+        weights[1:] += h / 2
+        return weights
+
+    if rule == "simpson":
+        n_pairs = len(h) // 2
+        h0, h1 = h[0:2 * n_pairs:2], h[1:2 * n_pairs:2]
+        # Simpson's rule for irregularly spaced data, applied on each pair of intervals
+        weights[0:2 * n_pairs:2] += (h0 + h1) / 6 * (2 - h1 / h0)
+        weights[1:2 * n_pairs:2] += (h0 + h1) ** 3 / (6 * h0 * h1)
+        weights[2:2 * n_pairs + 1:2] += (h0 + h1) / 6 * (2 - h0 / h1)
+        if len(h) % 2:
+            weights[-2:] += h[-1] / 2
+        return weights
+
+    raise ValueError(f"Unknown quadrature rule '{rule}', use 'rectangle', 'trapezoid' or 'simpson'.")
+
+
 def almost_equal_to_decimal_places(a, b, dps_tol=None):
     rel_eps = 10**(-dps_tol) if dps_tol else None
     return almosteq(a, b, rel_eps=rel_eps)
@@ -54,8 +108,12 @@ def almost_equal_to_decimal_places(a, b, dps_tol=None):
 def deep_almost_equal(a, b, dps_tol=None):
     """
     Recursively checks if two data structures are almost equal.
+    Numeric arrays are compared at once with the tolerance of almost_equal_to_decimal_places().
     """
 
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        return _arrays_almost_equal(np.asarray(a), np.asarray(b), dps_tol=dps_tol)
+
     if isinstance(a, Iterable):
         assert type(a) is type(b), "The nested structure must be of equal types in depth"
         if isinstance(a, Mapping):
@@ -70,21 +128,194 @@ def deep_almost_equal(a, b, dps_tol=None):
     return almost_equal_to_decimal_places(a, b, dps_tol=dps_tol)
 
 
+def _arrays_almost_equal(a: np.ndarray, b: np.ndarray, dps_tol=None) -> bool:
+    if a.shape != b.shape:
+        return False
+    if a.dtype == object or b.dtype == object:
+        # e.g. SymPy numbers, compared one by one
+        return all(deep_almost_equal(c, d, dps_tol=dps_tol) for c, d in zip(a.flat, b.flat))
+    # the tolerances of mpmath.almosteq: relative or absolute, by default 2 ** -49 for double precision
+    eps = 10.0 ** (-dps_tol) if dps_tol else 2.0 ** -49
+    difference = np.abs(a - b)
+    return bool(np.all((difference <= eps) | (difference <= eps * np.maximum(np.abs(a), np.abs(b)))))
+
+
 def subs_zero(func):
     return func.subs({ZERO: 0})
 
 
+# the random points, the points confirmed with mpmath and its precision of the numeric probe of functions_are_equal()
+PROBE_POINTS = 64
+PROBE_CONFIRMATIONS = 2
+PROBE_DPS = 30
+
+# the random points of funcs_are_equal_number_test(), and of its evaluation with mpmath if lambdify fails
+NUMBER_TEST_POINTS = 256
+NUMBER_TEST_MPMATH_POINTS = 2
+
+# functions that are only defined or compiled for real arguments, their symbols are probed on the real line
+REAL_FUNCTIONS = (
+    sp.Heaviside, sp.Abs, sp.sign, sp.re, sp.im, sp.arg, sp.floor, sp.ceiling,
+    sp.Piecewise, sp.Max, sp.Min, sp.KroneckerDelta, sp.DiracDelta,
+)
+
+# expressions the probe can not evaluate reliably, e.g. DiracDelta vanishes at all random points
+UNPROBED_TYPES = (
+    sp.Integral, sp.Sum, sp.Product, sp.Limit, sp.Derivative, sp.DiracDelta, sp.core.function.AppliedUndef,
+)
+
+
 def functions_are_equal(f1, f2):
+    """
+    Check if two functions are equal with checks of increasing cost, the verdicts are memoized per pair:
+    1. structural equality,
+    2. the numeric probe at many random points, see funcs_are_equal_probe(), which settles most pairs,
+    3. simplify, Eq and equals, see funcs_are_equal_sympy(),
+    4. z3, see funcs_are_equal_z3(),
+    5. the random point test, see funcs_are_equal_number_test().
+    """
+    try:
+        return _functions_are_equal(f1, f2)
+    except TypeError:
+        # unhashable functions are not memoized
+        return _functions_are_equal.__wrapped__(f1, f2)
+
+
+@lru_cache(maxsize=4096)
+def _functions_are_equal(f1, f2):
+    if f1 == f2:
+        return True
+    verdict = funcs_are_equal_probe(f1, f2)
+    if verdict is not None:
+        return verdict
     if funcs_are_equal_sympy(f1, f2):
         return True
     elif funcs_are_equal_z3(f1, f2):
         return True
-    if funcs_are_equal_number_test(f1, f2):
+    # a fixed seed, so the memoized verdict is reproducible
+    if funcs_are_equal_number_test(f1, f2, seed=0):
         return True
     else:
         return False
 
 
+def funcs_are_equal_probe(
+        f1, f2, n_points=PROBE_POINTS, tolerance=1e-9, seed=0, sampler: Callable = None
+) -> Optional[bool]:
+    """
+    Compare two SymPy expressions at many random points at once with lambdify, see random_points() for the points.
+    Points where the compiled functions disagree are evaluated again
+    with mpmath at PROBE_DPS digits, so a difference caused by the rounding of floats does not count,
+    and an agreement is confirmed in the same way at PROBE_CONFIRMATIONS points.
+
+    Parameters:
+    - f1, f2: The SymPy expressions to compare.
+    - n_points: The number of random points.
+    - tolerance: The tolerance, absolute for values up to 1 and relative above.
+    - seed: The seed of the random points, so the verdicts are reproducible.
+    - sampler: The distribution of the points, a callable like random_points(), which is the default.
+
+    Returns:
+    - True if the functions agree, False if they differ at a confirmed point,
+      None if the probe is inconclusive, e.g. if they can not be compiled or are not finite at most points.
+    """
+    if not (isinstance(f1, Expr) and isinstance(f2, Expr)) or f1.has(*UNPROBED_TYPES) or f2.has(*UNPROBED_TYPES):
+        return None
+    symbols = sorted(f1.free_symbols | f2.free_symbols, key=sp.default_sort_key)
+    real = f1.has(*REAL_FUNCTIONS) or f2.has(*REAL_FUNCTIONS)
+    rng = np.random.default_rng(seed)
+    sampler = sampler or random_points
+    points = {symbol: np.asarray(sampler(symbol, n_points, rng, real=real)) for symbol in symbols}
+
+    try:
+        with np.errstate(all="ignore"):
+            values1, values2 = (
+                np.broadcast_to(_compile_probe(f, tuple(symbols))(*points.values()), n_points).astype(np.complex128)
+                for f in (f1, f2)
+            )
+    except Exception:
+        return None
+
+    finite = np.isfinite(values1) & np.isfinite(values2)
+    if np.count_nonzero(finite) < n_points // 2:
+        return None
+    difference = np.abs(values1 - values2)
+    scale = np.maximum(1, np.maximum(np.abs(values1), np.abs(values2)))
+    mismatches = np.flatnonzero(finite & (difference > tolerance * scale))
+    confirmations = np.flatnonzero(finite & (difference <= tolerance * scale))[:PROBE_CONFIRMATIONS]
+
+    for index in (*mismatches, *confirmations):
+        subs = {symbol: sp.sympify(values[index].item()) for symbol, values in points.items()}
+        equal = _almost_equal_with_mpmath(f1, f2, subs, tolerance)
+        if equal is None:
+            return None
+        if not equal:
+            return False
+    return True
+
+
+def random_points(
+        symbol: sp.Symbol,
+        n_points: int,
+        rng: np.random.Generator,
+        real: bool = False,
+        magnitudes: tuple = (0.1, 5),
+        cut_margin: float = 0.1
+) -> np.ndarray:
+    """
+    Random points for a symbol within its assumptions, e.g. positive or integer, and complex otherwise.
+    They keep away from 0, where most poles and branch points are, from the branch cuts of log, sqrt and
+    powers along the negative real axis and from large magnitudes, where the functions overflow.
+
+    Parameters:
+    - symbol: The symbol.
+    - n_points: The number of points.
+    - rng: The random generator.
+    - real: Whether the points must be real, e.g. for REAL_FUNCTIONS.
+    - magnitudes: The range of the absolute values of the points.
+    - cut_margin: The minimum angle of complex points from the negative real axis.
+
+    Returns:
+    - The points, integers for integer symbols.
+    """
+    if symbol.is_integer:
+        low = 1 if symbol.is_positive else 0 if symbol.is_nonnegative else -10
+        return rng.integers(low, 11, n_points)
+    values = rng.uniform(*magnitudes, n_points)
+    if symbol.is_nonnegative:
+        return values
+    if symbol.is_nonpositive:
+        return -values
+    if real or symbol.is_real:
+        return rng.choice([-1, 1], n_points) * values
+    return values * np.exp(1j * rng.uniform(-np.pi + cut_margin, np.pi - cut_margin, n_points))
+
+
+@lru_cache(maxsize=256)
+def _compile_probe(function: Expr, symbols: tuple) -> Callable:
+    return lambdify_numeric(function, symbols, modules=["scipy", "numpy"])
+
+
+def _almost_equal_with_mpmath(f1, f2, subs: Dict[sp.Symbol, sp.Number], tolerance: float) -> Optional[bool]:
+    # None if the functions do not evaluate to finite numbers
+    try:
+        value1, value2 = (_evaluate_with_mpmath(f, subs) for f in (f1, f2))
+        difference, value1, value2 = (abs(complex(value)) for value in (value1 - value2, value1, value2))
+    except (TypeError, ValueError):
+        return None
+    if not np.all(np.isfinite([value1, value2, difference])):
+        return None
+    return difference <= tolerance * max(1, value1, value2)
+
+
+def _evaluate_with_mpmath(function: Expr, subs: Dict[sp.Symbol, sp.Number]) -> Expr:
+    value = subs_zero(function).subs(subs).evalf(PROBE_DPS)
+    # the round trip through str turns Floats without significant digits, e.g. 0.e+104 from the quadrature
+    # of an oscillating integrand, into zeros
+    real, imaginary = value.as_real_imag()
+    return sp.Float(str(real), PROBE_DPS) + sp.I * sp.Float(str(imaginary), PROBE_DPS)
+
+
 def funcs_are_equal_z3(f1, f2):
     solver = Solver()
     solver.add(f1 != f2)
@@ -130,66 +361,301 @@ def funcs_are_equal_sympy(f1, f2):
     return False
 
 
-def funcs_are_equal_number_test(expr1, expr2, num_tests=1, tolerance=1e-9, retry=0):
+def funcs_are_equal_number_test(expr1, expr2, num_tests=NUMBER_TEST_POINTS, tolerance=1e-9, seed=None, sampler=None):
     """
-    Test if two SymPy expressions are equivalent by substituting random values
-    and evaluating numerically using evalf.
+    Test if two SymPy expressions are equivalent at random points.
+    All points are evaluated at once with lambdify and only the points where the expressions disagree are
+    evaluated again with mpmath, see funcs_are_equal_probe(), so more points hardly cost more time.
+    Expressions that can not be compiled are evaluated with mpmath at NUMBER_TEST_MPMATH_POINTS points.
 
     Parameters:
     - expr1, expr2: SymPy expressions to compare.
     - num_tests: Number of random test points to evaluate.
-    - tolerance: Numeric tolerance for comparing floating-point results.
+    - tolerance: Numeric tolerance, absolute for values up to 1 and relative above.
+    - seed: The seed of the random points, by default fresh points at every call.
+    - sampler: The distribution of the points, see random_points().
 
     Returns:
     - True if the functions are equivalent within the test range, False otherwise.
     """
-    # Dynamically find the symbols in the expressions
-    symbols_set1 = expr1.free_symbols
-    symbols_set2 = expr2.free_symbols
-    symbols_set = symbols_set1 | symbols_set2
+    expr1, expr2 = sp.sympify(expr1), sp.sympify(expr2)
+    verdict = funcs_are_equal_probe(expr1, expr2, n_points=num_tests, tolerance=tolerance, seed=seed, sampler=sampler)
+    if verdict is not None:
+        return verdict
+
+    symbols = expr1.free_symbols | expr2.free_symbols
+    real = expr1.has(*REAL_FUNCTIONS) or expr2.has(*REAL_FUNCTIONS)
+    rng = np.random.default_rng(seed)
+    sampler = sampler or random_points
+    n_evaluated = 0
+    for _ in range(NUMBER_TEST_MPMATH_POINTS):
+        subs = {symbol: sp.sympify(np.asarray(sampler(symbol, 1, rng, real=real))[0].item()) for symbol in symbols}
+        equal = _almost_equal_with_mpmath(expr1, expr2, subs, tolerance)
+        if equal is False:
+            return False
+        n_evaluated += equal is not None
+    # equal where both could be evaluated, e.g. not at poles
+    return n_evaluated > 0
 
-    # Generate random test points and evaluate
-    for _ in range(num_tests):
-        # Generate random values for each symbol in [-10, 10]
-        test_values = {sym: np.random.randint(-10, 10) for sym in symbols_set}
-        test_values_1 = {sym: val for sym, val in test_values.items() if sym in symbols_set1}
-        test_values_2 = {sym: val for sym, val in test_values.items() if sym in symbols_set2}
 
-        # Evaluate the expressions using evalf
-        val1 = expr1.subs(test_values_1).evalf()
-        val2 = expr2.subs(test_values_2).evalf()
+def evaluate_function(function: Expr, subs: dict, **kwargs) -> sp.N:
+    subs[ZERO] = 0
+    evaluated = function.subs(subs).evalf(**kwargs)
+    evaluated = to_number(evaluated)
+    return evaluated
 
-        if val1 == val2:
-            continue
 
-        if isinstance(val1, float) or isinstance(val2, float):
-            if np.isnan(float(val1)) or np.isnan(float(val2)):
-                if retry < 5:
-                    return funcs_are_equal_number_test(expr1, expr2, retry=retry+1)
+def _numeric_dirac_delta(x, *_):
+    """
+    Numeric counterpart of DiracDelta (and its derivatives), infinite at zero and zero elsewhere.
+    """
+    return np.where(np.equal(x, 0), np.inf, 0.0)
 
-        # the following is done to convert any special notations like mantissa to comparable floats again
-        val1_r, val1_i = val1.as_real_imag()
-        val2_r, val2_i = val2.as_real_imag()
 
-        val1_r, val1_i = sp.Float(str(val1_r)), sp.Float(str(val1_i))
-        val2_r, val2_i = sp.Float(str(val2_r)), sp.Float(str(val2_i))
+NUMERIC_FUNCTIONS = {
+    "DiracDelta": _numeric_dirac_delta,
+}
 
-        val1 = val1_r + val1_i * sp.I
-        val2 = val2_r + val2_i * sp.I
 
-        # Compare results
-        if not almosteq(val1, val2, abs_eps=tolerance):
-            return False
+def lambdify_numeric(
+        function: Expr,
+        symbols: Sequence[sp.Symbol],
+        modules: Union[str, Sequence] = "numpy"
+) -> Callable:
+    """
+    Compile a SymPy expression into a vectorized numeric function with lambdify.
+    Piecewise and Heaviside are handled by the NumPy printer, DiracDelta by NUMERIC_FUNCTIONS,
+    unevaluated integrals by NumericIntegral and unevaluated sums by NumericSum.
 
-    # All tests passed
-    return True
+    Parameters:
+    - function: The expression to compile, ZERO is replaced by 0.
+    - symbols: The symbols in the order of the positional arguments of the compiled function.
+               They can also be passed as keyword arguments by their names.
+    - modules: The lambdify modules, e.g. "numpy" or "numexpr" if installed.
 
+    Returns:
+    - The compiled function, its result always has the broadcast shape of its arguments.
+    """
+    numeric_integrals = {}
+    function = _replace_integrals(subs_zero(function), numeric_integrals)
+    modules = [modules] if isinstance(modules, (str, dict)) else list(modules)
+    compiled = sp.lambdify(symbols, function, modules=[numeric_integrals, NUMERIC_FUNCTIONS, *modules])
 
-def evaluate_function(function: Expr, subs: dict, **kwargs) -> sp.N:
-    subs[ZERO] = 0
-    evaluated = function.subs(subs).evalf(**kwargs)
-    evaluated = to_number(evaluated)
-    return evaluated
+    def numeric_function(*args, **kwargs):
+        result = compiled(*args, **kwargs)
+        shape = np.broadcast_shapes(*(np.shape(arg) for arg in (*args, *kwargs.values())))
+        if np.shape(result) != shape:
+            # expressions that do not depend on all arguments, e.g. constants, are not broadcast by lambdify
+            result = np.broadcast_to(result, shape).copy()
+        return result
+
+    numeric_function.__doc__ = compiled.__doc__
+    return numeric_function
+
+
+def _replace_integrals(expr: sp.Basic, numeric_integrals: dict) -> sp.Basic:
+    """
+    Replaces the outermost Integrals and Sums by calls of undefined functions of their free symbols,
+    which are implemented by the NumericIntegrals and NumericSums added to numeric_integrals.
+    """
+    if isinstance(expr, (sp.Integral, sp.Sum)):
+        symbols = sorted(expr.free_symbols, key=str)
+        name = f"_numeric_integral_{len(numeric_integrals)}"
+        numeric_integrals[name] = (NumericIntegral if isinstance(expr, sp.Integral) else NumericSum)(expr, symbols)
+        return sp.Function(name)(*symbols)
+    if not expr.args or not expr.has(sp.Integral, sp.Sum):
+        return expr
+    return expr.func(*[_replace_integrals(arg, numeric_integrals) for arg in expr.args])
+
+
+class NumericIntegral:
+
+    """
+    Vectorized numeric evaluation of a definite integral as a function of its free symbols,
+    e.g. of the unevaluated integrals of transforms that SymPy could not solve.
+
+    Oscillatory integrands are recognized by their kernel and integrated with the rules of utils.quadrature:
+    - exp(I * ω * x) over [0, oo) or (-oo, oo) with Ooura and Mori's rule for Fourier integrals,
+    - besselj(ν, ω * x) over [0, oo) with Ogata's rule for Hankel integrals,
+    and everything else with the tanh-sinh, exp-sinh and sinh-sinh rules.
+    Integrals over multiple variables are evaluated as nested integrals.
+    """
+
+    # SciPy provides the special functions, e.g. besselj, that are typical for integrands of transforms
+    modules = ["scipy", "numpy"]
+
+    def __init__(self, integral: sp.Integral, symbols: Sequence[sp.Symbol], tol: float = 1e-10):
+        """
+        Parameters:
+        - integral: The definite integral.
+        - symbols: The free symbols of the integral, in the order of the arguments of __call__().
+        - tol: The relative tolerance of the quadrature.
+        """
+        function = integral.function
+        for limit in integral.limits[:-1]:
+            function = sp.Integral(function, limit)
+        if len(integral.limits[-1]) != 3:
+            raise ValueError("Only definite integrals can be evaluated numerically.")
+        x, lower, upper = integral.limits[-1]
+
+        self.symbols = tuple(symbols)
+        self.tol = tol
+        self._lower = lambdify_numeric(lower, self.symbols, self.modules)
+        self._upper = lambdify_numeric(upper, self.symbols, self.modules)
+        self._integrand = lambdify_numeric(function, (x, *self.symbols), self.modules)
+
+        self._kernel = None
+        kernel = self._oscillatory_kernel(function, x)
+        if kernel is not None:
+            kind, frequency, order, remainder = kernel
+            if (kind == "fourier" and (lower, upper) in ((0, sp.oo), (-sp.oo, sp.oo))) or \
+                    (kind == "hankel" and (lower, upper) == (0, sp.oo)):
+                self._kernel = (
+                    kind,
+                    lambdify_numeric(frequency, self.symbols, self.modules),
+                    order,
+                    lambdify_numeric(remainder, (x, *self.symbols), self.modules),
+                    lower == -sp.oo
+                )
+
+    @staticmethod
+    def _oscillatory_kernel(function: sp.Expr, x: sp.Symbol):
+        """
+        Finds a factor exp(I * ω * x + ...) or besselj(ν, ω * x) of the integrand.
+
+        Returns:
+        - None or a tuple of the kind ("fourier" or "hankel"), the frequency ω, the order ν
+          and the remaining integrand.
+        """
+        for factor in sp.Mul.make_args(function):
+            if isinstance(factor, sp.exp):
+                exponent = sp.expand(factor.exp)
+                frequency = sp.Add(*(
+                    term.as_coefficient(sp.I) for term in sp.Add.make_args(exponent.coeff(x, 1))
+                    if term.as_coefficient(sp.I) is not None
+                ))
+                if frequency != 0 and not frequency.has(x):
+                    remainder = function / factor * sp.exp(exponent - sp.I * frequency * x)
+                    return "fourier", frequency, None, remainder
+            elif isinstance(factor, sp.besselj):
+                order, argument = factor.args
+                frequency = sp.cancel(argument / x)
+                if order.is_Integer and order >= 0 and frequency != 0 and not frequency.has(x):
+                    return "hankel", frequency, int(order), function / factor
+        return None
+
+    def __call__(self, *args) -> np.ndarray:
+        args = np.broadcast_arrays(*(np.asarray(arg) for arg in args))
+        shape = args[0].shape if args else ()
+        points = [np.ravel(arg) for arg in args]
+        n_points = points[0].size if points else 1
+
+        def outer(index):
+            return tuple(point[index, np.newaxis] for point in points)
+
+        result = np.zeros(n_points, dtype=np.complex128)
+        remaining = np.arange(n_points)
+
+        if self._kernel is not None:
+            kind, frequency, order, remainder, infinite = self._kernel
+            frequency = np.broadcast_to(frequency(*points), (n_points,))
+            oscillating = (np.imag(frequency) == 0) & (frequency != 0) & np.isfinite(frequency)
+            index, remaining = remaining[oscillating], remaining[~oscillating]
+            omega = np.abs(np.real(frequency[index]))
+            sign = np.sign(np.real(frequency[index]))
+
+            if kind == "fourier":
+                def even(x, i):
+                    return remainder(x, *outer(index[i])) + (remainder(-x, *outer(index[i])) if infinite else 0)
+
+                def odd(x, i):
+                    return remainder(x, *outer(index[i])) - (remainder(-x, *outer(index[i])) if infinite else 0)
+
+                result[index] = integrate_fourier(even, omega, "cos", tol=self.tol) + \
+                    1j * sign * integrate_fourier(odd, omega, "sin", tol=self.tol)
+            else:
+                result[index] = sign ** order * integrate_hankel(
+                    lambda x, i: remainder(x, *outer(index[i])), omega, order, tol=self.tol
+                )
+
+        if remaining.size:
+            lower = np.broadcast_to(self._lower(*points), (n_points,))[remaining]
+            upper = np.broadcast_to(self._upper(*points), (n_points,))[remaining]
+            result[remaining] = integrate(
+                lambda x, i: self._integrand(x, *outer(remaining[i])), np.real(lower), np.real(upper), tol=self.tol
+            )
+
+        result = result.reshape(shape)
+        return result if np.any(result.imag) else result.real
+
+
+class NumericSum:
+
+    """
+    Vectorized numeric evaluation of a sum over an integer variable as a function of its free symbols,
+    e.g. of the unevaluated series of the Z-transform.
+
+    The terms are summed in blocks for all outer points at once. An infinite series of a point is converged
+    when a block no longer changes its partial sum within the tolerance, which suits the geometrically
+    decaying terms of power series inside their region of convergence. Points whose series did not converge
+    within max_terms terms, e.g. outside the region of convergence, are NaN.
+    Sums over multiple variables are evaluated as nested sums.
+    """
+
+    modules = ["scipy", "numpy"]
+    block_size = 256
+
+    def __init__(self, summation: sp.Sum, symbols: Sequence[sp.Symbol], tol: float = 1e-12, max_terms: int = 2 ** 16):
+        """
+        Parameters:
+        - summation: The sum, its limits must be integers, the upper one may be oo.
+        - symbols: The free symbols of the sum, in the order of the arguments of __call__().
+        - tol: The relative tolerance of the partial sums at which an infinite series is converged.
+        - max_terms: The maximum number of terms of an infinite series.
+        """
+        function = summation.function
+        for limit in summation.limits[:-1]:
+            function = sp.Sum(function, limit)
+        n, lower, upper = summation.limits[-1]
+        if not (lower.is_Integer and (upper.is_Integer or upper == sp.oo)):
+            raise ValueError("Only sums with integer limits can be evaluated numerically.")
+
+        self.symbols = tuple(symbols)
+        self.tol = tol
+        self.max_terms = max_terms
+        self._lower = int(lower)
+        self._upper = np.inf if upper == sp.oo else int(upper)
+        self._summand = lambdify_numeric(function, (n, *self.symbols), self.modules)
+
+    def __call__(self, *args) -> np.ndarray:
+        args = np.broadcast_arrays(*(np.asarray(arg) for arg in args))
+        shape = args[0].shape if args else ()
+        points = [np.ravel(arg) for arg in args]
+        n_points = points[0].size if points else 1
+
+        result = np.zeros(n_points, dtype=np.complex128)
+        remaining = np.arange(n_points)
+        infinite = np.isinf(self._upper)
+        start = self._lower
+        while remaining.size and start <= self._upper and (not infinite or start - self._lower < self.max_terms):
+            stop = min(start + self.block_size, self._upper + 1)
+            # float indices, as integer arrays can not be raised to negative powers
+            n = np.arange(start, stop, dtype=np.float64)[:, np.newaxis]
+            with np.errstate(over="ignore", invalid="ignore"):
+                # the terms of divergent series overflow, their points become NaN
+                block = np.sum(self._summand(n, *(point[np.newaxis, remaining] for point in points)), axis=0)
+            result[remaining] += block
+            if infinite:
+                finite = np.isfinite(result[remaining])
+                result[remaining[~finite]] = np.nan
+                converged = np.abs(block) <= self.tol * np.abs(result[remaining])
+                remaining = remaining[finite & ~converged]
+            start = stop
+        if infinite:
+            result[remaining] = np.nan
+
+        result = result.reshape(shape)
+        return result if np.any(result.imag) else result.real
 
 
 def replace_unevaled_integrals_with_forms(expr: sp.Expr):
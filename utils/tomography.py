@@ -0,0 +1,701 @@
+"""
+Reconstruction engines for the inverse Radon transform of sinogram stacks.
+
+The geometry and the filters follow skimage.transform.iradon, so the results agree with it,
+but everything that only depends on the geometry is computed once and cached:
+- the Fourier filter per (padded size, filter),
+- the back-projection tables of detector indices and interpolation weights per
+  (number of detector bins, angles, output size, circle).
+Stacks of sinograms of shape (n_slices, n_detector_bins, n_angles) are filtered with one batched FFT
+and back-projected for all slices at once by a pool of threads, each working on a block of pixels.
+
+For iterative reconstruction the Radon transform is represented explicitly by RadonOperator, a sparse CSR system
+matrix with the same geometry, which can be saved and memory-mapped. The solvers sirt(), sart() and cgls()
+only need sparse matrix products with it per iteration.
+
+The Fourier slice engines fourier_slice_projection() and fourier_slice_reconstruction() use that the 1D Fourier
+transform of a projection is a central slice of the 2D Fourier transform of the image, and resample between the
+polar and the Cartesian frequency grid with cubic splines, in O(N^2 log N) instead of O(N^3) for N angles.
+"""
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+import scipy.fft
+import scipy.sparse
+from scipy.ndimage import map_coordinates, spline_filter
+
+
+FBP_FILTERS = ("ramp", "shepp-logan", "cosine", "hamming", "hann", None)
+
+# the number of values (pixels times slices) a thread back-projects at once
+BLOCK_SIZE = 2 ** 16
+
+# the zero padding of the Fourier slice engines, which makes the spline interpolation of the spectra accurate
+FOURIER_SLICE_OVERSAMPLING = 2
+
+
+def filtered_back_projection(
+        sinograms: np.ndarray,
+        angles: np.ndarray,
+        filter_name: Optional[str] = "ramp",
+        circle: bool = True,
+        output_size: Optional[int] = None,
+        workers: Optional[int] = None
+) -> np.ndarray:
+    """
+    Reconstruct a stack of images from their sinograms by filtered back-projection with linear interpolation.
+
+    Parameters:
+    - sinograms: The sinograms of shape (n_slices, n_detector_bins, n_angles).
+    - angles: The projection angles in degrees.
+    - filter_name: The filter of the projections, one of FBP_FILTERS.
+    - circle: Whether the images are zero outside the inscribed circle, like in skimage.transform.radon.
+    - output_size: The number of rows and columns of the images, by default like skimage.transform.iradon.
+    - workers: The number of threads, by default the number of CPUs.
+
+    Returns:
+    - The reconstructed images of shape (n_slices, output_size, output_size).
+    """
+    sinograms = np.asarray(sinograms, dtype=np.result_type(sinograms, np.float32))
+    if sinograms.ndim != 3:
+        raise ValueError("The sinograms must be a 3D array of shape (n_slices, n_detector_bins, n_angles).")
+    angles = np.asarray(angles, dtype=np.float64)
+    if angles.shape != sinograms.shape[2:]:
+        raise ValueError("The number of angles does not match the number of projections of the sinograms.")
+    if filter_name not in FBP_FILTERS:
+        raise ValueError(f"Unknown filter '{filter_name}', use one of {FBP_FILTERS}.")
+
+    n_detector_bins = sinograms.shape[1]
+    if output_size is None:
+        output_size = default_output_size(n_detector_bins, circle)
+    workers = workers or os.cpu_count() or 1
+
+    if circle:
+        sinograms = _sinogram_circle_to_square(sinograms)
+    filtered = _filter_projections(sinograms, filter_name, workers)
+
+    indices, weights = _back_projection_table(filtered.shape[1], angles.tobytes(), output_size, circle)
+    # a zero detector bin on both sides takes the samples outside of the detector,
+    # the slices are moved to the last axis, so every gathered detector bin is a contiguous row of all slices
+    filtered = np.pad(filtered, ((0, 0), (1, 1), (0, 0)))
+    filtered = np.ascontiguousarray(filtered.transpose(2, 1, 0))
+
+    n_pixels = output_size * output_size
+    images = np.zeros((n_pixels, sinograms.shape[0]), dtype=filtered.dtype)
+    # the blocks are small enough to keep the temporaries of the interpolation in the cache
+    n_blocks = max(workers, -(-n_pixels * sinograms.shape[0] // BLOCK_SIZE))
+    blocks = np.array_split(np.arange(n_pixels), min(n_blocks, n_pixels))
+
+    def back_project(block: np.ndarray):
+        # every thread works on its own block of pixels, so the accumulation needs no locks
+        block = slice(block[0], block[-1] + 1)
+        for angle in range(angles.size):
+            left = filtered[angle, indices[angle, block]]
+            right = filtered[angle, indices[angle, block] + 1]
+            right -= left
+            right *= weights[angle, block, np.newaxis]
+            right += left
+            images[block] += right
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(blocks))) as executor:
+        # list() propagates the exceptions of the threads
+        list(executor.map(back_project, blocks))
+
+    images *= np.pi / (2 * angles.size)
+    return np.ascontiguousarray(images.T).reshape(-1, output_size, output_size)
+
+
+def default_detector_bins(image_size: int, circle: bool) -> int:
+    """
+    The number of detector bins of skimage.transform.radon, the image size with circle and its diagonal otherwise.
+    """
+    return image_size if circle else int(np.ceil(np.sqrt(2) * image_size))
+
+
+def default_output_size(n_detector_bins: int, circle: bool) -> int:
+    """
+    The image size of skimage.transform.iradon, the inverse of default_detector_bins().
+    """
+    return n_detector_bins if circle else int(np.floor(np.sqrt(n_detector_bins ** 2 / 2)))
+
+
+def _sinogram_circle_to_square(sinograms: np.ndarray) -> np.ndarray:
+    # pads the detector axis to the diagonal of the image, like skimage.transform.iradon
+    n_detector_bins = sinograms.shape[1]
+    diagonal = int(np.ceil(np.sqrt(2) * n_detector_bins))
+    pad_before = diagonal // 2 - n_detector_bins // 2
+    return np.pad(sinograms, ((0, 0), (pad_before, diagonal - n_detector_bins - pad_before), (0, 0)))
+
+
+def _filter_projections(sinograms: np.ndarray, filter_name: Optional[str], workers: int) -> np.ndarray:
+    n_detector_bins = sinograms.shape[1]
+    padded_size = max(64, int(2 ** np.ceil(np.log2(2 * n_detector_bins))))
+    spectrum = scipy.fft.fft(sinograms, n=padded_size, axis=1, workers=workers)
+    spectrum *= fourier_filter(padded_size, filter_name)[:, np.newaxis]
+    return np.real(scipy.fft.ifft(spectrum, axis=1, workers=workers)[:, :n_detector_bins])
+
+
+@lru_cache(maxsize=16)
+def fourier_filter(size: int, filter_name: Optional[str]) -> np.ndarray:
+    """
+    The Fourier filter of the projections, see Kak and Slaney, "Principles of Computerized Tomographic Imaging",
+    Chapter 3, Equation 61. The ramp filter is computed from its spatial form to avoid a bias.
+
+    Parameters:
+    - size: The even, padded size of the projections.
+    - filter_name: One of FBP_FILTERS, None for no filter.
+
+    Returns:
+    - The read only filter of the given size.
+    """
+    if filter_name not in FBP_FILTERS:
+        raise ValueError(f"Unknown filter '{filter_name}', use one of {FBP_FILTERS}.")
+
+    n = np.concatenate((np.arange(1, size / 2 + 1, 2, dtype=int), np.arange(size / 2 - 1, 0, -2, dtype=int)))
+    f = np.zeros(size)
+    f[0] = 0.25
+    f[1::2] = -1 / (np.pi * n) ** 2
+    ramp = 2 * np.real(scipy.fft.fft(f))
+
+    if filter_name == "shepp-logan":
+        omega = np.pi * scipy.fft.fftfreq(size)[1:]
+        ramp[1:] *= np.sin(omega) / omega
+    elif filter_name == "cosine":
+        ramp *= scipy.fft.fftshift(np.sin(np.linspace(0, np.pi, size, endpoint=False)))
+    elif filter_name == "hamming":
+        ramp *= scipy.fft.fftshift(np.hamming(size))
+    elif filter_name == "hann":
+        ramp *= scipy.fft.fftshift(np.hanning(size))
+    elif filter_name is None:
+        ramp[:] = 1
+    ramp.setflags(write=False)
+    return ramp
+
+
+@lru_cache(maxsize=8)
+def _back_projection_table(
+        n_detector_bins: int,
+        angles: bytes,
+        output_size: int,
+        circle: bool
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The detector positions t = y cos(θ) - x sin(θ) of all pixels for every angle,
+    as indices of the left neighbour in the projections padded by one zero bin on both sides
+    and the weights of the right neighbour for the linear interpolation.
+    Positions outside the detector point to the zero bin, pixels outside the circle are dropped with circle.
+
+    Returns:
+    - The read only indices and weights of shape (n_angles, output_size ** 2).
+    """
+    positions, outside = _detector_positions(n_detector_bins, np.frombuffer(angles), output_size, circle)
+
+    left = np.floor(positions)
+    weights = np.where(outside, 0, positions - left)
+    indices = np.where(outside, 0, left + 1).astype(np.intp)
+    indices.setflags(write=False)
+    weights.setflags(write=False)
+    return indices, weights
+
+
+def _detector_positions(
+        n_detector_bins: int,
+        angles: np.ndarray,
+        image_size: int,
+        circle: bool
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The detector positions t = y cos(θ) - x sin(θ) + n_detector_bins // 2 of all pixels for every angle,
+    with x the row and y the column relative to the center pixel, like in skimage.transform.iradon.
+
+    Returns:
+    - The positions of shape (n_angles, image_size ** 2) and whether they miss the detector (or the circle).
+    """
+    angles = np.deg2rad(angles)
+    radius = image_size // 2
+    x, y = (np.mgrid[:image_size, :image_size] - radius).reshape(2, -1)
+
+    positions = y * np.cos(angles)[:, np.newaxis] - x * np.sin(angles)[:, np.newaxis] + n_detector_bins // 2
+    outside = (positions < 0) | (positions > n_detector_bins - 1)
+    if circle:
+        outside |= x ** 2 + y ** 2 > radius ** 2
+    return positions, outside
+
+
+"""
+Sparse system matrix and iterative reconstruction
+"""
+class RadonOperator:
+
+    """
+    The discrete Radon transform of images of shape (image_size, image_size) as a sparse CSR matrix.
+    Every pixel is projected onto the detector at t = y cos(θ) - x sin(θ) and distributed over the two
+    closest detector bins with the weights of linear interpolation, so the transpose of the matrix is the
+    (unfiltered) back-projection of filtered_back_projection().
+
+    The rows are ordered by angle and then by detector bin, so the rows of one angle are a contiguous block.
+    Sinograms are passed and returned in the layout (n_detector_bins, n_angles) of RadonTransform,
+    or as stacks of shape (n_slices, n_detector_bins, n_angles).
+    """
+
+    def __init__(
+            self,
+            matrix: scipy.sparse.csr_matrix,
+            image_size: int,
+            angles: np.ndarray,
+            n_detector_bins: int,
+            circle: bool
+    ):
+        self.matrix = matrix
+        self.image_size = image_size
+        self.angles = np.asarray(angles, dtype=np.float64)
+        self.n_detector_bins = n_detector_bins
+        self.circle = circle
+
+    @classmethod
+    def from_geometry(
+            cls,
+            image_size: int,
+            angles: np.ndarray,
+            n_detector_bins: Optional[int] = None,
+            circle: bool = True
+    ) -> "RadonOperator":
+        """
+        The operator of the geometry, built once per geometry and cached.
+
+        Parameters:
+        - image_size: The number of rows and columns of the images.
+        - angles: The projection angles in degrees.
+        - n_detector_bins: The number of detector bins, by default the image size with circle
+                           and the diagonal of the image otherwise, like skimage.transform.radon.
+        - circle: Whether the images are zero outside the inscribed circle.
+        """
+        if n_detector_bins is None:
+            n_detector_bins = default_detector_bins(image_size, circle)
+        angles = np.asarray(angles, dtype=np.float64)
+        matrix = _radon_matrix(image_size, angles.tobytes(), n_detector_bins, circle)
+        return cls(matrix, image_size, angles, n_detector_bins, circle)
+
+    def save(self, path: str):
+        """
+        Save the operator into the directory path, as .npy files that load() can memory-map.
+        """
+        os.makedirs(path, exist_ok=True)
+        for name in ("data", "indices", "indptr"):
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self.matrix, name))
+        with open(os.path.join(path, "geometry.json"), "w") as file:
+            json.dump({
+                "image_size": self.image_size,
+                "angles": self.angles.tolist(),
+                "n_detector_bins": self.n_detector_bins,
+                "circle": self.circle,
+            }, file)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "RadonOperator":
+        """
+        Load an operator saved by save().
+
+        Parameters:
+        - path: The directory of the operator.
+        - mmap: Whether to memory-map the matrix read only instead of reading it into memory.
+        """
+        with open(os.path.join(path, "geometry.json")) as file:
+            geometry = json.load(file)
+        data, indices, indptr = (
+            np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r" if mmap else None)
+            for name in ("data", "indices", "indptr")
+        )
+        shape = (len(geometry["angles"]) * geometry["n_detector_bins"], geometry["image_size"] ** 2)
+        matrix = scipy.sparse.csr_matrix((data, indices, indptr), shape=shape, copy=False)
+        return cls(matrix, geometry["image_size"], np.array(geometry["angles"]), geometry["n_detector_bins"],
+                   geometry["circle"])
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.matrix.shape
+
+    @cached_property
+    def transposed(self) -> scipy.sparse.csr_matrix:
+        """
+        The transpose as CSR matrix, for fast back-projections.
+        """
+        return self.matrix.T.tocsr()
+
+    @cached_property
+    def angle_blocks(self) -> List[Tuple[scipy.sparse.csr_matrix, scipy.sparse.csr_matrix]]:
+        """
+        The rows of every angle and their transpose, for the ordered subsets of SART.
+        """
+        blocks = []
+        for angle in range(self.angles.size):
+            rows = self.matrix[angle * self.n_detector_bins:(angle + 1) * self.n_detector_bins]
+            blocks.append((rows, rows.T.tocsr()))
+        return blocks
+
+    def project(self, images: np.ndarray) -> np.ndarray:
+        """
+        The sinograms of images of shape (image_size, image_size) or (n_slices, image_size, image_size).
+        """
+        images = np.asarray(images)
+        return self.to_sinograms(self.matrix @ self.from_images(images), images.ndim == 3)
+
+    def back_project(self, sinograms: np.ndarray) -> np.ndarray:
+        """
+        The transpose of project(), the unfiltered back-projection.
+        """
+        sinograms = np.asarray(sinograms)
+        return self.to_images(self.transposed @ self.from_sinograms(sinograms), sinograms.ndim == 3)
+
+    def from_images(self, images: np.ndarray) -> np.ndarray:
+        # (image_size, image_size) or (n_slices, image_size, image_size) to the columns (n_pixels, n_slices)
+        return images.reshape(-1, self.image_size ** 2).T
+
+    def to_images(self, columns: np.ndarray, stack: bool) -> np.ndarray:
+        images = np.ascontiguousarray(columns.T).reshape(-1, self.image_size, self.image_size)
+        return images if stack else images[0]
+
+    def from_sinograms(self, sinograms: np.ndarray) -> np.ndarray:
+        # (n_detector_bins, n_angles) or (n_slices, n_detector_bins, n_angles) to the columns (n_rows, n_slices)
+        sinograms = sinograms.reshape(-1, self.n_detector_bins, self.angles.size)
+        return sinograms.transpose(2, 1, 0).reshape(self.shape[0], -1)
+
+    def to_sinograms(self, columns: np.ndarray, stack: bool) -> np.ndarray:
+        sinograms = np.ascontiguousarray(
+            columns.reshape(self.angles.size, self.n_detector_bins, -1).transpose(2, 1, 0)
+        )
+        return sinograms if stack else sinograms[0]
+
+
+@lru_cache(maxsize=4)
+def _radon_matrix(image_size: int, angles: bytes, n_detector_bins: int, circle: bool) -> scipy.sparse.csr_matrix:
+    angles = np.frombuffer(angles)
+    positions, outside = _detector_positions(n_detector_bins, angles, image_size, circle)
+    left = np.floor(positions).astype(np.int64)
+    weights = positions - left
+
+    angle_offsets = (np.arange(angles.size) * n_detector_bins)[:, np.newaxis]
+    pixels = np.broadcast_to(np.arange(image_size ** 2), positions.shape)
+    # the right neighbour only exists inside of the detector, a weight of 0 at the last bin is dropped
+    right_inside = ~outside & (left + 1 < n_detector_bins)
+    rows = np.concatenate(((angle_offsets + left)[~outside], (angle_offsets + left + 1)[right_inside]))
+    columns = np.concatenate((pixels[~outside], pixels[right_inside]))
+    values = np.concatenate(((1 - weights)[~outside], weights[right_inside]))
+
+    matrix = scipy.sparse.csr_matrix(
+        (values, (rows, columns)), shape=(angles.size * n_detector_bins, image_size ** 2)
+    )
+    matrix.sum_duplicates()
+    return matrix
+
+
+# callback(iteration, images) is called after every iteration with the current estimate,
+# the iterations stop early if it returns True
+IterationCallback = Callable[[int, np.ndarray], Optional[bool]]
+
+
+def sirt(
+        operator: RadonOperator,
+        sinograms: np.ndarray,
+        iterations: int = 50,
+        initial: Optional[np.ndarray] = None,
+        relaxation: float = 1.0,
+        nonnegative: bool = False,
+        callback: Optional[IterationCallback] = None
+) -> np.ndarray:
+    """
+    Simultaneous Iterative Reconstruction Technique: x += λ C A^T R (b - A x)
+    with the inverse row sums R and column sums C of the system matrix A.
+
+    Parameters:
+    - operator: The Radon operator of the geometry.
+    - sinograms: A sinogram (n_detector_bins, n_angles) or a stack of them (n_slices, n_detector_bins, n_angles).
+    - iterations: The maximal number of iterations.
+    - initial: The initial images for a warm start, by default zeros.
+    - relaxation: The relaxation factor λ in (0, 2).
+    - nonnegative: Whether to clip negative values after every iteration.
+    - callback: See IterationCallback.
+
+    Returns:
+    - The reconstructed image or stack of images.
+    """
+    sinograms = np.asarray(sinograms, dtype=np.float64)
+    stack = sinograms.ndim == 3
+    b = operator.from_sinograms(sinograms)
+    x = _initial_columns(operator, initial, b.shape[1])
+    row_weights = _inverse(np.asarray(operator.matrix.sum(axis=1)))
+    column_weights = _inverse(np.asarray(operator.matrix.sum(axis=0)).T)
+
+    for iteration in range(iterations):
+        x += relaxation * column_weights * (operator.transposed @ (row_weights * (b - operator.matrix @ x)))
+        if nonnegative:
+            np.maximum(x, 0, out=x)
+        if callback is not None and callback(iteration, operator.to_images(x, stack)):
+            break
+    return operator.to_images(x, stack)
+
+
+def sart(
+        operator: RadonOperator,
+        sinograms: np.ndarray,
+        iterations: int = 10,
+        initial: Optional[np.ndarray] = None,
+        relaxation: float = 0.5,
+        nonnegative: bool = False,
+        callback: Optional[IterationCallback] = None
+) -> np.ndarray:
+    """
+    Simultaneous Algebraic Reconstruction Technique: like sirt(), but the images are updated after every angle,
+    which converges in fewer iterations. One iteration is a sweep over all angles.
+
+    Parameters: see sirt().
+
+    Returns:
+    - The reconstructed image or stack of images.
+    """
+    sinograms = np.asarray(sinograms, dtype=np.float64)
+    stack = sinograms.ndim == 3
+    b = operator.from_sinograms(sinograms)
+    x = _initial_columns(operator, initial, b.shape[1])
+
+    blocks = []
+    for angle, (rows, rows_transposed) in enumerate(operator.angle_blocks):
+        block = slice(angle * operator.n_detector_bins, (angle + 1) * operator.n_detector_bins)
+        row_weights = _inverse(np.asarray(rows.sum(axis=1)))
+        column_weights = _inverse(np.asarray(rows.sum(axis=0)).T)
+        blocks.append((block, rows, rows_transposed, row_weights, column_weights))
+
+    for iteration in range(iterations):
+        for block, rows, rows_transposed, row_weights, column_weights in blocks:
+            x += relaxation * column_weights * (rows_transposed @ (row_weights * (b[block] - rows @ x)))
+        if nonnegative:
+            np.maximum(x, 0, out=x)
+        if callback is not None and callback(iteration, operator.to_images(x, stack)):
+            break
+    return operator.to_images(x, stack)
+
+
+def cgls(
+        operator: RadonOperator,
+        sinograms: np.ndarray,
+        iterations: int = 20,
+        initial: Optional[np.ndarray] = None,
+        callback: Optional[IterationCallback] = None
+) -> np.ndarray:
+    """
+    Conjugate Gradient for Least Squares, which minimizes |A x - b| with the conjugate gradient method
+    on the normal equations A^T A x = A^T b. The slices of a stack are solved independently at once.
+    Stopping early regularizes the solution.
+
+    Parameters: see sirt().
+
+    Returns:
+    - The reconstructed image or stack of images.
+    """
+    sinograms = np.asarray(sinograms, dtype=np.float64)
+    stack = sinograms.ndim == 3
+    b = operator.from_sinograms(sinograms)
+    x = _initial_columns(operator, initial, b.shape[1])
+
+    residual = b - operator.matrix @ x
+    gradient = operator.transposed @ residual
+    direction = gradient.copy()
+    gradient_norm = np.sum(gradient ** 2, axis=0)
+
+    for iteration in range(iterations):
+        projected = operator.matrix @ direction
+        step = _divide(gradient_norm, np.sum(projected ** 2, axis=0))
+        x += step * direction
+        residual -= step * projected
+        gradient = operator.transposed @ residual
+        new_gradient_norm = np.sum(gradient ** 2, axis=0)
+        direction = gradient + _divide(new_gradient_norm, gradient_norm) * direction
+        gradient_norm = new_gradient_norm
+        if callback is not None and callback(iteration, operator.to_images(x, stack)):
+            break
+    return operator.to_images(x, stack)
+
+
+def _initial_columns(operator: RadonOperator, initial: Optional[np.ndarray], n_slices: int) -> np.ndarray:
+    if initial is None:
+        return np.zeros((operator.shape[1], n_slices))
+    columns = operator.from_images(np.asarray(initial, dtype=np.float64)).copy()
+    return np.broadcast_to(columns, (operator.shape[1], n_slices)).copy()
+
+
+def _inverse(sums: np.ndarray) -> np.ndarray:
+    # rows and columns without entries, e.g. pixels outside the circle, are not updated
+    return _divide(np.ones_like(sums), sums)
+
+
+def _divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator, dtype=np.float64), where=denominator != 0)
+
+
+"""
+Fourier slice engines
+"""
+def fourier_slice_projection(
+        images: np.ndarray,
+        angles: np.ndarray,
+        n_detector_bins: Optional[int] = None,
+        circle: bool = True
+) -> np.ndarray:
+    """
+    The sinograms of a stack of images by the Fourier slice theorem: the zero padded 2D FFT of every image
+    is sampled along the central lines of the angles and transformed back to the detector with 1D FFTs.
+
+    Parameters:
+    - images: The images of shape (n_slices, image_size, image_size).
+    - angles: The projection angles in degrees.
+    - n_detector_bins: The number of detector bins, see default_detector_bins().
+    - circle: Whether the images are zero outside the inscribed circle, like in skimage.transform.radon.
+
+    Returns:
+    - The sinograms of shape (n_slices, n_detector_bins, n_angles).
+    """
+    images = np.asarray(images, dtype=np.float64)
+    if images.ndim != 3 or images.shape[1] != images.shape[2]:
+        raise ValueError("The images must be a 3D array of shape (n_slices, image_size, image_size).")
+    image_size = images.shape[1]
+    if n_detector_bins is None:
+        n_detector_bins = default_detector_bins(image_size, circle)
+    size = _padded_size(max(image_size, n_detector_bins))
+
+    padded = np.zeros((images.shape[0], size, size))
+    offset = size // 2 - image_size // 2
+    padded[:, offset:offset + image_size, offset:offset + image_size] = images
+    spectra = scipy.fft.fftshift(scipy.fft.fft2(scipy.fft.ifftshift(padded, axes=(1, 2))), axes=(1, 2))
+
+    coordinates = _polar_coordinates(size, np.asarray(angles, dtype=np.float64).tobytes())
+    slices = np.stack([_interpolate(spectrum, coordinates) for spectrum in spectra])
+    projections = scipy.fft.fftshift(
+        scipy.fft.ifft(scipy.fft.ifftshift(slices, axes=1), axis=1), axes=1
+    ).real
+    offset = size // 2 - n_detector_bins // 2
+    return projections[:, offset:offset + n_detector_bins]
+
+
+def fourier_slice_reconstruction(
+        sinograms: np.ndarray,
+        angles: np.ndarray,
+        filter_name: Optional[str] = "ramp",
+        circle: bool = True,
+        output_size: Optional[int] = None
+) -> np.ndarray:
+    """
+    Reconstruct a stack of images from their sinograms by direct Fourier reconstruction: the 1D FFTs of the
+    zero padded projections are interpolated from the polar onto the Cartesian frequency grid
+    and transformed back with one 2D FFT per image. The angles may be unevenly spaced, but must cover 180 degrees.
+
+    Parameters:
+    - sinograms: The sinograms of shape (n_slices, n_detector_bins, n_angles).
+    - angles: The projection angles in degrees.
+    - filter_name: One of FBP_FILTERS, the window of the filter is applied to the spectrum.
+                   The ramp itself is not needed, so "ramp" and None apply no window.
+    - circle: Whether the images are zero outside the inscribed circle, like in skimage.transform.radon.
+    - output_size: The number of rows and columns of the images, by default like skimage.transform.iradon.
+
+    Returns:
+    - The reconstructed images of shape (n_slices, output_size, output_size).
+    """
+    sinograms = np.asarray(sinograms, dtype=np.float64)
+    if sinograms.ndim != 3:
+        raise ValueError("The sinograms must be a 3D array of shape (n_slices, n_detector_bins, n_angles).")
+    angles = np.asarray(angles, dtype=np.float64)
+    if angles.shape != sinograms.shape[2:]:
+        raise ValueError("The number of angles does not match the number of projections of the sinograms.")
+    if filter_name not in FBP_FILTERS:
+        raise ValueError(f"Unknown filter '{filter_name}', use one of {FBP_FILTERS}.")
+
+    n_detector_bins = sinograms.shape[1]
+    if output_size is None:
+        output_size = default_output_size(n_detector_bins, circle)
+    size = _padded_size(max(n_detector_bins, output_size))
+
+    padded = np.zeros((sinograms.shape[0], size, angles.size))
+    offset = size // 2 - n_detector_bins // 2
+    padded[:, offset:offset + n_detector_bins] = sinograms
+    slices = scipy.fft.fftshift(scipy.fft.fft(scipy.fft.ifftshift(padded, axes=1), axis=1), axes=1)
+    if filter_name not in ("ramp", None):
+        slices *= scipy.fft.fftshift(fourier_filter(size, filter_name) / fourier_filter(size, "ramp"))[:, np.newaxis]
+
+    # the angles are sorted within [angles[0], angles[0] + 180), the projections of angles beyond are mirrored
+    # with P(k, θ + 180) = P(-k, θ), and the slice of the first angle closes the period
+    first_angle = angles[0]
+    angles = angles - first_angle
+    mirrored = np.floor(angles / 180) % 2 == 1
+    slices[:, :, mirrored] = _mirror_frequencies(slices[:, :, mirrored])
+    angles = angles % 180
+    order = np.argsort(angles, kind="stable")
+    slices = np.concatenate((slices[:, :, order], _mirror_frequencies(slices[:, :, order[:1]])), axis=2)
+
+    coordinates = _cartesian_coordinates(size, first_angle, np.append(angles[order], 180).tobytes())
+    spectra = np.stack([_interpolate(spectrum, coordinates) for spectrum in slices])
+    images = scipy.fft.fftshift(
+        scipy.fft.ifft2(scipy.fft.ifftshift(spectra, axes=(1, 2))), axes=(1, 2)
+    ).real
+    offset = size // 2 - output_size // 2
+    images = np.ascontiguousarray(images[:, offset:offset + output_size, offset:offset + output_size])
+
+    if circle:
+        x, y = np.mgrid[:output_size, :output_size] - output_size // 2
+        images[:, x ** 2 + y ** 2 > (output_size // 2) ** 2] = 0
+    return images
+
+
+def _padded_size(size: int) -> int:
+    # an even size for the symmetric frequencies around the Nyquist frequency, which is fast for the FFT
+    padded_size = scipy.fft.next_fast_len(FOURIER_SLICE_OVERSAMPLING * size)
+    while padded_size % 2:
+        padded_size = scipy.fft.next_fast_len(padded_size + 1)
+    return padded_size
+
+
+def _mirror_frequencies(spectra: np.ndarray) -> np.ndarray:
+    # k -> -k on the frequency axis 1 of the centered spectra, the Nyquist frequency at index 0 stays
+    return np.concatenate((spectra[:, :1], spectra[:, :0:-1]), axis=1)
+
+
+def _interpolate(spectrum: np.ndarray, coordinates: np.ndarray) -> np.ndarray:
+    # cubic spline interpolation of the real and the imaginary part, zero outside of the grid
+    real, imaginary = (
+        map_coordinates(spline_filter(part, mode="constant"), coordinates, mode="constant", prefilter=False)
+        for part in (spectrum.real, spectrum.imag)
+    )
+    return real + 1j * imaginary
+
+
+@lru_cache(maxsize=8)
+def _polar_coordinates(size: int, angles: bytes) -> np.ndarray:
+    # the indices of the frequencies (-k sin(θ), k cos(θ)) of the central slices in the centered 2D spectrum,
+    # the slice of angle θ is the spectrum of the projections onto t = y cos(θ) - x sin(θ)
+    angles = np.deg2rad(np.frombuffer(angles))
+    frequencies = np.arange(size)[:, np.newaxis] - size // 2
+    coordinates = np.stack((
+        -frequencies * np.sin(angles) + size // 2,
+        frequencies * np.cos(angles) + size // 2,
+    ))
+    coordinates.setflags(write=False)
+    return coordinates
+
+
+@lru_cache(maxsize=8)
+def _cartesian_coordinates(size: int, first_angle: float, angles: bytes) -> np.ndarray:
+    # the (frequency, angle) indices in the polar slices of every point of the centered 2D spectrum,
+    # for the sorted angles in [0, 180] relative to the first angle
+    angles = np.frombuffer(angles)
+    row_frequencies, column_frequencies = np.mgrid[:size, :size] - size // 2
+    # the angle of the slice through the point relative to the first angle, the opposite half is mirrored
+    point_angles = (np.rad2deg(np.arctan2(-row_frequencies, column_frequencies)) - first_angle) % 360
+    radii = np.hypot(row_frequencies, column_frequencies)
+    mirrored = point_angles >= 180
+    point_angles[mirrored] -= 180
+    radii[mirrored] *= -1
+    coordinates = np.stack((radii + size // 2, np.interp(point_angles, angles, np.arange(angles.size))))
+    coordinates.setflags(write=False)
+    return coordinates
@@ -1,39 +1,184 @@
-from typing import Callable, Iterable
+import multiprocessing
+import threading
+from typing import Callable, Iterable, Optional
 from typing import Any
 
+import numpy as np
+
+
+# the containers apply_to_leaves() traverses, everything else is a leaf
+CONTAINER_TYPES = (dict, list, tuple, set)
+
 
 def apply_to_leaves(
         data: Iterable,
         func: callable,
-        on_exception: Callable[[Iterable, Exception], Any] = None
+        on_exception: Callable[[Iterable, Exception], Any] = None,
+        array_func: Optional[Callable[[np.ndarray], Any]] = None,
+        in_place: bool = True
 ) -> Iterable:
     """
-    Recursively applies a function to each leaf value in a data structure.
+    Applies a function to each leaf value in a data structure.
+    The structure is traversed with an explicit stack, so its depth is not limited by the recursion limit.
+    Containers that occur several times are converted once, so shared substructures stay shared
+    and lists and dicts may contain themselves. Cycles through tuples or sets raise a ValueError.
 
     Parameters:
     - data: The input data structure (could be a dict, list, tuple, set, or a scalar value).
     - func: A function to apply to each leaf value.
+    - on_exception: Called with the leaf and the exception if func fails, its result replaces the leaf.
+                    By default the exception is raised.
+    - array_func: A function to apply to NumPy arrays as a whole, e.g. a vectorized func.
+                  By default arrays are leaves for func.
+    - in_place: Whether lists and dicts are modified in place, otherwise they are copied.
+                Tuples and sets are always rebuilt.
 
     Returns:
     - The modified data structure with the function applied to each leaf value.
     """
-    if isinstance(data, dict):
-        for key in data:
-            data[key] = apply_to_leaves(data[key], func, on_exception)
-        return data
-    elif isinstance(data, list):
-        for index in range(len(data)):
-            data[index] = apply_to_leaves(data[index], func, on_exception)
-        return data
-    elif isinstance(data, tuple):
-        return tuple(apply_to_leaves(item, func, on_exception) for item in data)
-    elif isinstance(data, set):
-        return set(apply_to_leaves(item, func, on_exception) for item in data)
-    else:
+
+    def apply(value):
         try:
-            return func(data)
+            if array_func is not None and isinstance(value, np.ndarray):
+                return array_func(value)
+            return func(value)
         except Exception as e:
             if on_exception:
-                return on_exception(data, e)
+                return on_exception(value, e)
             else:
                 raise
+
+    if not isinstance(data, CONTAINER_TYPES):
+        return apply(data)
+
+    # the converted containers by id, the originals are referenced by data until the end
+    converted = {}
+    in_progress = set()
+
+    def result(value):
+        if not isinstance(value, CONTAINER_TYPES):
+            return apply(value)
+        if id(value) not in converted:
+            raise ValueError("Cycles through tuples or sets can not be rebuilt.")
+        return converted[id(value)]
+
+    stack = [(data, False)]
+    while stack:
+        container, children_converted = stack.pop()
+        key = id(container)
+        if not children_converted:
+            if key in converted or key in in_progress:
+                # converted before, or a cycle back to a container whose children are converted
+                continue
+            in_progress.add(key)
+            if isinstance(container, (dict, list)):
+                # registered before the children, which may refer back to them
+                converted[key] = container if in_place else type(container)()
+            stack.append((container, True))
+            children = container.values() if isinstance(container, dict) else container
+            stack.extend((child, False) for child in children if isinstance(child, CONTAINER_TYPES))
+            continue
+
+        if isinstance(container, dict):
+            values = {name: result(value) for name, value in container.items()}
+            converted[key].update(values)
+        elif isinstance(container, list):
+            values = [result(item) for item in container]
+            if in_place:
+                container[:] = values
+            else:
+                converted[key].extend(values)
+        elif isinstance(container, tuple):
+            converted[key] = tuple(result(item) for item in container)
+        else:
+            converted[key] = set(result(item) for item in container)
+        in_progress.discard(key)
+    return converted[id(data)]
+
+
+def call_with_timeout(func: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+    """
+    Calls func and returns its result, waiting at most timeout seconds for it.
+
+    Parameters:
+    - func: The function to call without arguments.
+    - timeout: The maximum number of seconds to wait, None to wait indefinitely.
+
+    Returns:
+    - The return value of func, exceptions raised by func are re-raised.
+
+    Raises:
+    - TimeoutError: If func did not finish within timeout seconds.
+      As threads can not be killed, func keeps running in a daemon thread in the background.
+    """
+    if timeout is None:
+        return func()
+
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = func()
+        except BaseException as e:
+            outcome["exception"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise TimeoutError(f"{func} did not finish within {timeout} seconds.")
+    if "exception" in outcome:
+        raise outcome["exception"]
+    return outcome["result"]
+
+
+def call_in_subprocess(func: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+    """
+    Calls func in a forked subprocess and returns its result, killing the subprocess after timeout seconds.
+    Unlike call_with_timeout(), nothing keeps running after the timeout, e.g. a hanging symbolic integration.
+
+    Parameters:
+    - func: The function to call without arguments, its result must be picklable.
+    - timeout: The maximum number of seconds to wait, None to wait indefinitely.
+
+    Returns:
+    - The return value of func, exceptions raised by func are re-raised.
+
+    Raises:
+    - TimeoutError: If func did not finish within timeout seconds.
+      Where processes can not be forked, func runs in a daemon thread like in call_with_timeout().
+    """
+    if timeout is None:
+        return func()
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return call_with_timeout(func, timeout=timeout)
+
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+
+    def target():
+        try:
+            outcome = ("result", func())
+        except BaseException as e:
+            outcome = ("exception", e)
+        try:
+            sender.send(outcome)
+        except Exception as e:
+            # the result or the exception can not be pickled
+            sender.send(("exception", RuntimeError(repr(e))))
+
+    process = multiprocessing.get_context("fork").Process(target=target, daemon=True)
+    process.start()
+    sender.close()
+    try:
+        if not receiver.poll(timeout):
+            raise TimeoutError(f"{func} did not finish within {timeout} seconds.")
+        kind, value = receiver.recv()
+    except EOFError:
+        raise RuntimeError(f"The subprocess of {func} exited with code {process.exitcode}.")
+    finally:
+        receiver.close()
+        process.kill()
+        process.join()
+    if kind == "exception":
+        raise value
+    return value
@@ -0,0 +1,483 @@
+"""
+Orthogonal wavelet filters and a vectorized Mallat filter bank for the discrete wavelet transform.
+
+The filters are computed on first use and cached:
+- "haar" is "db1".
+- "dbN": Daubechies' extremal phase wavelets with N vanishing moments, by spectral factorization.
+- "symN": Daubechies' least asymmetric wavelets (Symlets) for N = 2, ..., 20, by the same spectral factorization
+          with the roots of the standard tables.
+- "coifN": Coiflets with 2N vanishing moments of the wavelet and 2N - 1 of the scaling function for N = 1, 2, 3,
+           solved numerically from their defining equations.
+The conventions of the filters and of the periodization follow PyWavelets, so coefficients are interchangeable.
+
+The filter bank works on the last axis, all other axes are a batch of signals transformed at once.
+For "haar" and "db2" there are lifting scheme variants, which work in place on one array
+and only need a buffer of half a signal instead of the temporaries of the filter bank.
+
+The continuous wavelet transform multiplies the FFT of the signal with a bank of wavelets in the frequency domain,
+which is cached per (wavelet, scales, N, dt) and normalized like in Torrence and Compo's
+"A Practical Guide to Wavelet Analysis", so all scales have unit energy.
+"""
+from functools import lru_cache
+from math import comb, factorial, gamma
+from typing import List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+import scipy.fft
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.optimize import least_squares
+
+
+LIFTING_WAVELETS = ("haar", "db1", "db2")
+
+CONTINUOUS_WAVELETS = ("morlet", "mexican_hat", "paul")
+
+# the nondimensional frequency of the Morlet wavelet and the order of the Paul wavelet
+MORLET_OMEGA0 = 6
+PAUL_ORDER = 4
+
+MAX_COIFLET_ORDER = 3
+
+# The Symlets of the standard tables, e.g. of PyWavelets, are not the most linear phase ones by any simple measure.
+# So for every order it is stored which root of each reciprocal pair is taken (1 for the one outside
+# of the unit circle), with the pairs sorted by the angle and the absolute value of their inner root.
+_SYMLET_ROOT_CHOICES = {
+    2: '0', 3: '0', 4: '01', 5: '10', 6: '101', 7: '100', 8: '0101', 9: '0110', 10: '10101',
+    11: '01100', 12: '101010', 13: '001110', 14: '0011010', 15: '0011100', 16: '10011010',
+    17: '01110001', 18: '101100101', 19: '001011100', 20: '1010011010'
+}
+
+
+class WaveletFilters(NamedTuple):
+    """
+    The decomposition and reconstruction filters of an orthogonal wavelet.
+    """
+    dec_lo: np.ndarray
+    dec_hi: np.ndarray
+    rec_lo: np.ndarray
+    rec_hi: np.ndarray
+
+    @property
+    def length(self) -> int:
+        return self.rec_lo.size
+
+
+@lru_cache(maxsize=None)
+def wavelet_filters(wavelet: str) -> WaveletFilters:
+    """
+    The filters of the wavelet, see the module docstring for the available wavelets.
+
+    Parameters:
+    - wavelet: The name of the wavelet, e.g. "haar", "db4", "sym8" or "coif2".
+
+    Returns:
+    - The read only decomposition and reconstruction filters.
+    """
+    rec_lo = _scaling_filter(wavelet)
+    rec_hi = rec_lo[::-1] * (-1) ** np.arange(rec_lo.size)
+    return WaveletFilters(
+        dec_lo=_read_only(rec_lo[::-1].copy()),
+        dec_hi=_read_only(rec_hi[::-1].copy()),
+        rec_lo=_read_only(rec_lo),
+        rec_hi=_read_only(rec_hi),
+    )
+
+
+def _scaling_filter(wavelet: str) -> np.ndarray:
+    name, order = wavelet.rstrip("0123456789"), wavelet[len(wavelet.rstrip("0123456789")):]
+    if wavelet == "haar":
+        name, order = "db", "1"
+    if not order or int(order) < 1 or name not in ("db", "sym", "coif"):
+        raise ValueError(f"Unknown wavelet '{wavelet}', use 'haar', 'dbN', 'symN' or 'coifN'.")
+    order = int(order)
+
+    if name == "coif":
+        if order > MAX_COIFLET_ORDER:
+            raise ValueError(f"Coiflets are available up to order {MAX_COIFLET_ORDER}.")
+        return _coiflet_filter(order)
+    if name == "sym" and order not in _SYMLET_ROOT_CHOICES:
+        raise ValueError(
+            f"Symlets are available for the orders {min(_SYMLET_ROOT_CHOICES)} to {max(_SYMLET_ROOT_CHOICES)}."
+        )
+    return _daubechies_filter(order, symmetric=name == "sym")
+
+
+def _daubechies_filter(order: int, symmetric: bool) -> np.ndarray:
+    """
+    Spectral factorization of |H(ω)|^2 = cos(ω / 2)^(2 N) P(sin(ω / 2)^2)
+    with P(y) = sum_k binomial(N - 1 + k, k) y^k.
+    Every root y of P gives a reciprocal pair of roots z, 1 / z of the filter, of which one is chosen:
+    the ones inside the unit circle for the minimum phase Daubechies wavelets,
+    the ones of _SYMLET_ROOT_CHOICES for the Symlets.
+    """
+    roots = []
+    if order > 1:
+        # numpy.roots expects the coefficient of the highest power first
+        y_roots = np.roots([comb(order - 1 + k, k) for k in reversed(range(order))])
+        # y = (2 - z - 1 / z) / 4, so z is a root of z^2 - (2 - 4 y) z + 1
+        inner = [min(np.roots([1, -(2 - 4 * y), 1]), key=abs) for y in y_roots]
+        # complex conjugate roots are chosen together to keep the filter real
+        inner = sorted(
+            (z for z in inner if z.imag >= -1e-12),
+            key=lambda z: (np.angle(z) if abs(z.imag) > 1e-12 else 0.0, abs(z))
+        )
+        choices = _SYMLET_ROOT_CHOICES[order] if symmetric else "0" * len(inner)
+        for z, choice in zip(inner, choices):
+            z = 1 / z if choice == "1" else z
+            roots.extend((z, np.conj(z)) if abs(z.imag) > 1e-12 else (z.real,))
+
+    rec_lo = np.real(np.poly(np.concatenate((-np.ones(order), roots))))
+    return rec_lo * np.sqrt(2) / rec_lo.sum()
+
+
+def _coiflet_filter(order: int) -> np.ndarray:
+    """
+    Solves the defining equations of the coiflet with 6 N coefficients h_k, k = 0, ..., 6 N - 1:
+    - orthonormality: sum_k h_k h_(k + 2 m) = δ_m0,
+    - sum_k h_k = sqrt(2),
+    - 2 N vanishing moments of the wavelet: sum_k (-1)^k (k - 2 N)^l h_k = 0 for l = 0, ..., 2 N - 1,
+    - 2 N - 1 vanishing moments of the scaling function around 2 N: sum_k (k - 2 N)^l h_k = 0 for l = 1, ..., 2 N - 1.
+    The system has several solutions, starting from a windowed half band filter converges to the standard one.
+    """
+    length = 6 * order
+    k = np.arange(length)
+    # the moments are scaled by the length to keep the system well conditioned
+    x = (k - 2 * order) / length
+    moments = np.array(
+        [(-1.0) ** k * x ** l for l in range(2 * order)] + [x ** l for l in range(1, 2 * order)]
+    )
+
+    def residuals(h):
+        orthonormality = [np.dot(h[:length - 2 * m], h[2 * m:]) - (m == 0) for m in range(length // 2)]
+        return np.concatenate((orthonormality, [h.sum() - np.sqrt(2)], moments @ h))
+
+    def jacobian(h):
+        orthonormality = np.zeros((length // 2, length))
+        for m in range(length // 2):
+            orthonormality[m, :length - 2 * m] += h[2 * m:]
+            orthonormality[m, 2 * m:] += h[:length - 2 * m]
+        return np.vstack((orthonormality, np.ones((1, length)), moments))
+
+    initial = np.sinc((k - 2 * order) / 2) / np.sqrt(2) * np.cos(np.pi * (k - 2 * order) / (2 * length)) ** 2
+    solution = least_squares(residuals, initial, jac=jacobian, method="trf", xtol=1e-15, ftol=1e-15, gtol=1e-15)
+    if np.max(np.abs(residuals(solution.x))) > 1e-12:
+        raise ValueError(f"The coiflet of order {order} could not be computed accurately.")
+    return solution.x
+
+
+"""
+Mallat filter bank with periodization
+"""
+def max_level(length: int, wavelet: str) -> int:
+    """
+    The number of levels until the signal would be shorter than the filter or of odd length.
+    """
+    filter_length = wavelet_filters(wavelet).length
+    level = 0
+    while length % 2 == 0 and length >= max(filter_length - 1, 2):
+        length //= 2
+        level += 1
+    return level
+
+
+def dwt(values: np.ndarray, wavelet: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    One level of the periodized DWT along the last axis, which must have even length.
+
+    Returns:
+    - The approximation and detail coefficients of half the length.
+    """
+    filters = wavelet_filters(wavelet)
+    length = values.shape[-1]
+    if length % 2:
+        raise ValueError("The periodized DWT needs signals of even length.")
+
+    # cA[n] = sum_j rec_lo[j] x[(2 n + 1 - L / 2 + j) mod N] for the filter length L,
+    # so the signal is extended circularly by L / 2 - 1 values on the left and L / 2 on the right
+    left = filters.length // 2 - 1
+    padded = _periodic_extension(values, left, filters.length // 2)
+    # one matrix product with both filters over the windows of every second position
+    windows = sliding_window_view(padded, filters.length, axis=-1)[..., ::2, :]
+    coefficients = windows @ np.stack((filters.rec_lo, filters.rec_hi), axis=-1)
+    return coefficients[..., 0], coefficients[..., 1]
+
+
+def idwt(approximation: np.ndarray, detail: np.ndarray, wavelet: str) -> np.ndarray:
+    """
+    The inverse of dwt(), the transpose of the orthogonal filter bank.
+    """
+    filters = wavelet_filters(wavelet)
+    length = 2 * approximation.shape[-1]
+    left = filters.length // 2 - 1
+
+    # x[2 m + e + 1 - L / 2] = sum_i rec_lo[2 i + e] cA[m - i] + rec_hi[2 i + e] cD[m - i] for e = 0, 1,
+    # one matrix product over the windows of the circularly extended coefficients
+    half = filters.length // 2
+    windows = np.concatenate((
+        sliding_window_view(_periodic_extension(approximation, half - 1, 0), half, axis=-1),
+        sliding_window_view(_periodic_extension(detail, half - 1, 0), half, axis=-1)
+    ), axis=-1)
+    # the window position w holds the coefficient m - i with i = L / 2 - 1 - w
+    matrix = np.concatenate((
+        filters.rec_lo[::-1].reshape(half, 2)[:, ::-1],
+        filters.rec_hi[::-1].reshape(half, 2)[:, ::-1]
+    ))
+    values = (windows @ matrix).reshape(windows.shape[:-2] + (length,))
+    return np.roll(values, -left, axis=-1)
+
+
+def _periodic_extension(values: np.ndarray, left: int, right: int) -> np.ndarray:
+    length = values.shape[-1]
+    if left <= length and right <= length:
+        return np.concatenate((values[..., length - left:], values, values[..., :right]), axis=-1)
+    # filters longer than the signal wrap around it several times
+    return np.take(values, np.arange(-left, length + right) % length, axis=-1)
+
+
+def wavedec(values: np.ndarray, wavelet: str, level: int) -> List[np.ndarray]:
+    """
+    Multilevel DWT along the last axis.
+
+    Returns:
+    - The coefficients [cA_level, cD_level, ..., cD_1].
+    """
+    coefficients = []
+    approximation = values
+    for _ in range(level):
+        approximation, detail = dwt(approximation, wavelet)
+        coefficients.append(detail)
+    coefficients.append(approximation)
+    return coefficients[::-1]
+
+
+def waverec(coefficients: Sequence[np.ndarray], wavelet: str) -> np.ndarray:
+    """
+    The inverse of wavedec().
+    """
+    values = coefficients[0]
+    for detail in coefficients[1:]:
+        values = idwt(values, detail, wavelet)
+    return values
+
+
+"""
+Lifting scheme, in place
+"""
+def lifting_wavedec(values: np.ndarray, wavelet: str, level: int) -> np.ndarray:
+    """
+    Multilevel DWT with the lifting scheme, which overwrites values (a float array) in place:
+    After the transform the approximation coefficients of a level are at the even indices of the previous
+    approximation and the detail coefficients at the odd ones,
+    e.g. for level 2 x[..., 0::4] is cA_2, x[..., 2::4] is cD_2 and x[..., 1::2] is cD_1.
+    The only temporary is one buffer of half the signal length.
+
+    Returns:
+    - values, transformed in place.
+    """
+    if wavelet not in LIFTING_WAVELETS:
+        raise ValueError(f"The lifting scheme is only available for {LIFTING_WAVELETS}.")
+    if not np.issubdtype(values.dtype, np.inexact):
+        raise TypeError("The lifting scheme works in place and needs a float or complex array.")
+
+    buffer = np.empty(values.shape[:-1] + (values.shape[-1] // 2,), dtype=values.dtype)
+    for j in range(level):
+        signal = values[..., ::2 ** j]
+        if signal.shape[-1] % 2:
+            raise ValueError("The periodized DWT needs signals of even length.")
+        even, odd = signal[..., 0::2], signal[..., 1::2]
+        temp = buffer[..., :even.shape[-1]]
+        if wavelet == "db2":
+            _db2_lifting_step(even, odd, temp)
+        else:
+            _haar_lifting_step(even, odd, temp)
+    return values
+
+
+def lifting_waverec(values: np.ndarray, wavelet: str, level: int) -> np.ndarray:
+    """
+    The inverse of lifting_wavedec(), which overwrites the interleaved coefficients in place with the signal.
+
+    Returns:
+    - values, transformed back in place.
+    """
+    if wavelet not in LIFTING_WAVELETS:
+        raise ValueError(f"The lifting scheme is only available for {LIFTING_WAVELETS}.")
+    if not np.issubdtype(values.dtype, np.inexact):
+        raise TypeError("The lifting scheme works in place and needs a float or complex array.")
+
+    buffer = np.empty(values.shape[:-1] + (values.shape[-1] // 2,), dtype=values.dtype)
+    for j in reversed(range(level)):
+        signal = values[..., ::2 ** j]
+        even, odd = signal[..., 0::2], signal[..., 1::2]
+        temp = buffer[..., :even.shape[-1]]
+        if wavelet == "db2":
+            _db2_inverse_lifting_step(even, odd, temp)
+        else:
+            _haar_inverse_lifting_step(even, odd, temp)
+    return values
+
+
+def lifting_coefficients(values: np.ndarray, level: int) -> List[np.ndarray]:
+    """
+    The coefficients [cA_level, cD_level, ..., cD_1] from the result of lifting_wavedec(), as views.
+    """
+    return [values[..., ::2 ** level]] + [values[..., 2 ** (j - 1)::2 ** j] for j in range(level, 0, -1)]
+
+
+def interleave_coefficients(coefficients: Sequence[np.ndarray]) -> np.ndarray:
+    """
+    The inverse of lifting_coefficients(), the input of lifting_waverec().
+    """
+    level = len(coefficients) - 1
+    approximation = np.asarray(coefficients[0])
+    values = np.empty(
+        approximation.shape[:-1] + (approximation.shape[-1] * 2 ** level,),
+        dtype=np.result_type(*coefficients, np.float64)
+    )
+    for view, coefficient in zip(lifting_coefficients(values, level), coefficients):
+        view[...] = coefficient
+    return values
+
+
+def _haar_lifting_step(even: np.ndarray, odd: np.ndarray, temp: np.ndarray):
+    # d = (x_2n - x_2n+1) / sqrt(2), s = (x_2n + x_2n+1) / sqrt(2)
+    odd -= even
+    np.multiply(odd, 0.5, out=temp)
+    even += temp
+    even *= np.sqrt(2)
+    odd *= -1 / np.sqrt(2)
+
+
+def _db2_lifting_step(even: np.ndarray, odd: np.ndarray, temp: np.ndarray):
+    # a factorization of the polyphase matrix of the filter bank into a predict, an update,
+    # another predict and a scaling step, the neighbours are taken circularly
+    sqrt3 = np.sqrt(3)
+    _shifted_product(even, -1 / sqrt3, 1, temp)
+    odd += temp
+    np.multiply(odd, (6 - 3 * sqrt3) / 4, out=temp)
+    even += temp
+    _shifted_product(odd, sqrt3 / 4, -1, temp)
+    even += temp
+    np.multiply(even, -1 / 3, out=temp)
+    odd += temp
+    even *= (sqrt3 + 1) / np.sqrt(6)
+    odd *= (3 - sqrt3) / np.sqrt(2)
+
+
+def _haar_inverse_lifting_step(even: np.ndarray, odd: np.ndarray, temp: np.ndarray):
+    odd *= -np.sqrt(2)
+    even /= np.sqrt(2)
+    np.multiply(odd, 0.5, out=temp)
+    even -= temp
+    odd += even
+
+
+def _db2_inverse_lifting_step(even: np.ndarray, odd: np.ndarray, temp: np.ndarray):
+    sqrt3 = np.sqrt(3)
+    even /= (sqrt3 + 1) / np.sqrt(6)
+    odd /= (3 - sqrt3) / np.sqrt(2)
+    np.multiply(even, -1 / 3, out=temp)
+    odd -= temp
+    _shifted_product(odd, sqrt3 / 4, -1, temp)
+    even -= temp
+    np.multiply(odd, (6 - 3 * sqrt3) / 4, out=temp)
+    even -= temp
+    _shifted_product(even, -1 / sqrt3, 1, temp)
+    odd -= temp
+
+
+def _shifted_product(values: np.ndarray, factor: float, shift: int, out: np.ndarray):
+    # out[n] = factor * values[(n + shift) mod N] for the shifts 1 and -1, without temporary arrays
+    if shift == 1:
+        np.multiply(values[..., 1:], factor, out=out[..., :-1])
+        np.multiply(values[..., :1], factor, out=out[..., -1:])
+    else:
+        np.multiply(values[..., :-1], factor, out=out[..., 1:])
+        np.multiply(values[..., -1:], factor, out=out[..., :1])
+
+
+"""
+Continuous wavelet transform
+"""
+def cwt(
+        values: np.ndarray,
+        scales: Sequence[float],
+        wavelet: str = "morlet",
+        dt: float = 1.0,
+        single_precision: bool = False
+) -> np.ndarray:
+    """
+    The continuous wavelet transform along the last axis with one FFT of the signal for all scales,
+    the wavelets are periodic with the signal.
+
+    Parameters:
+    - values: The signal, leading axes are a batch of signals.
+    - scales: The scales in units of time.
+    - wavelet: "morlet", "mexican_hat" or "paul".
+    - dt: The sampling interval.
+    - single_precision: Whether to compute in complex64 instead of complex128.
+
+    Returns:
+    - The complex coefficients of shape (..., n_scales, N).
+    """
+    values = np.asarray(values)
+    bank = cwt_bank(wavelet, tuple(float(scale) for scale in scales), values.shape[-1], float(dt), single_precision)
+    spectrum = scipy.fft.fft(values.astype(bank.dtype, copy=False), axis=-1)
+    return scipy.fft.ifft(spectrum[..., np.newaxis, :] * bank, axis=-1)
+
+
+@lru_cache(maxsize=64)
+def cwt_bank(
+        wavelet: str,
+        scales: Tuple[float, ...],
+        n_samples: int,
+        dt: float,
+        single_precision: bool = False
+) -> np.ndarray:
+    """
+    The complex conjugates of the normalized wavelets in the frequency domain,
+    sqrt(2 π s / dt) conj(Ψ(s ω_k)) for all scales s and the angular frequencies ω_k of the FFT.
+
+    Returns:
+    - The read only bank of shape (n_scales, n_samples), in complex64 with single precision.
+    """
+    if wavelet not in CONTINUOUS_WAVELETS:
+        raise ValueError(f"Unknown continuous wavelet '{wavelet}', use one of {CONTINUOUS_WAVELETS}.")
+
+    omega = 2 * np.pi * np.fft.fftfreq(n_samples, d=dt)
+    scales = np.asarray(scales)[:, np.newaxis]
+    scaled = scales * omega
+    positive = scaled > 0
+
+    if wavelet == "morlet":
+        daughter = np.pi ** -0.25 * positive * np.exp(-(scaled - MORLET_OMEGA0) ** 2 / 2)
+    elif wavelet == "paul":
+        m = PAUL_ORDER
+        clipped = np.where(positive, scaled, 0)
+        daughter = 2 ** m / np.sqrt(m * factorial(2 * m - 1)) * positive * clipped ** m * np.exp(-clipped)
+    else:
+        # the second derivative of a Gaussian, its Fourier transform is real
+        daughter = scaled ** 2 * np.exp(-scaled ** 2 / 2) / np.sqrt(gamma(2.5))
+
+    bank = np.sqrt(2 * np.pi * scales / dt) * np.conj(daughter.astype(np.complex128))
+    return _read_only(bank.astype(np.complex64 if single_precision else np.complex128))
+
+
+def fourier_periods(scales: Sequence[float], wavelet: str = "morlet") -> np.ndarray:
+    """
+    The Fourier periods corresponding to the scales of a wavelet, e.g. to label the scalogram.
+    """
+    if wavelet == "morlet":
+        factor = 4 * np.pi / (MORLET_OMEGA0 + np.sqrt(2 + MORLET_OMEGA0 ** 2))
+    elif wavelet == "paul":
+        factor = 4 * np.pi / (2 * PAUL_ORDER + 1)
+    elif wavelet == "mexican_hat":
+        factor = 2 * np.pi / np.sqrt(2.5)
+    else:
+        raise ValueError(f"Unknown continuous wavelet '{wavelet}', use one of {CONTINUOUS_WAVELETS}.")
+    return factor * np.asarray(scales, dtype=np.float64)
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
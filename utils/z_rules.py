@@ -0,0 +1,230 @@
+"""
+Closed-form rules for the unilateral Z-transform F(z) = sum(f(n) * z ** (-n), (n, 0, oo)).
+
+z_transform_rules() matches the function against a table of standard pairs and applies the operational rules
+- linearity: a f(n) + b g(n) -> a F(z) + b G(z),
+- scaling by a ** n: a ** n f(n) -> F(z / a),
+- multiplication by n: n f(n) -> -z F'(z),
+- delay: f(n - k) Heaviside(n - k, 1) -> z ** (-k) F(z), and f(n) KroneckerDelta(n, k) -> f(k) z ** (-k),
+- convolution: Sum(f(k) g(n - k), (k, 0, n)) -> F(z) G(z),
+recursively, which covers e.g. polynomials times exponentials and damped sines.
+The functions are taken for n >= 0. Heaviside(n - k) takes the value Heaviside(0) of SymPy at n = k,
+1/2 unless it is given as second argument, like the summation of the series does.
+
+inverse_z_transform_rational() inverts rational F(z) by the partial fractions of F(z) / z,
+where every pole p of multiplicity m contributes a term binomial(n, m - 1) p ** (n - m + 1).
+Pairs of complex conjugate poles are combined into real damped cosines and sines.
+The poles of irreducible factors of a degree above 2 are numeric, see utils.partial_fractions.find_poles.
+
+Both return None if they do not apply, so the caller can fall back to the summation.
+"""
+from functools import lru_cache
+from typing import Optional
+
+import sympy as sp
+
+from utils.partial_fractions import conjugate_pole, find_poles, has_real_coefficients, principal_part
+
+
+@lru_cache(maxsize=1024)
+def z_transform_rules(function: sp.Expr, n: sp.Symbol, z: sp.Symbol) -> Optional[sp.Expr]:
+    """
+    The Z-transform of function by the table and the rules, cached per (function, n, z).
+
+    Parameters:
+    - function: The sequence f(n) for n >= 0.
+    - n: The discrete variable.
+    - z: The complex variable.
+
+    Returns:
+    - F(z), or None if no rule applies.
+    """
+    transform = _transform(sp.sympify(function), n, z, expanded=False)
+    return None if transform is None else sp.factor(sp.together(transform))
+
+
+def _transform(function: sp.Expr, n: sp.Symbol, z: sp.Symbol, expanded: bool) -> Optional[sp.Expr]:
+    if not function.has(n):
+        # a constant times the unit step
+        return function * z / (z - 1)
+
+    if function.is_Add:
+        terms = [_transform(term, n, z, expanded) for term in function.args]
+        return None if any(term is None for term in terms) else sp.Add(*terms)
+
+    coefficient, function = function.as_independent(n, as_Add=False)
+    if coefficient != 1:
+        transform = _transform(function, n, z, expanded)
+        return None if transform is None else coefficient * transform
+
+    for rule in (_table, _kronecker_delta, _delay, _geometric_scaling, _multiplication_by_n, _convolution):
+        transform = rule(function, n, z, expanded)
+        if transform is not None:
+            return transform
+
+    if not expanded:
+        # e.g. products of sums, or sines of sums, as sums of exponentials that the geometric scaling covers
+        rewritten = sp.expand(function.rewrite(sp.exp))
+        return _transform(rewritten, n, z, expanded=True)
+    return None
+
+
+def _linear_coefficients(expression: sp.Expr, n: sp.Symbol) -> Optional[tuple]:
+    # (c, d) with expression = c n + d, or None
+    polynomial = sp.Poly(expression, n) if expression.is_polynomial(n) else None
+    if polynomial is None or polynomial.degree() != 1:
+        return None
+    c, d = polynomial.all_coeffs()
+    return c, d
+
+
+def _table(function: sp.Expr, n: sp.Symbol, z: sp.Symbol, _) -> Optional[sp.Expr]:
+    if isinstance(function, (sp.sin, sp.cos)):
+        coefficients = _linear_coefficients(function.args[0], n)
+        if coefficients is None:
+            return None
+        omega, phase = coefficients
+        if phase != 0:
+            return None
+        denominator = z ** 2 - 2 * z * sp.cos(omega) + 1
+        if isinstance(function, sp.sin):
+            return z * sp.sin(omega) / denominator
+        return z * (z - sp.cos(omega)) / denominator
+    return None
+
+
+def _kronecker_delta(function: sp.Expr, n: sp.Symbol, z: sp.Symbol, _) -> Optional[sp.Expr]:
+    # f(n) KroneckerDelta(n, k) -> f(k) z ** (-k) for integers k >= 0
+    for factor in sp.Mul.make_args(function):
+        if isinstance(factor, sp.KroneckerDelta) and n in factor.args:
+            k = factor.args[1] if factor.args[0] == n else factor.args[0]
+            if k.has(n):
+                return None
+            if k.is_integer and k.is_nonnegative:
+                rest = function / factor
+                return rest.subs(n, k) * z ** (-k)
+            if k.is_integer and k.is_negative:
+                return sp.Integer(0)
+    return None
+
+
+def _delay(function: sp.Expr, n: sp.Symbol, z: sp.Symbol, expanded: bool) -> Optional[sp.Expr]:
+    # f(n - k) Heaviside(n - k, h0) -> z ** (-k) F(z) + (h0 - 1) f(0) z ** (-k) for integers k >= 0
+    for factor in sp.Mul.make_args(function):
+        if isinstance(factor, sp.Heaviside):
+            argument, h0 = factor.args
+            coefficients = _linear_coefficients(argument, n)
+            if coefficients is None or coefficients[0] != 1:
+                return None
+            k = -coefficients[1]
+            if not (k.is_integer and k.is_nonnegative):
+                return None
+            rest = function / factor
+            # the step is h0 instead of 1 at n = k
+            correction = (h0 - 1) * rest.subs(n, k) * z ** (-k)
+            if correction.has(sp.zoo, sp.nan):
+                return None
+            transform = _transform(rest.subs(n, n + k), n, z, expanded)
+            return None if transform is None else z ** (-k) * transform + correction
+    return None
+
+
+def _geometric_scaling(function: sp.Expr, n: sp.Symbol, z: sp.Symbol, expanded: bool) -> Optional[sp.Expr]:
+    # a ** (c n + d) f(n) -> a ** d F(z / a ** c)
+    ratio, constant, rest = sp.Integer(1), sp.Integer(1), []
+    for factor in sp.Mul.make_args(function):
+        base, exponent = (sp.E, factor.args[0]) if isinstance(factor, sp.exp) else factor.as_base_exp()
+        coefficients = _linear_coefficients(exponent, n) if not base.has(n) else None
+        if coefficients is None:
+            rest.append(factor)
+            continue
+        c, d = coefficients
+        ratio *= base ** c
+        constant *= base ** d
+    if ratio == 1:
+        return None
+    transform = _transform(sp.Mul(*rest), n, z, expanded)
+    return None if transform is None else constant * transform.subs(z, z / ratio)
+
+
+def _multiplication_by_n(function: sp.Expr, n: sp.Symbol, z: sp.Symbol, expanded: bool) -> Optional[sp.Expr]:
+    # n f(n) -> -z F'(z)
+    for factor in sp.Mul.make_args(function):
+        base, exponent = factor.as_base_exp()
+        if base == n and exponent.is_integer and exponent.is_positive:
+            transform = _transform(function / n, n, z, expanded)
+            return None if transform is None else -z * sp.diff(transform, z)
+    return None
+
+
+def _convolution(function: sp.Expr, n: sp.Symbol, z: sp.Symbol, _) -> Optional[sp.Expr]:
+    # Sum(f(k) g(n - k), (k, 0, n)) -> F(z) G(z)
+    if not isinstance(function, sp.Sum) or len(function.limits) != 1:
+        return None
+    k, lower, upper = function.limits[0]
+    if lower != 0 or upper != n:
+        return None
+    m = sp.Dummy("m", integer=True, nonnegative=True)
+    separated = sp.separatevars(function.function.subs(n, m + k), symbols=[k, m], dict=True)
+    if separated is None:
+        return None
+    first = _transform(separated[k], k, z, expanded=False)
+    second = _transform(separated[m], m, z, expanded=False)
+    if first is None or second is None:
+        return None
+    return separated["coeff"] * first * second
+
+
+def inverse_z_transform_rational(transformed: sp.Expr, z: sp.Symbol, n: sp.Symbol) -> Optional[sp.Expr]:
+    """
+    The inverse Z-transform of a rational function of z by partial fractions.
+
+    Parameters:
+    - transformed: F(z), rational in z.
+    - z: The complex variable.
+    - n: The discrete variable.
+
+    Returns:
+    - f(n) for n >= 0, or None if F(z) is not rational or its poles can not be found.
+    """
+    transformed = sp.sympify(transformed)
+    if not transformed.is_rational_function(z):
+        return None
+    numerator, denominator = sp.fraction(sp.cancel(sp.together(transformed / z)))
+    numerator, denominator = sp.Poly(numerator, z), sp.Poly(denominator, z)
+    if numerator.degree() >= denominator.degree():
+        # F(z) grows faster than z, which is not the transform of a causal sequence
+        return None
+    poles = find_poles(denominator)
+    if poles is None:
+        return None
+    real_coefficients = has_real_coefficients(numerator, denominator)
+
+    terms = []
+    handled = set()
+    for pole, multiplicity in poles.items():
+        if pole in handled:
+            continue
+        residues = principal_part(numerator, denominator, z, pole, multiplicity)
+        conjugate = conjugate_pole(pole, multiplicity, poles) if real_coefficients else None
+        for order, residue in residues.items():
+            if pole == 0:
+                # residue / z ** order in F(z) / z is residue z ** (1 - order) in F(z), a delayed impulse
+                terms.append(residue * sp.KroneckerDelta(n, order - 1))
+            elif conjugate is not None:
+                # the terms of p and its conjugate sum up to 2 Re(residue binomial(n, order - 1) p ** (n - order + 1))
+                radius, angle = sp.Abs(pole), sp.arg(pole)
+                exponent = n - order + 1
+                real, imaginary = sp.re(residue), sp.im(residue)
+                terms.append(
+                    2 * sp.binomial(n, order - 1) * radius ** exponent
+                    * (real * sp.cos(angle * exponent) - imaginary * sp.sin(angle * exponent))
+                )
+            else:
+                terms.append(residue * sp.binomial(n, order - 1) * pole ** (n - order + 1))
+        handled.add(pole)
+        if conjugate is not None:
+            handled.add(conjugate)
+    inverse_transform = sp.Add(*terms)
+    # the simplification of the terms of numeric poles only rounds their coefficients, but takes long
+    return inverse_transform if inverse_transform.has(sp.Float) else sp.simplify(inverse_transform)